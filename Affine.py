@@ -1,125 +1,552 @@
+import array
+import codecs
+import collections.abc
+import itertools
+import re
+import types
+
+import instrumentation
+
 from GF import (
-    poly_add, poly_multiply, polynomial_to_string
+    polynomial_to_string, element_to_int, gf2_multiply, is_irreducible,
+    FieldElementsView
 )
+from catalog import get_irreducible_polynomial
+
+try:
+    import numpy
+except ImportError:  # NumPy необязателен: без него используется bytes.translate
+    numpy = None
+
+# Размер блока (в байтах) при потоковой обработке
+STREAM_CHUNK_SIZE = 1 << 16
+
+
+class SubstitutionTable(dict):
+    """
+    Таблица подстановки для str.translate: код символа -> символ.
+    Символы, отсутствующие в алфавите, заменяются на '?'.
+    """
+
+    def __missing__(self, key):
+        return '?'
+
+def print_tracer(event):
+    """
+    Трассировщик, печатающий события шифрования в текстовом виде.
+    Трассировщиком может быть любая функция одного аргумента, принимающая
+    словарь события (например, list.append для сбора структурированного потока).
+    Типы событий и их поля:
+    - 'encrypt' (char, x, alpha_x, y, result);
+    - 'decrypt' (char, y, y_minus_beta, x, result);
+    - 'encrypt_skip', 'decrypt_skip' (char) — символ вне алфавита.
+    Поле result равно None, если элемент не найден в отображении.
+    """
+    kind = event['type']
+    if kind == 'encrypt_skip':
+        print(f"Символ '{event['char']}' отсутствует в алфавите. Заменяем на '?'.")
+    elif kind == 'decrypt_skip':
+        print(f"Символ '{event['char']}' не является зашифрованным символом. Заменяем на '?'.")
+    elif kind == 'encrypt':
+        print(f"Шифруем '{event['char']}' -> {polynomial_to_string(event['x'])}")
+        print(f"α * x = {polynomial_to_string(event['alpha_x'])}")
+        print(f"α * x + β = {polynomial_to_string(event['y'])}")
+        _print_result(event['result'], event['y'])
+    elif kind == 'decrypt':
+        print(f"Дешифруем '{event['char']}' -> {polynomial_to_string(event['y'])}")
+        print(f"y - β = {polynomial_to_string(event['y_minus_beta'])}")
+        print(f"α⁻¹ * (y - β) = {polynomial_to_string(event['x'])}")
+        _print_result(event['result'], event['x'])
+
+def _print_result(result, elem):
+    if result is None:
+        print(f"Элемент {polynomial_to_string(elem)} не найден в отображении. Заменяем на '?'.")
+    else:
+        print(f"Соответствующий символ: '{result}'")
+
+def iter_decoded_chunks(src, chunk_size, encoding):
+    """
+    Читает двоичный поток src блоками по chunk_size байт и выдаёт непустые
+    фрагменты текста, декодированные инкрементальным декодером
+    (многобайтовые символы UTF-8 на границе блоков собираются корректно).
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            break
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+def _transform_stream(src, dst, transform, chunk_size, encoding):
+    """
+    Декодирует двоичный поток src по блокам (см. iter_decoded_chunks),
+    применяет transform и сразу пишет результат в dst.
+    """
+    for text in iter_decoded_chunks(src, chunk_size, encoding):
+        dst.write(transform(text).encode(encoding))
+    dst.flush()
+
+
+# --- Байтовый режим: аффинный шифр над GF(2^8) для произвольных двоичных данных ---
+def compile_byte_tables(alpha, beta, modulus=None):
+    """
+    Компилирует таблицы шифрования и расшифрования байтов над GF(2^8).
+    alpha и beta — байты (0..255), т. е. элементы GF(2^8) в виде битовых масок,
+    modulus — неприводимый многочлен степени 8 (по умолчанию — из каталога).
+    Возвращает пару 256-байтных таблиц (encrypt_table, decrypt_table)
+    для bytes.translate.
+    """
+    if modulus is None:
+        modulus = get_irreducible_polynomial(2, 8)
+    if len(modulus) != 9 or not is_irreducible(list(modulus), 2):
+        raise ValueError("Модуль должен быть неприводимым многочленом степени 8 над F_2.")
+    if not (0 < alpha < 256 and 0 <= beta < 256):
+        raise ValueError("α должен быть ненулевым байтом, β — байтом.")
+    mask = element_to_int(modulus, 2)
+    encrypt_table = bytearray(256)
+    decrypt_table = bytearray(256)
+    for x in range(256):
+        y = gf2_multiply(alpha, x, mask) ^ beta
+        encrypt_table[x] = y
+        decrypt_table[y] = x
+    return bytes(encrypt_table), bytes(decrypt_table)
+
+def translate_bytes(data, table):
+    """
+    Применяет таблицу подстановки к bytes, bytearray или memoryview
+    одним вызовом bytes.translate (без вызовов Python на каждый байт).
+    Массив numpy.uint8 обрабатывается индексированием таблицы, результат — массив.
+    """
+    if numpy is not None and isinstance(data, numpy.ndarray):
+        return numpy.frombuffer(table, dtype=numpy.uint8)[data]
+    if isinstance(data, memoryview):
+        data = data.cast('B')
+        return bytes(data).translate(table)
+    return data.translate(table)
+
+def translate_byte_stream(src, dst, table, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Потоково применяет таблицу подстановки к двоичному потоку src,
+    записывая результат в dst. Память не зависит от размера входа.
+    """
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    while True:
+        count = src.readinto(buffer)
+        if not count:
+            break
+        dst.write(view[:count].tobytes().translate(table))
+    dst.flush()
+
+
+# Наибольший код символа, при котором таблицы подстановки хранятся плотными массивами
+DENSE_TABLE_LIMIT = 1 << 17
+
+
+def _read_only(data):
+    """
+    Представление таблицы только для чтения: для массива — memoryview,
+    для словаря — types.MappingProxyType. Данные не копируются.
+    """
+    if isinstance(data, dict):
+        return types.MappingProxyType(data)
+    return memoryview(data).toreadonly()
+
+
+class AlphabetIndex(collections.abc.Mapping):
+    """
+    Отображение символ алфавита -> элемент поля.
+    Номер символа в алфавите хранится в плотном массиве, индексированном
+    смещением кода символа от наименьшего кода алфавита, элементы поля —
+    упакованными числами (packed[i] — элемент символа alphabet[i]).
+    Поиск — два обращения к массивам, память — несколько байт на символ.
+    Массивы доступны только для чтения (memoryview).
+    """
+
+    __slots__ = ('field', 'alphabet', 'offset', 'positions', 'packed')
+
+    def __init__(self, field, alphabet, packed):
+        codes = [ord(char) for char in alphabet]
+        self.field = field
+        self.alphabet = alphabet
+        self.offset = min(codes) if codes else 0
+        positions = array.array('i', [-1]) * (max(codes) - self.offset + 1 if codes else 0)
+        for idx, code in enumerate(codes):
+            positions[code - self.offset] = idx
+        self.positions = _read_only(positions)
+        self.packed = _read_only(array.array('I', packed))
+
+    @classmethod
+    def _restore(cls, field, alphabet, offset, positions, packed):
+        """Собирает индекс из готовых массивов без копирования (см. snapshot.py)."""
+        self = cls.__new__(cls)
+        self.field = field
+        self.alphabet = alphabet
+        self.offset = offset
+        self.positions = _read_only(positions)
+        self.packed = _read_only(packed)
+        return self
+
+    def position(self, char):
+        """Номер символа в алфавите или -1."""
+        index = ord(char) - self.offset
+        if 0 <= index < len(self.positions):
+            return self.positions[index]
+        return -1
+
+    def __getitem__(self, char):
+        if not isinstance(char, str) or len(char) != 1 or self.position(char) < 0:
+            raise KeyError(char)
+        return self.field.from_int(self.packed[self.position(char)])
+
+    def __iter__(self):
+        return iter(self.alphabet)
+
+    def __len__(self):
+        return len(self.alphabet)
+
+
+class ElementIndex(collections.abc.Mapping):
+    """
+    Отображение элемент поля -> символ алфавита: номер символа
+    хранится в плотном массиве, индексированном упакованным элементом.
+    """
+
+    __slots__ = ('field', 'alphabet', 'positions', 'packed')
+
+    def __init__(self, field, alphabet, packed):
+        self.field = field
+        self.alphabet = alphabet
+        self.packed = packed
+        positions = array.array('i', [-1]) * field.size
+        for idx, value in enumerate(packed):
+            positions[value] = idx
+        self.positions = _read_only(positions)
+
+    @classmethod
+    def _restore(cls, field, alphabet, packed, positions):
+        """Собирает индекс из готовых массивов без копирования (см. snapshot.py)."""
+        self = cls.__new__(cls)
+        self.field = field
+        self.alphabet = alphabet
+        self.packed = _read_only(packed)
+        self.positions = _read_only(positions)
+        return self
+
+    def __getitem__(self, elem):
+        field = self.field
+        elem = tuple(elem)
+        if len(elem) != field.n or any(not 0 <= c < field.p for c in elem):
+            raise KeyError(elem)
+        idx = self.positions[element_to_int(elem, field.p)]
+        if idx < 0:
+            raise KeyError(elem)
+        return self.alphabet[idx]
+
+    def __iter__(self):
+        return (self.field.from_int(value) for value in self.packed)
+
+    def __len__(self):
+        return len(self.packed)
+
+
+def _substitution_table(codes, images):
+    """
+    Таблица подстановки для str.translate: images[i] — номер символа-образа
+    символа с кодом codes[i] (вне диапазона — образа нет, символ заменяется на '?').
+    Если коды алфавита меньше DENSE_TABLE_LIMIT, таблица — плотный массив
+    кодов, индексированный кодом символа, иначе — SubstitutionTable.
+    Возвращает (таблица, наибольший код, покрытый таблицей, или None).
+    """
+    top = max(codes) if codes else 0
+    if top < DENSE_TABLE_LIMIT:
+        table = array.array('I', [ord('?')]) * (top + 1)
+        for code, image in zip(codes, images):
+            if 0 <= image < len(codes):
+                table[code] = codes[image]
+        return table, top
+    table = SubstitutionTable()
+    for code, image in zip(codes, images):
+        if 0 <= image < len(codes):
+            table[code] = chr(codes[image])
+    return table, None
+
+
+class AffineCipher:
+    """
+    Аффинный шифр y = α * x + β над полем Галуа с фиксированным алфавитом и ключом.
+
+    Объект хранит своё поле, отображения алфавита и скомпилированные
+    таблицы подстановки и после создания не изменяется, поэтому один процесс может держать много ключей
+    и вызывать encrypt/decrypt из разных потоков одновременно.
+    Одно поле (GaloisField) может разделяться многими шифрами.
+
+    Отображения алфавита (char_to_field, field_to_char) и таблицы подстановки
+    хранятся плотными массивами, поэтому алфавиты из десятков тысяч символов
+    (например, над GF(2^16)) занимают сотни килобайт. Таблицы (encrypt_table,
+    decrypt_table) и номера образов (encrypt_index, decrypt_index) доступны
+    только для чтения: memoryview или types.MappingProxyType.
+    """
+
+    __slots__ = (
+        'field', 'alphabet', 'alpha', 'beta', 'alpha_inv',
+        'char_to_field', 'field_to_char', 'encrypt_table', 'decrypt_table',
+        'encrypt_index', 'decrypt_index', '_outside'
+    )
+
+    def __init__(self, field, alphabet, alpha, beta, elements=None):
+        """
+        field — GaloisField, alphabet — строка из p^n символов,
+        alpha (ненулевой) и beta — элементы поля (кортежи коэффициентов),
+        elements — элементы поля в порядке сопоставления символам алфавита
+        (по умолчанию — порядок FieldElementsView: по степени, затем лексикографически).
+        """
+        if elements is None:
+            elements = FieldElementsView(field.p, field.n)
+        alpha = field.element(alpha)
+        beta = field.element(beta)
+        if alpha == field.zero:
+            raise ValueError("α должен быть ненулевым элементом поля.")
+
+        with instrumentation.stage('mapping'):
+            if isinstance(elements, FieldElementsView) and (elements.p, elements.n) == (field.p, field.n):
+                packed = list(itertools.islice(elements.iter_packed(), len(alphabet)))
+                if len(packed) < len(alphabet):
+                    raise IndexError("Индекс элемента поля вне диапазона.")
+            else:
+                packed = [field.to_int(elements[idx]) for idx in range(len(alphabet))]
+            positions = array.array('i', [-1]) * field.size
+            for idx, value in enumerate(packed):
+                positions[value] = idx
+
+        with instrumentation.stage('table_compile'):
+            alpha_int = field.to_int(alpha)
+            beta_int = field.to_int(beta)
+            encrypt_index = array.array('i', [-1]) * len(alphabet)
+            decrypt_index = array.array('i', [-1]) * len(alphabet)
+            for idx, x in enumerate(packed):
+                image = positions[field.add_int(field.multiply_int(alpha_int, x), beta_int)]
+                if image >= 0:
+                    encrypt_index[idx] = image
+                    decrypt_index[image] = idx
+
+        with instrumentation.stage('key_inversion'):
+            alpha_inv = field.inverse(alpha)
+        self._setup(field, alphabet, alpha, beta, alpha_inv,
+                    packed, encrypt_index, decrypt_index)
+
+    def _setup(self, field, alphabet, alpha, beta, alpha_inv, packed,
+               encrypt_index, decrypt_index):
+        with instrumentation.stage('table_compile'):
+            codes = [ord(char) for char in alphabet]
+            char_to_field = AlphabetIndex(field, alphabet, packed)
+            encrypt_table, _ = _substitution_table(codes, encrypt_index)
+            decrypt_table, _ = _substitution_table(codes, decrypt_index)
+            self._assign(
+                field, alphabet, alpha, beta, alpha_inv, char_to_field,
+                ElementIndex(field, alphabet, char_to_field.packed),
+                encrypt_index, decrypt_index, encrypt_table, decrypt_table
+            )
+
+    def _assign(self, field, alphabet, alpha, beta, alpha_inv, char_to_field,
+                field_to_char, encrypt_index, decrypt_index, encrypt_table, decrypt_table):
+        setattr_ = object.__setattr__
+        setattr_(self, 'field', field)
+        setattr_(self, 'alphabet', alphabet)
+        setattr_(self, 'alpha', tuple(alpha))
+        setattr_(self, 'beta', tuple(beta))
+        setattr_(self, 'alpha_inv', tuple(alpha_inv))
+        setattr_(self, 'char_to_field', char_to_field)
+        setattr_(self, 'field_to_char', field_to_char)
+        setattr_(self, 'encrypt_table', _read_only(encrypt_table))
+        setattr_(self, 'decrypt_table', _read_only(decrypt_table))
+        setattr_(self, 'encrypt_index', _read_only(encrypt_index))
+        setattr_(self, 'decrypt_index', _read_only(decrypt_index))
+        # Символы с кодом больше покрытого плотной таблицей str.translate
+        # оставляет без изменений; их заменяем на '?' отдельным проходом
+        top = None if isinstance(encrypt_table, dict) else len(encrypt_table) - 1
+        setattr_(self, '_outside', None if top is None else
+                 re.compile(f"[^\\x00-{re.escape(chr(top))}]"))
+
+    @classmethod
+    def _restore(cls, field, alphabet, alpha, beta, alpha_inv, packed,
+                 encrypt_index, decrypt_index):
+        """
+        Собирает шифр из готовых данных без вычислений в поле (см. snapshot.py):
+        packed[i] — упакованный элемент поля символа alphabet[i], encrypt_index[i]
+        и decrypt_index[i] — номера символов, в которые alphabet[i] переходит
+        при шифровании и расшифровании (номер вне алфавита — образа нет).
+        """
+        size = len(alphabet)
+        self = cls.__new__(cls)
+        self._setup(
+            field, alphabet, alpha, beta, alpha_inv, packed,
+            array.array('i', (i if i < size else -1 for i in encrypt_index)),
+            array.array('i', (i if i < size else -1 for i in decrypt_index))
+        )
+        return self
+
+    @classmethod
+    def _from_tables(cls, field, alphabet, alpha, beta, alpha_inv, char_to_field,
+                     field_to_char, encrypt_index, decrypt_index, encrypt_table, decrypt_table):
+        """
+        Собирает шифр из готовых индексов алфавита и плотных таблиц подстановки
+        без их построения и копирования (например, из memoryview над файлом
+        снимка, см. snapshot.py). Номера образов: -1 — образа нет.
+        """
+        self = cls.__new__(cls)
+        self._assign(field, alphabet, alpha, beta, alpha_inv, char_to_field,
+                     field_to_char, encrypt_index, decrypt_index, encrypt_table, decrypt_table)
+        return self
+
+    def _translate(self, text, table):
+        result = text.translate(table)
+        if self._outside is not None and self._outside.search(result):
+            result = self._outside.sub('?', result)
+        return result
+
+    def __reduce__(self):
+        # Передаются готовые массивы, поэтому распаковка (например, в рабочем
+        # процессе, см. parallel.py) не требует вычислений в поле
+        return (AffineCipher._restore, (
+            self.field, self.alphabet, self.alpha, self.beta, self.alpha_inv,
+            array.array('I', self.char_to_field.packed.tobytes()),
+            array.array('i', self.encrypt_index.tobytes()),
+            array.array('i', self.decrypt_index.tobytes())
+        ))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Объект AffineCipher неизменяем.")
+
+    def __delattr__(self, name):
+        raise AttributeError("Объект AffineCipher неизменяем.")
+
+    def __repr__(self):
+        return (f"AffineCipher(F_{self.field.p}^{self.field.n}, "
+                f"α={polynomial_to_string(self.alpha)}, β={polynomial_to_string(self.beta)})")
+
+    @instrumentation.timed('encrypt')
+    def encrypt(self, plaintext, tracer=None):
+        """
+        Шифрует строку; символы вне алфавита заменяются на '?'.
+        Если передан tracer (см. print_tracer), шифрование идёт посимвольно
+        с выдачей событий, иначе — один проход str.translate.
+        """
+        if tracer is None:
+            return self._translate(plaintext, self.encrypt_table)
+        field = self.field
+        ciphertext = []
+        for char in plaintext:
+            x = self.char_to_field.get(char)
+            if x is None:
+                tracer({'type': 'encrypt_skip', 'char': char})
+                ciphertext.append('?')
+                continue
+            alpha_x = field.multiply(self.alpha, x)
+            y = field.add(alpha_x, self.beta)
+            encrypted_char = self.field_to_char.get(y)
+            tracer({'type': 'encrypt', 'char': char, 'x': x, 'alpha_x': alpha_x,
+                    'y': y, 'result': encrypted_char})
+            ciphertext.append('?' if encrypted_char is None else encrypted_char)
+        return ''.join(ciphertext)
+
+    @instrumentation.timed('decrypt')
+    def decrypt(self, ciphertext, tracer=None):
+        """
+        Расшифровывает строку; символы вне алфавита заменяются на '?'.
+        Трассировка — как в encrypt.
+        """
+        if tracer is None:
+            return self._translate(ciphertext, self.decrypt_table)
+        field = self.field
+        plaintext = []
+        for char in ciphertext:
+            y = self.char_to_field.get(char)
+            if y is None:
+                tracer({'type': 'decrypt_skip', 'char': char})
+                plaintext.append('?')
+                continue
+            y_minus_beta = field.subtract(y, self.beta)
+            x = field.multiply(self.alpha_inv, y_minus_beta)
+            decrypted_char = self.field_to_char.get(x)
+            tracer({'type': 'decrypt', 'char': char, 'y': y, 'y_minus_beta': y_minus_beta,
+                    'x': x, 'result': decrypted_char})
+            plaintext.append('?' if decrypted_char is None else decrypted_char)
+        return ''.join(plaintext)
+
+    def encrypt_stream(self, src, dst, chunk_size=STREAM_CHUNK_SIZE, encoding='utf-8'):
+        """Потоковое шифрование двоичного потока src в dst."""
+        _transform_stream(src, dst, self.encrypt, chunk_size, encoding)
+
+    def decrypt_stream(self, src, dst, chunk_size=STREAM_CHUNK_SIZE, encoding='utf-8'):
+        """Потоковое расшифрование двоичного потока src в dst."""
+        _transform_stream(src, dst, self.decrypt, chunk_size, encoding)
+
+
+class ByteAffineCipher:
+    """
+    Аффинный шифр над GF(2^8) для произвольных двоичных данных
+    (неизменяемый, потокобезопасный; см. compile_byte_tables).
+    """
+
+    __slots__ = ('alpha', 'beta', 'modulus', 'encrypt_table', 'decrypt_table')
+
+    def __init__(self, alpha, beta, modulus=None):
+        if modulus is None:
+            modulus = get_irreducible_polynomial(2, 8)
+        encrypt_table, decrypt_table = compile_byte_tables(alpha, beta, modulus)
+        setattr_ = object.__setattr__
+        setattr_(self, 'alpha', alpha)
+        setattr_(self, 'beta', beta)
+        setattr_(self, 'modulus', tuple(modulus))
+        setattr_(self, 'encrypt_table', encrypt_table)
+        setattr_(self, 'decrypt_table', decrypt_table)
+
+    @classmethod
+    def _restore(cls, alpha, beta, modulus, encrypt_table, decrypt_table):
+        """Собирает шифр из готовых таблиц подстановки (см. snapshot.py)."""
+        self = cls.__new__(cls)
+        setattr_ = object.__setattr__
+        setattr_(self, 'alpha', alpha)
+        setattr_(self, 'beta', beta)
+        setattr_(self, 'modulus', tuple(modulus))
+        setattr_(self, 'encrypt_table', bytes(encrypt_table))
+        setattr_(self, 'decrypt_table', bytes(decrypt_table))
+        return self
+
+    def __reduce__(self):
+        return (ByteAffineCipher._restore, (
+            self.alpha, self.beta, self.modulus, self.encrypt_table, self.decrypt_table
+        ))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Объект ByteAffineCipher неизменяем.")
+
+    def __delattr__(self, name):
+        raise AttributeError("Объект ByteAffineCipher неизменяем.")
+
+    def __repr__(self):
+        return f"ByteAffineCipher(α=0x{self.alpha:02x}, β=0x{self.beta:02x})"
+
+    @instrumentation.timed('encrypt')
+    def encrypt(self, data):
+        """Шифрует bytes, bytearray, memoryview или массив numpy.uint8."""
+        return translate_bytes(data, self.encrypt_table)
+
+    @instrumentation.timed('decrypt')
+    def decrypt(self, data):
+        """Расшифровывает bytes, bytearray, memoryview или массив numpy.uint8."""
+        return translate_bytes(data, self.decrypt_table)
+
+    def encrypt_stream(self, src, dst, chunk_size=STREAM_CHUNK_SIZE):
+        """Потоковое шифрование двоичного потока src в dst."""
+        translate_byte_stream(src, dst, self.encrypt_table, chunk_size)
 
-# Глобальные переменные:
-alpha_affine = None
-beta_affine = None
-alpha_inv_affine = None
-
-char_to_field_affine = {}
-field_to_char_affine = {}
-
-# Функция для создания отображений между символами алфавита и элементами поля
-def create_mappings_affine(alphabet, field_elements):
-    """
-    Преобразует каждый элемент field_elements в tuple длины n и сопоставляет символам алфавита.
-    """
-    global char_to_field_affine, field_to_char_affine
-    char_to_field_affine = {}
-    field_to_char_affine = {}
-    # Предположим, что len(field_elements) == len(alphabet) == p^n
-    # и что каждый field_elements[i] уже имеет длину n.
-    for idx, char in enumerate(alphabet):
-        elem = tuple(field_elements[idx])
-        char_to_field_affine[char] = elem
-        field_to_char_affine[elem] = char
-
-def pad_or_trim_to_n(poly_tuple, n):
-    """
-    Приводит кортеж poly_tuple к длине n:
-    - если len(poly_tuple) > n, обрезает справа,
-    - если len(poly_tuple) < n, добавляет 0.
-    """
-    poly_list = list(poly_tuple)
-    if len(poly_list) > n:
-        poly_list = poly_list[:n]
-    while len(poly_list) < n:
-        poly_list.append(0)
-    return tuple(poly_list)
-
-def compute_inverse_affine(elem, multiplicative_group, modulus, p, n):
-    """
-    Вычисляет мультипликативную обратную для элемента в аффинном шифре.
-    """
-    print(f"Вычисление обратного элемента для: {polynomial_to_string(elem)}")
-    for candidate in multiplicative_group:
-        product = poly_multiply(elem, candidate, modulus, p)
-        identity = tuple([1] + [0] * (n - 1))  # Представление единицы в поле
-        if product == identity:
-            print(f"Найден обратный элемент: {polynomial_to_string(candidate)}")
-            return candidate
-    raise ValueError("Обратный элемент не найден.")
-
-def encrypt_text(plaintext, p, n, modulus):
-    ciphertext = ''
-    for char in plaintext:
-        if char not in char_to_field_affine:
-            print(f"Символ '{char}' отсутствует в алфавите. Заменяем на '?'.")
-            ciphertext += '?'
-            continue
-
-        x = char_to_field_affine[char]
-        print(f"Шифруем '{char}' -> {polynomial_to_string(x)}")
-
-        alpha_x = poly_multiply(alpha_affine, x, modulus, p)
-        print(f"α * x = {polynomial_to_string(alpha_x)}")
-
-        y = poly_add(alpha_x, beta_affine, p)
-        y = tuple(y)
-        print(f"α * x + β = {polynomial_to_string(y)}")
-
-        # ДОПОЛНЯЕМ/ОБРЕЗАЕМ ДО n
-        y = pad_or_trim_to_n(y, n)
-
-        if y in field_to_char_affine:
-            encrypted_char = field_to_char_affine[y]
-            print(f"Соответствующий символ: '{encrypted_char}'")
-            ciphertext += encrypted_char
-        else:
-            print(f"Элемент {polynomial_to_string(y)} не найден в отображении. Заменяем на '?'.")
-            ciphertext += '?'
-
-    return ciphertext
-
-def decrypt_text(ciphertext, p, n, modulus):
-    plaintext = ''
-    for char in ciphertext:
-        if char not in field_to_char_affine.values():
-            print(f"Символ '{char}' не является зашифрованным символом. Заменяем на '?'.")
-            plaintext += '?'
-            continue
-
-        y = None
-        for key_elem, value_char in field_to_char_affine.items():
-            if value_char == char:
-                y = key_elem
-                break
-
-        if y is None:
-            print(f"Элемент для символа '{char}' не найден. Заменяем на '?'.")
-            plaintext += '?'
-            continue
-
-        print(f"Дешифруем '{char}' -> {polynomial_to_string(y)}")
-        # Аддитивная инверсия в поле (y -> -y)
-        negate_beta = tuple((-c) % p for c in beta_affine)
-        y_minus_beta = poly_add(y, negate_beta, p)
-        print(f"y - β = {polynomial_to_string(y_minus_beta)}")
-
-        alpha_inv_y = poly_multiply(alpha_inv_affine, y_minus_beta, modulus, p)
-        alpha_inv_y = tuple(alpha_inv_y)
-        print(f"α⁻¹ * (y - β) = {polynomial_to_string(alpha_inv_y)}")
-
-        # Дополняем/обрезаем до n
-        alpha_inv_y = pad_or_trim_to_n(alpha_inv_y, n)
-
-        if alpha_inv_y in field_to_char_affine:
-            decrypted_char = field_to_char_affine[alpha_inv_y]
-            print(f"Соответствующий символ: '{decrypted_char}'")
-            plaintext += decrypted_char
-        else:
-            print(f"Элемент {polynomial_to_string(alpha_inv_y)} не найден в отображении. Заменяем на '?'.")
-            plaintext += '?'
-
-    return plaintext
+    def decrypt_stream(self, src, dst, chunk_size=STREAM_CHUNK_SIZE):
+        """Потоковое расшифрование двоичного потока src в dst."""
+        translate_byte_stream(src, dst, self.decrypt_table, chunk_size)
@@ -1,12 +1,54 @@
+import collections
+import collections.abc
+import functools
 import itertools
+import math
+import operator
 import random
 
+import instrumentation
+
+def _sieve(limit):
+    """Простые числа меньше limit (решето Эратосфена)."""
+    flags = bytearray([1]) * limit
+    flags[:2] = b'\x00\x00'
+    for i in range(2, math.isqrt(limit - 1) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i in range(limit) if flags[i]]
+
+# Простые для пробного деления перед тестом Миллера — Рабина и ρ-методом Полларда
+SMALL_PRIMES = _sieve(1000)
+
+# Основания теста Миллера — Рабина: ответ точен для всех чисел меньше 3.3 * 10^24
+# (в том числе для любых 64-битных), для больших чисел тест вероятностный
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
 def is_prime(p):
-    """Проверяет, является ли число p простым."""
+    """
+    Проверяет, является ли число p простым: пробное деление на малые
+    простые, затем тест Миллера — Рабина с фиксированными основаниями.
+    """
     if p < 2:
         return False
-    for i in range(2, int(p ** 0.5) + 1):
-        if p % i == 0:
+    for prime in SMALL_PRIMES:
+        if p % prime == 0:
+            return p == prime
+    if p < SMALL_PRIMES[-1] ** 2:
+        return True
+    d, s = p - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for base in MILLER_RABIN_BASES:
+        x = pow(base, d, p)
+        if x == 1 or x == p - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % p
+            if x == p - 1:
+                break
+        else:
             return False
     return True
 
@@ -26,25 +68,38 @@ def poly_add(a, b, p):
         result.pop()
     return result
 
-def poly_multiply(a, b, modulus, p):
+def poly_multiply(a, b, modulus, p, field=None):
     """
     Умножает два элемента поля Галуа, представленных как кортежи коэффициентов.
     Приведение выполняется по модулю заданного неприводимого многочлена (modulus).
+    Если передан объект field (GaloisField), умножение выполняется по его таблицам.
     """
+    if instrumentation.enabled:
+        instrumentation.counters['poly_multiply'] += 1
+    if field is not None:
+        return field.multiply(a, b)
+
     a_list = list(a)
     b_list = list(b)
     product = [0] * (len(a_list) + len(b_list) - 1)
 
+    # Остаток по модулю p берётся один раз после накопления сумм
     for i, coeff_a in enumerate(a_list):
+        if coeff_a == 0:
+            continue
         for j, coeff_b in enumerate(b_list):
-            product[i + j] = (product[i + j] + coeff_a * coeff_b) % p
+            product[i + j] += coeff_a * coeff_b
+    n = len(modulus) - 1
+    terms = sparse_modulus_terms(modulus, p)
+    if terms is not None:
+        return tuple(sparse_reduce(product, terms, n, p))
+    product = [c % p for c in product]
 
     _, remainder = poly_divmod(product, list(modulus), p)
 
     while len(remainder) > 1 and remainder[-1] == 0:
         remainder.pop()
 
-    n = len(modulus) - 1
     while len(remainder) < n:
         remainder.append(0)
 
@@ -57,14 +112,18 @@ def poly_divmod(a, b, p):
     Возвращает кортеж (частное, остаток).
     Многочлены представлены как списки коэффициентов от младшего к старшему.
     """
+    if instrumentation.enabled:
+        instrumentation.counters['poly_divmod'] += 1
     a = a[:]  # Копия списка
     b = b[:]
     if len(b) == 0 or all(coeff == 0 for coeff in b):
         raise ZeroDivisionError("Деление на нулевой многочлен невозможно.")
 
     quotient = [0] * (len(a) - len(b) + 1) if len(a) >= len(b) else []
+    # Обратный к старшему коэффициенту делителя вычисляется один раз
+    lead_inv = modinv(b[-1], p) if len(a) >= len(b) else 1
     while len(a) >= len(b):
-        coeff = a[-1] * modinv(b[-1], p) % p
+        coeff = a[-1] * lead_inv % p
         if coeff == 0:
             # Если коэффициент равен нулю, удаляем ведущий коэффициент и продолжаем
             a.pop()
@@ -87,6 +146,8 @@ def modinv(a, p):
     Находит мультипликативную обратную по модулю p.
     Использует расширенный алгоритм Евклида.
     """
+    if instrumentation.enabled:
+        instrumentation.counters['modinv'] += 1
     a = a % p
     if a == 0:
         raise ZeroDivisionError("Нет обратного элемента для 0.")
@@ -101,51 +162,344 @@ def modinv(a, p):
         high, low = low, new
     return lm % p
 
+# Наибольший вес модуля (число ненулевых коэффициентов), при котором приведение
+# выполняется разреженным сдвигом и вычитанием (трёхчлены и пятичлены)
+SPARSE_MAX_WEIGHT = 5
+
+@functools.lru_cache(maxsize=256)
+def _sparse_modulus_terms(modulus, p):
+    modulus = poly_trim(modulus, p)
+    terms = [k for k, c in enumerate(modulus) if c]
+    if len(terms) > SPARSE_MAX_WEIGHT or len(modulus) < 2:
+        return None
+    lead_inv = modinv(modulus[-1], p)
+    return tuple((k, (-modulus[k] * lead_inv) % p) for k in terms[:-1])
+
+def sparse_modulus_terms(modulus, p):
+    """
+    Разреженная запись модуля степени n: пары (k, m_k), для которых
+    x^n ≡ Σ m_k * x^k. Возвращает None, если у модуля больше
+    SPARSE_MAX_WEIGHT ненулевых коэффициентов (результат запоминается).
+    """
+    return _sparse_modulus_terms(tuple(modulus), p)
+
+def reduction_strategy(modulus, p):
+    """
+    Способ приведения по модулю: 'sparse' — разреженный сдвиг и вычитание
+    (sparse_reduce), 'generic' — деление многочленов.
+    """
+    return 'generic' if sparse_modulus_terms(modulus, p) is None else 'sparse'
+
+def sparse_reduce(poly, terms, n, p):
+    """
+    Остаток от деления poly на разреженный модуль степени n (terms —
+    см. sparse_modulus_terms). Коэффициенты переносятся вниз, начиная
+    со старшего: c * x^i заменяется на Σ c * m_k * x^(i - n + k), поэтому
+    на каждый коэффициент приходится не больше SPARSE_MAX_WEIGHT - 1 сложений.
+    Возвращает список из n коэффициентов, приведённых по модулю p.
+    """
+    poly = list(poly)
+    for i in range(len(poly) - 1, n - 1, -1):
+        c = poly[i] % p
+        if c:
+            shift = i - n
+            for k, m in terms:
+                poly[shift + k] += c * m
+    result = [c % p for c in poly[:n]]
+    return result + [0] * (n - len(result))
+
+def poly_trim(poly, p):
+    """
+    Приводит коэффициенты по модулю p и удаляет ведущие нули.
+    Нулевой многочлен представляется как [0].
+    """
+    result = [c % p for c in poly]
+    while len(result) > 1 and result[-1] == 0:
+        result.pop()
+    return result or [0]
+
+def poly_gcd(a, b, p):
+    """
+    Наибольший общий делитель многочленов a и b над F_p (алгоритм Евклида).
+    Результат приводится к унитарному виду; НОД нулевых многочленов равен [0].
+    """
+    a = poly_trim(a, p)
+    b = poly_trim(b, p)
+    while b != [0]:
+        _, remainder = poly_divmod(a, b, p)
+        a, b = b, poly_trim(remainder, p)
+    if a == [0]:
+        return a
+    lead_inv = modinv(a[-1], p)
+    return [(c * lead_inv) % p for c in a]
+
+def poly_powmod(base, exponent, modulus, p, reducer=None):
+    """
+    Возводит многочлен base в степень exponent по модулю многочлена modulus
+    (быстрое возведение в степень). Результат — кортеж длины deg(modulus).
+    Если передан reducer (PolyReducer для этого модуля), умножения выполняются
+    через него.
+    """
+    if reducer is not None:
+        return reducer.power(base, exponent)
+    _, base = poly_divmod(list(base), list(modulus), p)
+    result = tuple([1] + [0] * (len(modulus) - 2))
+    while exponent > 0:
+        if exponent % 2 == 1:
+            result = poly_multiply(result, base, modulus, p)
+        base = poly_multiply(base, base, modulus, p)
+        exponent = exponent // 2
+    return result
+
+# Длина множителей, начиная с которой многочлены умножаются через большие целые
+# (подстановка Кронекера): CPython перемножает их методом Карацубы
+KRONECKER_THRESHOLD = 16
+
+def _schoolbook_mul(a, b):
+    """Произведение списков коэффициентов без приведения по модулю p."""
+    if not a or not b:
+        return []
+    product = [0] * (len(a) + len(b) - 1)
+    len_b = len(b)
+    # Строка произведения складывается целиком через map, без индексации в Python
+    for i, coeff_a in enumerate(a):
+        if coeff_a == 0:
+            continue
+        row = b if coeff_a == 1 else [coeff_a * c for c in b]
+        product[i:i + len_b] = map(operator.add, product[i:i + len_b], row)
+    return product
+
+def _kronecker_mul(a, b, p):
+    """
+    Произведение списков коэффициентов из [0, p) подстановкой Кронекера:
+    многочлены упаковываются в целые числа с ячейками достаточной ширины,
+    перемножаются как большие целые, и коэффициенты читаются из ячеек.
+    Остаток по модулю p не берётся.
+    """
+    width = ((min(len(a), len(b)) * (p - 1) ** 2).bit_length() + 8) // 8
+    packed_a = int.from_bytes(b''.join(c.to_bytes(width, 'little') for c in a), 'little')
+    packed_b = int.from_bytes(b''.join(c.to_bytes(width, 'little') for c in b), 'little')
+    raw = (packed_a * packed_b).to_bytes((len(a) + len(b) - 1) * width, 'little')
+    return [int.from_bytes(raw[i:i + width], 'little') for i in range(0, len(raw), width)]
+
+def _poly_product(a, b, p, threshold=KRONECKER_THRESHOLD):
+    """
+    Произведение списков коэффициентов из [0, p) без приведения по модулю p:
+    для коротких множителей — «в столбик», начиная с threshold — через
+    подстановку Кронекера.
+    """
+    if not a or not b:
+        return []
+    if min(len(a), len(b)) < threshold:
+        return _schoolbook_mul(a, b)
+    return _kronecker_mul(a, b, p)
+
+def poly_mul(a, b, p, threshold=KRONECKER_THRESHOLD):
+    """
+    Произведение многочленов a и b над F_p без приведения по модулю
+    многочлена. Для длинных множителей умножение сводится к умножению
+    больших целых (метод Карацубы в CPython), остаток по модулю p
+    берётся один раз в конце.
+    """
+    return poly_trim(_poly_product([c % p for c in a], [c % p for c in b], p, threshold), p)
+
+
+class PolyReducer:
+    """
+    Быстрое приведение по фиксированному модулю (метод Барретта).
+
+    При создании один раз вычисляется обратный степенной ряд к развёрнутому
+    унитарному модулю: inv_rev = rev(f)^(-1) mod x^n. Затем частное от деления
+    многочлена степени не выше 2n - 2 на f получается одним умножением
+    (старшие коэффициенты, развёрнутые, на inv_rev), а остаток — ещё одним,
+    без пошагового деления и вызовов modinv. Умножения — через _poly_product.
+    Для разреженных модулей (sparse_terms) inv_rev не вычисляется (None).
+    """
+
+    def __init__(self, modulus, p, threshold=KRONECKER_THRESHOLD):
+        modulus = poly_trim(modulus, p)
+        self.p = p
+        self.n = len(modulus) - 1
+        self.threshold = threshold
+        if self.n < 1:
+            raise ValueError("Модуль должен иметь степень не меньше 1.")
+        lead_inv = modinv(modulus[-1], p)
+        self.monic = [(c * lead_inv) % p for c in modulus]
+        # Для трёх- и пятичленов приведение выполняется sparse_reduce,
+        # и обратный ряд для них не нужен
+        self.sparse_terms = sparse_modulus_terms(self.monic, p)
+        self.inv_rev = None
+        if self.sparse_terms is None:
+            self.inv_rev = self._series_inverse(self.monic[::-1], self.n)
+
+    def _series_inverse(self, series, length):
+        """
+        Обратный степенной ряд по модулю x^length (series[0] = 1),
+        итерациями Ньютона: g <- g * (2 - series * g), точность удваивается.
+        """
+        p = self.p
+        inverse = [1]
+        precision = 1
+        while precision < length:
+            precision = min(2 * precision, length)
+            error = _poly_product(series[:precision], inverse, p, self.threshold)[:precision]
+            error = [(-c) % p for c in error]
+            error[0] = (error[0] + 2) % p
+            inverse = [c % p for c in
+                       _poly_product(inverse, error, p, self.threshold)[:precision]]
+        return inverse + [0] * (length - len(inverse))
+
+    def reduce(self, poly):
+        """
+        Остаток от деления poly на модуль — кортеж длины n.
+        Коэффициенты poly могут быть не приведены по модулю p.
+        """
+        p, n = self.p, self.n
+        if self.sparse_terms is not None:
+            return tuple(sparse_reduce(poly, self.sparse_terms, n, p))
+        poly = [c % p for c in poly]
+        if len(poly) > 2 * n - 1:
+            # Вход длиннее произведения двух остатков — обычное деление
+            _, poly = poly_divmod(poly, self.monic, p)
+        if len(poly) <= n:
+            return tuple(poly) + (0,) * (n - len(poly))
+
+        quotient_len = len(poly) - n
+        top_reversed = poly[::-1][:quotient_len]
+        quotient = _poly_product(top_reversed, self.inv_rev[:quotient_len], p, self.threshold)
+        quotient = [c % p for c in quotient[:quotient_len]][::-1]
+        product = _poly_product(quotient, self.monic, p, self.threshold)
+        return tuple((poly[i] - product[i]) % p for i in range(n))
+
+    def multiply(self, a, b):
+        """Произведение a * b по модулю (быстрое умножение + приведение Барретта)."""
+        p = self.p
+        return self.reduce(_poly_product([c % p for c in a], [c % p for c in b], p, self.threshold))
+
+    def power(self, base, exponent):
+        """Возведение base в степень exponent по модулю."""
+        base = self.reduce(base)
+        result = tuple([1] + [0] * (self.n - 1))
+        while exponent > 0:
+            if exponent % 2 == 1:
+                result = self.multiply(result, base)
+            base = self.multiply(base, base)
+            exponent = exponent // 2
+        return result
+
+def poly_inverse(elem, modulus, p):
+    """
+    Мультипликативный обратный элемент поля F_p[x]/(modulus)
+    по расширенному алгоритму Евклида. Результат — кортеж длины deg(modulus).
+    """
+    n = len(modulus) - 1
+    _, elem = poly_divmod(list(elem), list(modulus), p)
+    r0, r1 = poly_trim(modulus, p), poly_trim(elem, p)
+    if r1 == [0]:
+        raise ZeroDivisionError("Нет обратного элемента для 0.")
+    # Инвариант: s_i * elem ≡ r_i (mod modulus)
+    s0, s1 = [0], [1]
+    while r1 != [0]:
+        quotient, remainder = poly_divmod(r0, r1, p)
+        r0, r1 = r1, poly_trim(remainder, p)
+        s_next = [(-c) % p for c in poly_mul(quotient, s1, p)]
+        s0, s1 = s1, poly_trim(poly_add(s0, s_next, p), p)
+    if len(r0) != 1:
+        raise ValueError("Элемент не взаимно прост с модулем: многочлен приводим.")
+    scale = modinv(r0[0], p)
+    result = [(c * scale) % p for c in s0]
+    return tuple(result + [0] * (n - len(result)))
+
+def fermat_inverse(elem, modulus, p):
+    """
+    Мультипликативный обратный элемент по малой теореме Ферма:
+    a^(-1) = a^(p^n - 2) в поле из p^n элементов.
+    """
+    n = len(modulus) - 1
+    if all(c % p == 0 for c in elem):
+        raise ZeroDivisionError("Нет обратного элемента для 0.")
+    return power_element(tuple(elem), p ** n - 2, modulus, p)
+
+def batch_inverse(elements, modulus, p, field=None):
+    """
+    Обращает сразу несколько элементов приёмом Монтгомери:
+    около 3k умножений и одно обращение для k элементов.
+    Возвращает список обратных в том же порядке.
+    """
+    n = len(modulus) - 1
+    one = tuple([1] + [0] * (n - 1))
+    prefix = []
+    accumulator = one
+    for elem in elements:
+        if all(c % p == 0 for c in elem):
+            raise ZeroDivisionError("Нет обратного элемента для 0.")
+        prefix.append(accumulator)
+        accumulator = poly_multiply(accumulator, elem, modulus, p, field)
+
+    inverse = field.inverse(accumulator) if field is not None else poly_inverse(accumulator, modulus, p)
+    result = [None] * len(prefix)
+    for i in reversed(range(len(prefix))):
+        result[i] = poly_multiply(inverse, prefix[i], modulus, p, field)
+        inverse = poly_multiply(inverse, elements[i], modulus, p, field)
+    return result
+
 def is_irreducible(poly, p):
     """
     Проверяет, является ли многочлен неприводимым над полем F_p.
     Многочлен представлен как список коэффициентов от младшего к старшему.
+
+    Используется тест Рабина: многочлен f степени n неприводим тогда и только
+    тогда, когда f делит x^(p^n) - x и НОД(x^(p^(n/q)) - x, f) = 1
+    для каждого простого делителя q числа n.
     """
+    if instrumentation.enabled:
+        instrumentation.counters['is_irreducible'] += 1
     deg = len(poly) - 1
-    if deg < 1:
+    if deg < 1 or poly[-1] % p == 0:
         return False
+    poly = [c % p for c in poly]
 
-    # Проверка наличия корней в F_p
-    for a in range(p):
-        val = 0
-        power = 1
-        for coeff in poly:
-            val = (val + coeff * power) % p
-            power = (power * a) % p
-        if val == 0:
-            return False
+    reducer = PolyReducer(poly, p)
+    x = poly_trim(reducer.reduce([0, 1]), p)
+    minus_x = [(-c) % p for c in x]
+    checkpoints = {deg // q for q in prime_factors(deg)}
 
-    # Проверка на делимость на все многочлены меньшей степени
-    for d in range(2, (deg // 2) + 1):
-        for divisor in itertools.product(range(p), repeat=d + 1):
-            # Лидирующий коэффициент не должен быть нулем
-            if divisor[-1] == 0:
-                continue
-            divisor = list(divisor)
-            _, remainder = poly_divmod(poly, divisor, p)
-            if all(c == 0 for c in remainder):
+    # h = x^(p^k) mod f, вычисляется последовательным возведением в степень p
+    h = x
+    for k in range(1, deg + 1):
+        h = list(reducer.power(h, p))
+        if k in checkpoints:
+            if poly_gcd(poly_add(h, minus_x, p), poly, p) != [1]:
                 return False
+    return poly_trim(h, p) == x
 
-    return True
-
-def find_random_irreducible_polynomial(p, n, max_attempts=1000):
+def find_random_irreducible_polynomial(p, n, max_attempts=1000, primitive=False, sparse=True,
+                                       rng=None):
     """
-    Рандомно генерирует многочлен степени n над полем F_p и проверяет его на неприводимость.
+    Рандомно генерирует многочлен степени n над полем F_p и проверяет его на неприводимость
+    (если primitive=True — на примитивность, см. is_primitive_polynomial).
+    По умолчанию (sparse=True) сначала ищется трёх- или пятичлен
+    (find_sparse_irreducible_polynomial): по такому модулю приведение выполняется
+    быстрым разреженным сдвигом, а случайный поиск выполняется, только если таких
+    многочленов нет; sparse=False — сразу случайный поиск.
+    rng — источник случайных чисел (random.Random), по умолчанию — модуль random.
     Если неприводимый многочлен найден, возвращает его.
     В противном случае, после max_attempts попыток, выбрасывает исключение.
     """
+    if rng is None:
+        rng = random
+    if sparse:
+        coeffs = find_sparse_irreducible_polynomial(p, n, primitive)
+        if coeffs is not None:
+            return coeffs
+    check = is_primitive_polynomial if primitive else is_irreducible
     tried = set()
     total_polynomials = p ** (n + 1) - p ** n  # Всего многочленов с ненулевым старшим коэффициентом
     attempts = 0
 
     while attempts < max_attempts and len(tried) < total_polynomials:
         # Генерация случайных коэффициентов от младшего к старшему
-        coeffs = [random.randint(0, p - 1) for _ in range(n + 1)]
+        coeffs = [rng.randint(0, p - 1) for _ in range(n + 1)]
         if coeffs[-1] == 0:
             continue
 
@@ -154,14 +508,114 @@ def find_random_irreducible_polynomial(p, n, max_attempts=1000):
             continue  # уже проверенный многочлен
         tried.add(poly_tuple)
         attempts += 1
+        if instrumentation.enabled:
+            instrumentation.counters['irreducible_attempts'] += 1
 
-        if is_irreducible(coeffs, p):
+        if check(coeffs, p):
             return coeffs
 
+    kind = "примитивный" if primitive else "неприводимый"
     raise ValueError(
-        f"Не удалось найти неприводимый многочлен степени {n} над F_{p} после {max_attempts} попыток."
+        f"Не удалось найти {kind} многочлен степени {n} над F_{p} после {max_attempts} попыток."
     )
 
+def is_primitive_polynomial(poly, p):
+    """
+    Проверяет, является ли многочлен примитивным над F_p: он неприводим,
+    и x — образующий мультипликативной группы поля F_p[x]/(poly).
+    """
+    if poly[0] % p == 0 or not is_irreducible(poly, p):
+        return False
+    n = len(poly) - 1
+    order = p ** n - 1
+    one = tuple([1] + [0] * (n - 1))
+    reducer = PolyReducer(poly, p)
+    return all(reducer.power([0, 1], order // factor) != one
+               for factor in factorize_group_order(p, n))
+
+def find_irreducible_polynomial(p, n, primitive=False):
+    """
+    Детерминированно находит наименьший унитарный неприводимый многочлен
+    степени n над F_p (если primitive=True — наименьший примитивный).
+    Многочлены перебираются в порядке возрастания младших коэффициентов:
+    x^n + 1, x^n + 2, ..., x^n + x + 1, ...
+    """
+    check = is_primitive_polynomial if primitive else is_irreducible
+    for value in range(1, p ** n):
+        coeffs = list(int_to_element(value, p, n)) + [1]
+        if check(coeffs, p):
+            return coeffs
+    raise ValueError(f"Не найден неприводимый многочлен степени {n} над F_{p}.")
+
+def iter_low_weight_polynomials(p, n):
+    """
+    Перечисляет унитарные многочлены степени n над F_p с ненулевым свободным
+    членом в порядке возрастания веса (числа ненулевых коэффициентов):
+    x^n + c, затем трёхчлены x^n + a*x^k + c (k = 1, 2, ...), и т. д.
+    """
+    for weight in range(2, n + 2):
+        for positions in itertools.combinations(range(1, n), weight - 2):
+            for values in itertools.product(range(1, p), repeat=weight - 1):
+                coeffs = [0] * (n + 1)
+                coeffs[-1] = 1
+                coeffs[0] = values[0]
+                for position, value in zip(positions, values[1:]):
+                    coeffs[position] = value
+                yield coeffs
+
+def find_primitive_polynomial(p, n):
+    """
+    Находит примитивный многочлен степени n над F_p наименьшего веса
+    (см. iter_low_weight_polynomials). В поле по такому модулю x — образующий,
+    и таблицы степеней строятся сдвигами без поиска образующего.
+    """
+    for coeffs in iter_low_weight_polynomials(p, n):
+        if is_primitive_polynomial(coeffs, p):
+            return coeffs
+    raise ValueError(f"Не найден примитивный многочлен степени {n} над F_{p}.")
+
+# Наибольшая степень делителей, которые ищет предварительная проверка _has_small_factor
+SMALL_FACTOR_DEGREE = 8
+
+def _has_small_factor(poly, p, max_degree=SMALL_FACTOR_DEGREE):
+    """
+    Быстрая предварительная проверка: есть ли у poly делитель степени
+    не выше max_degree (и меньше половины степени poly). Произведение
+    (x^(p^k) - x) mod poly по k = 1..max_degree сравнивается с poly через
+    один НОД: большинство приводимых многочленов отсеивается без полной
+    проверки is_irreducible.
+    """
+    deg = len(poly) - 1
+    reducer = PolyReducer(poly, p)
+    x = list(reducer.reduce([0, 1]))
+    h = x
+    accumulated = reducer.reduce([1])
+    for _ in range(min(max_degree, deg // 2)):
+        h = list(reducer.power(h, p))
+        accumulated = reducer.multiply(accumulated, poly_add(h, [(-c) % p for c in x], p))
+    return poly_gcd(list(accumulated), poly, p) != [1]
+
+def find_sparse_irreducible_polynomial(p, n, primitive=False):
+    """
+    Находит неприводимый (при primitive=True — примитивный) многочлен степени n
+    над F_p наименьшего веса, не большего SPARSE_MAX_WEIGHT: двучлен,
+    трёхчлен и т. д. до пятичлена (см. iter_low_weight_polynomials).
+    Возвращает None, если таких нет (например, над F_2 не бывает
+    неприводимых трёхчленов степени, кратной 8).
+    """
+    check = is_primitive_polynomial if primitive else is_irreducible
+    for coeffs in iter_low_weight_polynomials(p, n):
+        if sum(1 for c in coeffs if c) > SPARSE_MAX_WEIGHT:
+            return None
+        # Сумма коэффициентов — значение в точке 1: если оно ноль, многочлен делится на x - 1
+        if n > 1 and sum(coeffs) % p == 0:
+            continue
+        if _has_small_factor(coeffs, p):
+            continue
+        if check(coeffs, p):
+            return coeffs
+    return None
+
 def generate_field_elements(p, n):
     """
     Генерирует все элементы поля Галуа F_{p^n}.
@@ -169,6 +623,243 @@ def generate_field_elements(p, n):
     """
     return list(itertools.product(range(p), repeat=n))
 
+def element_to_int(elem, p):
+    """
+    Упаковывает элемент поля (кортеж коэффициентов от младшего к старшему)
+    в одно целое число — цифры в системе счисления с основанием p.
+    Для p = 2 это битовая маска: коэффициент при x^i — i-й бит.
+    """
+    value = 0
+    for coeff in reversed(elem):
+        value = value * p + coeff % p
+    return value
+
+def int_to_element(value, p, n):
+    """
+    Распаковывает целое число в кортеж из n коэффициентов (обратно к element_to_int).
+    """
+    coeffs = []
+    for _ in range(n):
+        value, coeff = divmod(value, p)
+        coeffs.append(coeff)
+    return tuple(coeffs)
+
+def packed_add(a, b, p):
+    """
+    Сложение упакованных элементов: поразрядно по модулю p, для p = 2 — XOR.
+    """
+    if p == 2:
+        return a ^ b
+    result = 0
+    place = 1
+    while a or b:
+        a, digit_a = divmod(a, p)
+        b, digit_b = divmod(b, p)
+        result += ((digit_a + digit_b) % p) * place
+        place *= p
+    return result
+
+def packed_subtract(a, b, p):
+    """
+    Вычитание упакованных элементов: поразрядно по модулю p, для p = 2 — XOR.
+    """
+    if p == 2:
+        return a ^ b
+    result = 0
+    place = 1
+    while a or b:
+        a, digit_a = divmod(a, p)
+        b, digit_b = divmod(b, p)
+        result += ((digit_a - digit_b) % p) * place
+        place *= p
+    return result
+
+def gf2_multiply(a, b, modulus_mask):
+    """
+    Умножение элементов GF(2^n), упакованных в битовые маски, без переносов
+    (сдвиг и XOR). modulus_mask — битовая маска неприводимого многочлена
+    степени n; a и b должны быть меньше 2^n.
+    """
+    top = 1 << (modulus_mask.bit_length() - 1)
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        b >>= 1
+        a <<= 1
+        if a & top:
+            a ^= modulus_mask
+    return result
+
+def packed_multiply(a, b, modulus, p):
+    """
+    Умножение упакованных элементов поля по модулю многочлена modulus.
+    Для p = 2 используется gf2_multiply, иначе — poly_multiply.
+    """
+    if p == 2:
+        return gf2_multiply(a, b, element_to_int(modulus, 2))
+    n = len(modulus) - 1
+    product = poly_multiply(int_to_element(a, p, n), int_to_element(b, p, n), modulus, p)
+    return element_to_int(product, p)
+
+def x_multiplier(modulus, p):
+    """
+    Возвращает функцию умножения упакованного элемента на x по модулю modulus:
+    сдвиг на один разряд и, если старший коэффициент c ненулевой,
+    вычитание c, умноженного на приведённый к унитарному виду модуль.
+    Для p = 2 это сдвиг влево и XOR с маской модуля.
+    """
+    n = len(modulus) - 1
+    if p == 2:
+        mask = element_to_int(modulus, 2)
+        top = 1 << n
+
+        def step(value):
+            value <<= 1
+            if value & top:
+                value ^= mask
+            return value
+        return step
+
+    lead_inv = modinv(modulus[-1], p)
+    place = p ** (n - 1)
+    # reductions[c] — упакованный многочлен -c * (modulus / lead - x^n)
+    reductions = [0] + [
+        element_to_int([(-carry * c * lead_inv) % p for c in modulus[:-1]], p)
+        for carry in range(1, p)
+    ]
+
+    def step(value):
+        carry, rest = divmod(value, place)
+        if carry == 0:
+            return rest * p
+        return packed_add(rest * p, reductions[carry], p)
+    return step
+
+class FieldElementsView(collections.abc.Sequence):
+    """
+    Ленивое представление элементов поля F_{p^n} в порядке «по степени,
+    затем по старшему коэффициенту, затем лексикографически» (как сортировка
+    в меню), без хранения списка элементов. Индекс элемента (rank) и элемент
+    по индексу (unrank) вычисляются арифметически:
+    нуль имеет индекс 0, а элементы степени d занимают индексы
+    [p^d, p^(d+1)): сначала по старшему коэффициенту, затем по младшим
+    коэффициентам x_0, x_1, ..., x_(d-1) как по цифрам числа.
+    При nonzero=True нуль исключается (мультипликативная группа).
+    len() ограничен sys.maxsize, поэтому для очень больших полей
+    число элементов доступно как атрибут size.
+    """
+
+    def __init__(self, p, n, nonzero=False):
+        self.p = p
+        self.n = n
+        self.nonzero = nonzero
+        self._offset = 1 if nonzero else 0
+        self.size = p ** n - self._offset
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        kind = "F_{p^n}^*" if self.nonzero else "F_{p^n}"
+        return f"FieldElementsView({kind}, p={self.p}, n={self.n})"
+
+    def unrank(self, rank):
+        """Элемент поля с индексом rank (без учёта nonzero)."""
+        p, n = self.p, self.n
+        if rank == 0:
+            return tuple([0] * n)
+        degree = 0
+        block = 1  # p^degree
+        while block * p <= rank:
+            block *= p
+            degree += 1
+        lead, low = divmod(rank - block, block)
+        coeffs = [0] * n
+        coeffs[degree] = lead + 1
+        for i in reversed(range(degree)):
+            low, coeffs[i] = divmod(low, p)
+        return tuple(coeffs)
+
+    def rank(self, elem):
+        """Индекс элемента поля (без учёта nonzero)."""
+        p = self.p
+        degree = get_degree(elem)
+        if degree == -1:
+            return 0
+        block = p ** degree
+        low = 0
+        for i in range(degree):
+            low = low * p + elem[i] % p
+        return block + (elem[degree] % p - 1) * block + low
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.size))]
+        length = self.size
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("Индекс элемента поля вне диапазона.")
+        return self.unrank(index + self._offset)
+
+    def __iter__(self):
+        # По блокам одной степени, как iter_packed: младшие коэффициенты
+        # элементов степени d строятся из списка для степени d - 1, без unrank
+        p, n = self.p, self.n
+        if not self.nonzero:
+            yield tuple([0] * n)
+        low_parts = [()]
+        for degree in range(n):
+            if degree:
+                low_parts = [(digit,) + low for digit in range(p) for low in low_parts]
+            padding = (0,) * (n - degree - 1)
+            for lead in range(1, p):
+                tail = (lead,) + padding
+                for low in low_parts:
+                    yield low + tail
+
+    def iter_packed(self):
+        """
+        Элементы в том же порядке, но сразу в упакованном виде (см. element_to_int),
+        без построения кортежей. Младшие коэффициенты элементов степени d
+        перечисляются списком, который строится из списка для степени d - 1.
+        """
+        p = self.p
+        if not self.nonzero:
+            yield 0
+        low_values = [0]
+        block = 1  # p^degree
+        for degree in range(self.n):
+            if degree:
+                block *= p
+                low_values = [digit + p * low for digit in range(p) for low in low_values]
+            for lead in range(1, p):
+                base = lead * block
+                for low in low_values:
+                    yield base + low
+
+    def __contains__(self, elem):
+        elem = tuple(elem)
+        if len(elem) != self.n or any(not 0 <= c < self.p for c in elem):
+            return False
+        return not (self.nonzero and get_degree(elem) == -1)
+
+    def index(self, elem, start=0, stop=None):
+        if elem not in self:
+            raise ValueError("Элемент не принадлежит полю.")
+        index = self.rank(tuple(elem)) - self._offset
+        if index < start or (stop is not None and index >= stop):
+            raise ValueError("Элемент вне заданного диапазона.")
+        return index
+
+    def count(self, elem):
+        return 1 if elem in self else 0
+
+    def nonzero_view(self):
+        """Представление мультипликативной группы (без нуля)."""
+        return FieldElementsView(self.p, self.n, nonzero=True)
+
 def get_degree(poly):
     """
     Возвращает степень многочлена.
@@ -179,65 +870,145 @@ def get_degree(poly):
             return i
     return -1
 
+@functools.lru_cache(maxsize=4096)
+def _polynomial_term(i, coeff):
+    """Одночлен coeff * x^i для polynomial_to_string (результат запоминается)."""
+    if i == 0:
+        return f"{coeff}"
+    power = "x" if i == 1 else f"x^{i}"
+    if coeff == 1:
+        return power
+    if coeff == -1:
+        return f"-{power}"
+    return f"{coeff}{power}"
+
 def polynomial_to_string(poly):
     """
     Преобразует многочлен из списка коэффициентов в строку.
     Пример: [1, 0, 2] -> "2x^2 + 1"
     """
-    degree = get_degree(poly)
-    if degree == -1:
+    terms = [_polynomial_term(i, coeff) for i, coeff in enumerate(poly) if coeff != 0]
+    if not terms:
         return "0"
+    terms.reverse()
+    # Объединение терминов с правильными знаками: "a + -b" -> "a - b"
+    return " + ".join(terms).replace(" + -", " - ")
 
-    terms = []
-    for i in range(degree, -1, -1):
-        coeff = poly[i]
-        if coeff == 0:
-            continue
-        term = ""
-        if i == 0:
-            term = f"{coeff}"
-        elif i == 1:
-            if coeff == 1:
-                term = "x"
-            elif coeff == -1:
-                term = "-x"
-            else:
-                term = f"{coeff}x"
-        else:
-            if coeff == 1:
-                term = f"x^{i}"
-            elif coeff == -1:
-                term = f"-x^{i}"
-            else:
-                term = f"{coeff}x^{i}"
-        terms.append(term)
-
-    # Объединение терминов с правильными знаками
-    polynomial = terms[0]
-    for term in terms[1:]:
-        if term.startswith('-'):
-            polynomial += f" - {term[1:]}"
+def pollard_rho(number):
+    """
+    Находит нетривиальный делитель составного числа number
+    ρ-методом Полларда (вариант Брента с накоплением произведения для НОД).
+    """
+    if number % 2 == 0:
+        return 2
+    for c in itertools.count(1):
+        y, r, q, g = 2, 1, 1, 1
+        x = ys = y
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % number
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(128, r - k)):
+                    y = (y * y + c) % number
+                    q = q * abs(x - y) % number
+                g = math.gcd(q, number)
+                k += 128
+            r *= 2
+        if g == number:
+            # Произведение «перескочило» делитель — повторяем по одному шагу
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % number
+                g = math.gcd(abs(x - ys), number)
+        if g != number:
+            return g
+
+def factorize(number):
+    """
+    Разложение числа на простые множители: пробное деление на малые
+    простые, затем ρ-метод Полларда для оставшейся части.
+    Возвращает словарь {простое: показатель степени} по возрастанию простых.
+    """
+    factors = {}
+    temp = number
+    for prime in SMALL_PRIMES:
+        if prime * prime > temp:
+            break
+        while temp % prime == 0:
+            factors[prime] = factors.get(prime, 0) + 1
+            temp //= prime
+    stack = [temp] if temp > 1 else []
+    while stack:
+        value = stack.pop()
+        if is_prime(value):
+            factors[value] = factors.get(value, 0) + 1
         else:
-            polynomial += f" + {term}"
-    return polynomial
+            divisor = pollard_rho(value)
+            stack.extend((divisor, value // divisor))
+    return dict(sorted(factors.items()))
+
+@functools.lru_cache(maxsize=256)
+def _group_order_factorization(p, n):
+    factors = {}
+    cyclotomic = {}
+    for d in range(1, n + 1):
+        if n % d:
+            continue
+        # Φ_d(p) = (p^d - 1) / ∏ Φ_e(p) по собственным делителям e числа d
+        value = p ** d - 1
+        for e, phi in cyclotomic.items():
+            if d % e == 0:
+                value //= phi
+        cyclotomic[d] = value
+        for prime, exponent in factorize(value).items():
+            factors[prime] = factors.get(prime, 0) + exponent
+    return tuple(sorted(factors.items()))
+
+def factorize_group_order(p, n):
+    """
+    Разложение порядка мультипликативной группы p^n - 1 (с запоминанием).
+    Число раскладывается по круговым многочленам: p^n - 1 = ∏ Φ_d(p)
+    по всем делителям d числа n, и каждый множитель Φ_d(p), много меньший
+    p^n - 1, раскладывается отдельно.
+    """
+    return dict(_group_order_factorization(p, n))
+
+def factorize_divisor(number, factorization):
+    """
+    Разложение делителя number числа с известным разложением factorization
+    (например, порядка элемента по разложению порядка группы).
+    """
+    factors = {}
+    for prime in factorization:
+        while number % prime == 0:
+            factors[prime] = factors.get(prime, 0) + 1
+            number //= prime
+    if number != 1:
+        raise ValueError("Число не является делителем разложенного числа.")
+    return factors
+
+def prime_factors(number):
+    """
+    Возвращает множество простых делителей числа number.
+    """
+    return set(factorize(number))
 
-def find_generators(multiplicative_group, modulus, p, order):
+def find_generators(multiplicative_group, modulus, p, order, field=None):
     """
     Находит образующие элементы мультипликативной группы F_{p^n}^*.
     """
     generators = []
+    n = len(modulus) - 1
     # Находим простые множители порядка группы
-    factors = set()
-    temp = order
-    for i in range(2, int(order ** 0.5) + 1):
-        while temp % i == 0:
-            factors.add(i)
-            temp = temp // i
-    if temp > 1:
-        factors.add(temp)
+    if order == p ** n - 1:
+        factors = set(factorize_group_order(p, n))
+    else:
+        factors = prime_factors(order)
 
     # Корректное определение identity
-    n = len(modulus) - 1
     identity = tuple([1] + [0] * (n - 1))  # Для n=2: (1, 0)
 
     for elem in multiplicative_group:
@@ -246,7 +1017,7 @@ def find_generators(multiplicative_group, modulus, p, order):
         is_generator = True
         for factor in factors:
             exp = order // factor
-            power = power_element(elem, exp, modulus, p)
+            power = power_element(elem, exp, modulus, p, field)
             if power == identity:
                 is_generator = False
                 break
@@ -254,11 +1025,71 @@ def find_generators(multiplicative_group, modulus, p, order):
             generators.append(elem)
     return generators
 
-def power_element(elem, exponent, modulus, p):
+def euler_phi(number):
+    """
+    Функция Эйлера: количество чисел от 1 до number, взаимно простых с number.
+    """
+    result = number
+    for factor in prime_factors(number):
+        result = result // factor * (factor - 1)
+    return result
+
+def count_generators(p, n):
+    """
+    Количество образующих мультипликативной группы F_{p^n}^*: φ(p^n - 1).
+    """
+    result = p ** n - 1
+    for factor in factorize_group_order(p, n):
+        result = result // factor * (factor - 1)
+    return result
+
+def find_primitive_element(modulus, p, field=None):
+    """
+    Находит один примитивный элемент поля F_p[x]/(modulus).
+    Кандидаты проверяются по простым делителям порядка группы, первым — x.
+    """
+    if field is not None:
+        return field.generator
+    n = len(modulus) - 1
+    order = p ** n - 1
+    factors = factorize_group_order(p, n)
+    one = tuple([1] + [0] * (n - 1))
+    zero = tuple([0] * n)
+    _, x = poly_divmod([0, 1], list(modulus), p)
+    x = tuple(x + [0] * (n - len(x)))
+    for elem in itertools.chain([x], itertools.product(range(p), repeat=n)):
+        if elem == zero:
+            continue
+        if all(power_element(elem, order // factor, modulus, p) != one for factor in factors):
+            return elem
+    raise ValueError(f"Многочлен {polynomial_to_string(modulus)} не задаёт поле.")
+
+def iter_generators(modulus, p, field=None):
+    """
+    Лениво перечисляет все образующие мультипликативной группы как g^k,
+    где g — примитивный элемент и НОД(k, p^n - 1) = 1.
+    Для получения первых образующих не нужно перебирать всё поле.
+    """
+    n = len(modulus) - 1
+    order = p ** n - 1
+    generator = find_primitive_element(modulus, p, field)
+    current = generator
+    for k in range(1, order + 1):
+        if math.gcd(k, order) == 1:
+            yield current
+        current = poly_multiply(current, generator, modulus, p, field)
+
+def power_element(elem, exponent, modulus, p, field=None):
     """
     Возводит элемент поля Галуа в заданную степень.
+    Если передан объект field (GaloisField), используется таблица логарифмов.
     """
-    result = tuple([1] + [0] * (len(modulus) - 1))  # Элемент 1
+    if instrumentation.enabled:
+        instrumentation.counters['power_element'] += 1
+    if field is not None:
+        return field.power(elem, exponent)
+
+    result = tuple([1] + [0] * (len(modulus) - 2))  # Элемент 1
     base = elem
     while exponent > 0:
         if exponent % 2 == 1:
@@ -267,7 +1098,180 @@ def power_element(elem, exponent, modulus, p):
         exponent = exponent // 2
     return result
 
-def element_order(elem, multiplicative_group, modulus, p):
+def element_orders(elements, modulus, p, field=None):
+    """
+    Порядки сразу нескольких элементов мультипликативной группы (для нуля — 0).
+    Элементы — кортежи коэффициентов или упакованные числа (см. element_to_int,
+    FieldElementsView.iter_packed).
+    Если передан field (GaloisField), порядок читается из таблицы логарифмов:
+    ord(g^k) = (q - 1) / НОД(k, q - 1). Иначе из q - 1 последовательно
+    вычёркиваются простые множители, пока elem^(порядок / r) = 1.
+    """
+    n = len(modulus) - 1
+    group_order = p ** n - 1
+    if field is not None:
+        log_table = field.log_table
+        gcd = math.gcd
+        orders = []
+        for elem in elements:
+            value = elem if isinstance(elem, int) else field.to_int(elem)
+            if value == 0:
+                orders.append(0)
+            else:
+                orders.append(group_order // gcd(log_table[value], group_order))
+        return orders
+
+    factorization = factorize_group_order(p, n)
+    one = tuple([1] + [0] * (n - 1))
+    orders = []
+    for elem in elements:
+        if isinstance(elem, int):
+            elem = int_to_element(elem, p, n)
+        if all(c % p == 0 for c in elem):
+            orders.append(0)
+            continue
+        order = group_order
+        for prime, exponent in factorization.items():
+            for _ in range(exponent):
+                if power_element(tuple(elem), order // prime, modulus, p) != one:
+                    break
+                order //= prime
+        orders.append(order)
+    return orders
+
+def baby_step_giant_step(base, target, order, modulus, p, field=None):
+    """
+    Решает base^k = target (0 <= k < order) методом «шаг младенца — шаг великана»
+    за O(√order) умножений и памяти. Если решения нет, выбрасывает ValueError.
+    """
+    n = len(modulus) - 1
+    steps = math.isqrt(order - 1) + 1 if order > 1 else 1
+    one = tuple([1] + [0] * (n - 1))
+    baby_steps = {}
+    current = one
+    for j in range(steps):
+        baby_steps.setdefault(current, j)
+        current = poly_multiply(current, base, modulus, p, field)
+
+    # giant = base^(-steps)
+    giant = power_element(poly_inverse(base, modulus, p), steps, modulus, p, field)
+    gamma = tuple(target)
+    for i in range(steps):
+        j = baby_steps.get(gamma)
+        if j is not None and i * steps + j < order:
+            return i * steps + j
+        gamma = poly_multiply(gamma, giant, modulus, p, field)
+    raise ValueError("Элемент не является степенью основания.")
+
+def discrete_log(elem, generator, modulus, p, field=None):
+    """
+    Дискретный логарифм: наименьшее k >= 0, для которого generator^k = elem.
+
+    Используется алгоритм Полига — Хеллмана по разложению порядка generator:
+    для каждого простого множителя r^e задача сводится к e логарифмам в группе
+    порядка r, которые решаются методом «шаг младенца — шаг великана»
+    за O(√r). Ответы объединяются китайской теоремой об остатках.
+    Если передан field с таблицей логарифмов, ответ вычисляется по ней.
+    Если elem не является степенью generator, выбрасывает ValueError.
+    """
+    n = len(modulus) - 1
+    elem = tuple(elem) + (0,) * (n - len(elem))
+    if all(c % p == 0 for c in elem):
+        raise ValueError("Логарифм нуля не определён.")
+    order = element_orders([generator], modulus, p, field)[0]
+
+    if field is not None:
+        # generator^k = elem  <=>  k * log(g) ≡ log(elem) (mod q - 1)
+        group_order = field.size - 1
+        log_g, log_h = field.log(generator), field.log(elem)
+        step = group_order // order  # = НОД(log_g, q - 1)
+        if log_h % step:
+            raise ValueError("Элемент не является степенью основания.")
+        return (log_h // step) * pow(log_g // step, -1, order) % order
+
+    one = tuple([1] + [0] * (n - 1))
+    residues = []
+    for prime, exponent in factorize_divisor(order, factorize_group_order(p, n)).items():
+        prime_power = prime ** exponent
+        cofactor = order // prime_power
+        g_i = power_element(generator, cofactor, modulus, p)
+        h_i = power_element(elem, cofactor, modulus, p)
+        # gamma имеет порядок prime
+        gamma = power_element(g_i, prime_power // prime, modulus, p)
+        g_i_inv = poly_inverse(g_i, modulus, p)
+        x = 0
+        for k in range(exponent):
+            shifted = poly_multiply(power_element(g_i_inv, x, modulus, p), h_i, modulus, p)
+            h_k = power_element(shifted, prime ** (exponent - 1 - k), modulus, p)
+            digit = baby_step_giant_step(gamma, h_k, prime, modulus, p)
+            x += digit * prime ** k
+        residues.append((x, prime_power))
+
+    # Китайская теорема об остатках
+    result, modulus_crt = 0, 1
+    for residue, prime_power in residues:
+        t = (residue - result) * pow(modulus_crt, -1, prime_power) % prime_power
+        result += modulus_crt * t
+        modulus_crt *= prime_power
+    result %= order
+    if power_element(generator, result, modulus, p) != elem and not (result == 0 and elem == one):
+        raise ValueError("Элемент не является степенью основания.")
+    return result
+
+
+class DiscreteLogTable:
+    """
+    Дискретные логарифмы по фиксированному основанию.
+    Если порядок основания не больше max_size, при создании строится полная
+    таблица степеней и каждый запрос стоит O(1); иначе запросы решаются
+    функцией discrete_log, а последние ответы хранятся в ограниченном кэше.
+    """
+
+    def __init__(self, generator, modulus, p, field=None, max_size=1 << 20, cache_size=1024):
+        self.generator = tuple(generator)
+        self.modulus = tuple(modulus)
+        self.p = p
+        self.field = field
+        self.cache_size = cache_size
+        self.order = element_orders([self.generator], self.modulus, p, field)[0]
+        self._cache = collections.OrderedDict()
+        self.table = None
+        if self.order <= max_size:
+            table = {}
+            n = len(self.modulus) - 1
+            _, x = poly_divmod([0, 1], list(self.modulus), p)
+            if self.generator == tuple(x + [0] * (n - len(x))):
+                # Основание x: степени получаются сдвигами упакованных элементов
+                step = x_multiplier(self.modulus, p)
+                current = 1
+                for exponent in range(self.order):
+                    table[int_to_element(current, p, n)] = exponent
+                    current = step(current)
+            else:
+                current = tuple([1] + [0] * (n - 1))
+                for exponent in range(self.order):
+                    table[current] = exponent
+                    current = poly_multiply(current, self.generator, self.modulus, p, field)
+            self.table = table
+
+    def log(self, elem):
+        """Логарифм elem по основанию generator (ValueError, если его нет)."""
+        elem = tuple(elem)
+        if self.table is not None:
+            exponent = self.table.get(elem)
+            if exponent is None:
+                raise ValueError("Элемент не является степенью основания.")
+            return exponent
+        if elem in self._cache:
+            self._cache.move_to_end(elem)
+            return self._cache[elem]
+        exponent = discrete_log(elem, self.generator, self.modulus, self.p, self.field)
+        self._cache[elem] = exponent
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return exponent
+
+def element_order(elem, multiplicative_group, modulus, p, field=None):
     """
     Определяет порядок элемента в мультипликативной группе.
     """
@@ -279,8 +1283,221 @@ def element_order(elem, multiplicative_group, modulus, p):
     identity = tuple([1] + [0] * (n - 1))  # Для n=2: (1, 0)
 
     while power != identity:
-        power = poly_multiply(power, elem, modulus, p)
+        power = poly_multiply(power, elem, modulus, p, field)
         order += 1
         if order > len(multiplicative_group):
             return order  # Защита от бесконечного цикла
     return order
+
+
+class GaloisField:
+    """
+    Поле Галуа F_{p^n}, заданное неприводимым многочленом modulus.
+    При создании один раз строит таблицы степеней образующего (exp_table)
+    и логарифмов (log_table), после чего умножение, деление, обращение
+    и возведение в степень сводятся к поиску в таблицах. Если модуль
+    примитивен (x_is_primitive, см. find_primitive_polynomial), образующим
+    служит x и таблицы строятся одним проходом сдвигов без поиска
+    образующего; иначе образующий ищется функцией find_primitive_element,
+    а каждый шаг построения таблиц — полное умножение в поле. Такой путь
+    в разы медленнее: для GF(3^10) с непримитивным модулем — секунды
+    (около 1,5–3 с против 0,2 с). Поэтому модуль лучше брать из каталога
+    с primitive=True (get_irreducible_polynomial(p, n, primitive=True)).
+    Атрибут reduction — способ приведения по модулю (см. reduction_strategy).
+
+    Таблицы хранят элементы в упакованном виде (целые числа, см. element_to_int).
+    Методы multiply, inverse и т. д. принимают и возвращают кортежи,
+    методы с суффиксом _int работают непосредственно с упакованными числами.
+    """
+
+    @instrumentation.timed('field_build')
+    def __init__(self, p, modulus):
+        self.p = p
+        self.modulus = tuple(modulus)
+        self.n = len(self.modulus) - 1
+        self.size = p ** self.n
+        self.zero = tuple([0] * self.n)
+        self.one = tuple([1] + [0] * (self.n - 1))
+        self.reduction = reduction_strategy(self.modulus, p)
+        # Примитивность модуля проверяется возведением x в степени
+        # (p^n - 1) / q по разложению из кэша; только тогда таблицы
+        # строятся сдвигами x, иначе обход степеней x был бы напрасным
+        self.x_is_primitive = is_primitive_polynomial(list(self.modulus), p)
+        if self.x_is_primitive:
+            self.generator = self.element((0, 1))
+            tables = self._build_tables(x_multiplier(self.modulus, p))
+        else:
+            self.generator = find_primitive_element(self.modulus, p)
+            tables = self._build_tables(self._generator_multiplier())
+        if tables is None:
+            raise ValueError(f"Многочлен {polynomial_to_string(self.modulus)} не задаёт поле.")
+        self.exp_table, self.log_table = tables
+
+    @classmethod
+    def from_tables(cls, p, modulus, generator, exp_table, log_table):
+        """
+        Восстанавливает поле по готовым таблицам (например, из файла снимка,
+        см. snapshot.py) без поиска примитивного элемента и без умножений
+        в поле: exp_table — удвоенная таблица степеней образующего
+        (2 * (p^n - 1) значений), log_table — таблица логарифмов (p^n значений).
+        Таблицы используются как есть, без копирования (например, memoryview
+        над отображённым в память файлом). Проверяются только размеры таблиц;
+        значения вне поля должен отсечь вызывающий (см. snapshot.py).
+        """
+        field = cls.__new__(cls)
+        field.p = p
+        field.modulus = tuple(modulus)
+        field.n = len(field.modulus) - 1
+        field.size = p ** field.n
+        field.zero = tuple([0] * field.n)
+        field.one = tuple([1] + [0] * (field.n - 1))
+        field.reduction = reduction_strategy(field.modulus, p)
+        field.generator = tuple(generator)
+        field.x_is_primitive = field.generator == field.element((0, 1))
+        order = field.size - 1
+        if len(exp_table) != 2 * order or len(log_table) != field.size:
+            raise ValueError("Размер таблиц степеней и логарифмов не соответствует полю.")
+        field.exp_table = exp_table
+        field.log_table = log_table
+        return field
+
+    def __getstate__(self):
+        # Таблицы-memoryview (см. from_tables) не сериализуются — передаются списками
+        state = self.__dict__.copy()
+        for name in ('exp_table', 'log_table'):
+            if isinstance(state[name], memoryview):
+                state[name] = state[name].tolist()
+        return state
+
+    def _generator_multiplier(self):
+        """Функция умножения упакованного элемента на self.generator."""
+        p = self.p
+        generator = element_to_int(self.generator, p)
+        if p == 2:
+            mask = element_to_int(self.modulus, 2)
+
+            def step(value):
+                return gf2_multiply(value, generator, mask)
+        else:
+            def step(value):
+                return packed_multiply(value, generator, self.modulus, p)
+        return step
+
+    def _build_tables(self, step):
+        """
+        Строит таблицу степеней элемента (step — умножение на него) и обратную
+        ей таблицу логарифмов за один проход. Возвращает None, если элемент
+        не образующий: степени вернулись к 1 раньше p^n - 1 шагов (или не
+        вернулись вовсе). Таблица степеней удвоена, чтобы при умножении
+        не брать остаток. log_table[0] не используется: логарифм нуля не определён.
+        """
+        order = self.size - 1
+        exp_table = [0] * (2 * order)
+        log_table = [0] * self.size
+        current = 1
+        for exponent in range(order):
+            if exponent and current <= 1:
+                return None
+            exp_table[exponent] = current
+            log_table[current] = exponent
+            current = step(current)
+        if current != 1:
+            return None
+        exp_table[order:] = exp_table[:order]
+        return exp_table, log_table
+
+    def element(self, poly):
+        """
+        Приводит многочлен к каноническому кортежу длины n по модулю modulus.
+        """
+        if type(poly) is tuple and len(poly) == self.n:
+            return poly
+        if len(poly) > self.n and self.reduction == 'sparse':
+            return tuple(sparse_reduce(poly, sparse_modulus_terms(self.modulus, self.p), self.n, self.p))
+        coeffs = [c % self.p for c in poly]
+        if len(coeffs) > self.n:
+            _, coeffs = poly_divmod(coeffs, list(self.modulus), self.p)
+        return tuple(coeffs) + (0,) * (self.n - len(coeffs))
+
+    def to_int(self, elem):
+        """Упаковывает элемент поля в целое число."""
+        return element_to_int(self.element(elem), self.p)
+
+    def from_int(self, value):
+        """Распаковывает целое число в кортеж коэффициентов длины n."""
+        return int_to_element(value, self.p, self.n)
+
+    def log(self, elem):
+        """
+        Дискретный логарифм элемента по основанию self.generator.
+        """
+        value = self.to_int(elem)
+        if value == 0:
+            raise ValueError("Логарифм нуля не определён.")
+        return self.log_table[value]
+
+    def add(self, a, b):
+        """Сложение двух элементов поля."""
+        return self.from_int(self.add_int(self.to_int(a), self.to_int(b)))
+
+    def subtract(self, a, b):
+        """Вычитание двух элементов поля."""
+        return self.from_int(self.subtract_int(self.to_int(a), self.to_int(b)))
+
+    def multiply(self, a, b):
+        """Умножение двух элементов поля через таблицы логарифмов."""
+        return self.from_int(self.multiply_int(self.to_int(a), self.to_int(b)))
+
+    def inverse(self, elem):
+        """Мультипликативный обратный элемент."""
+        return self.from_int(self.inverse_int(self.to_int(elem)))
+
+    def divide(self, a, b):
+        """Деление a на b."""
+        return self.from_int(self.divide_int(self.to_int(a), self.to_int(b)))
+
+    def power(self, elem, exponent):
+        """
+        Возведение элемента в целую степень (допускаются отрицательные показатели).
+        """
+        return self.from_int(self.power_int(self.to_int(elem), exponent))
+
+    def add_int(self, a, b):
+        """Сложение упакованных элементов (для p = 2 — XOR)."""
+        if self.p == 2:
+            return a ^ b
+        return packed_add(a, b, self.p)
+
+    def subtract_int(self, a, b):
+        """Вычитание упакованных элементов (для p = 2 совпадает со сложением)."""
+        if self.p == 2:
+            return a ^ b
+        return packed_subtract(a, b, self.p)
+
+    def multiply_int(self, a, b):
+        """Умножение упакованных элементов."""
+        if a == 0 or b == 0:
+            return 0
+        return self.exp_table[self.log_table[a] + self.log_table[b]]
+
+    def inverse_int(self, a):
+        """Обратный к упакованному элементу."""
+        if a == 0:
+            raise ZeroDivisionError("Нет обратного элемента для 0.")
+        return self.exp_table[(self.size - 1) - self.log_table[a]]
+
+    def divide_int(self, a, b):
+        """Деление упакованных элементов."""
+        if b == 0:
+            raise ZeroDivisionError("Нет обратного элемента для 0.")
+        if a == 0:
+            return 0
+        return self.exp_table[self.log_table[a] + (self.size - 1) - self.log_table[b]]
+
+    def power_int(self, a, exponent):
+        """Возведение упакованного элемента в целую степень."""
+        if a == 0:
+            if exponent < 0:
+                raise ZeroDivisionError("Нет обратного элемента для 0.")
+            return 1 if exponent == 0 else 0
+        return self.exp_table[(self.log_table[a] * exponent) % (self.size - 1)]
@@ -0,0 +1,309 @@
+"""
+Пакетная арифметика над массивами элементов поля Галуа.
+
+Элементы передаются либо в упакованном виде (целые числа, см. GF.element_to_int) —
+скаляр или одномерный массив, — либо матрицей коэффициентов формы (k, n),
+строки которой — элементы (коэффициенты от младшего к старшему).
+Одиночный кортеж считается одним элементом в виде коэффициентов.
+Результат возвращается матрицей, если хотя бы один операнд был матрицей,
+иначе — в упакованном виде.
+
+С NumPy операции выполняются над массивами целиком: для небольших полей —
+выборками из таблиц степеней и логарифмов GaloisField, для больших —
+векторизованной свёрткой коэффициентов с приведением по модулю.
+Без NumPy те же функции работают поэлементно над списками.
+"""
+import itertools
+
+from GF import (
+    poly_add, poly_multiply, poly_inverse, modinv,
+    element_to_int, int_to_element, GaloisField
+)
+
+try:
+    import numpy
+except ImportError:  # NumPy необязателен: без него операции выполняются поэлементно
+    numpy = None
+
+# Наибольший размер поля, для которого строятся таблицы степеней и логарифмов
+TABLE_SIZE_LIMIT = 1 << 20
+
+
+class BatchField:
+    """
+    Поэлементные операции над массивами элементов поля F_{p^n}.
+    strategy — 'tables' (выборки из таблиц GaloisField) или
+    'convolution' (свёртка коэффициентов с приведением по модулю).
+    """
+
+    def __init__(self, p, modulus, field=None):
+        self.p = p
+        self.modulus = tuple(modulus)
+        self.n = len(self.modulus) - 1
+        self.size = p ** self.n
+        self.order = self.size - 1
+        if field is None and self.size <= TABLE_SIZE_LIMIT:
+            field = GaloisField(p, self.modulus)
+        self.field = field
+        self.strategy = 'tables' if field is not None else 'convolution'
+        # Приведённый к унитарному виду модуль (без старшего коэффициента)
+        lead_inv = modinv(self.modulus[-1], p)
+        self.monic = tuple(c * lead_inv % p for c in self.modulus[:-1])
+
+        if numpy is not None:
+            self._monic = numpy.array(self.monic, dtype=numpy.int64)
+            if self.size <= 1 << 63:
+                self._powers = numpy.array([p ** i for i in range(self.n)], dtype=numpy.int64)
+            else:
+                self._powers = None
+            if field is not None:
+                self._exp = numpy.array(field.exp_table, dtype=numpy.int64)
+                self._log = numpy.array(field.log_table, dtype=numpy.int64)
+
+    def __repr__(self):
+        return f"BatchField(p={self.p}, n={self.n}, strategy={self.strategy!r})"
+
+    # --- Преобразования представлений ---
+
+    def pack(self, matrix):
+        """Матрица коэффициентов (k, n) -> массив упакованных элементов."""
+        if numpy is None:
+            return [element_to_int(row, self.p) for row in matrix]
+        if self._powers is None:
+            raise ValueError("Поле слишком велико для упакованного вида, используйте матрицу коэффициентов.")
+        return numpy.asarray(matrix, dtype=numpy.int64) % self.p @ self._powers
+
+    def unpack(self, values):
+        """Массив упакованных элементов -> матрица коэффициентов (k, n)."""
+        if numpy is None:
+            return [int_to_element(value, self.p, self.n) for value in values]
+        if self._powers is None:
+            raise ValueError("Поле слишком велико для упакованного вида, используйте матрицу коэффициентов.")
+        return numpy.asarray(values, dtype=numpy.int64)[..., None] // self._powers % self.p
+
+    def _operand(self, values):
+        """
+        Приводит операнд к внутреннему виду стратегии.
+        Возвращает (массив, был_ли_матрицей).
+        """
+        if isinstance(values, tuple):
+            coeffs = list(values)[:self.n] + [0] * (self.n - len(values))
+            if self.strategy == 'tables':
+                return numpy.int64(element_to_int(coeffs, self.p)), False
+            return numpy.array(coeffs, dtype=numpy.int64) % self.p, False
+        array = numpy.asarray(values)
+        if array.dtype == object:
+            raise ValueError("Поле слишком велико для упакованного вида, используйте матрицу коэффициентов.")
+        array = array.astype(numpy.int64, copy=False)
+        if self._powers is None:
+            # Упакованного вида нет: одномерный массив — коэффициенты одного элемента
+            if array.shape[-1:] != (self.n,):
+                raise ValueError(f"Ожидались коэффициенты элементов: {self.n} в строке.")
+            return array % self.p, array.ndim == 2
+        is_matrix = array.ndim == 2
+        if is_matrix and array.shape[-1] != self.n:
+            raise ValueError(f"Матрица коэффициентов должна иметь {self.n} столбцов.")
+        if self.strategy == 'tables':
+            return (self.pack(array) if is_matrix else array), is_matrix
+        return (array % self.p if is_matrix else self.unpack(array)), is_matrix
+
+    def _result(self, array, is_matrix):
+        """
+        Переводит результат из внутреннего вида в вид входных данных.
+        Для полей больше 2^63 элементов результат всегда — матрица коэффициентов.
+        """
+        if self.strategy == 'tables':
+            return self.unpack(array) if is_matrix else array
+        return array if is_matrix or self._powers is None else self.pack(array)
+
+    # --- Реализации на NumPy ---
+
+    def _add_packed(self, a, b, sign):
+        if self.p == 2:
+            return a ^ b
+        return self.pack(self.unpack(a) + sign * self.unpack(b))
+
+    def _convolve(self, a, b):
+        """Произведение матриц коэффициентов: свёртка и приведение по модулю."""
+        n, p = self.n, self.p
+        shape = numpy.broadcast_shapes(a.shape[:-1], b.shape[:-1])
+        product = numpy.zeros(shape + (2 * n - 1,), dtype=numpy.int64)
+        for i in range(n):
+            product[..., i:i + n] += a[..., i:i + 1] * b
+            product[..., i:i + n] %= p
+        for k in range(2 * n - 2, n - 1, -1):
+            lead = product[..., k:k + 1]
+            product[..., k - n:k] -= lead * self._monic
+            product[..., k - n:k] %= p
+        return product[..., :n]
+
+    def _is_zero(self, a):
+        return a == 0 if self.strategy == 'tables' else ~a.any(axis=-1)
+
+    def _power_internal(self, a, exponent):
+        zero = self._is_zero(a)
+        scalar = numpy.ndim(exponent) == 0
+        if scalar:
+            exponent = int(exponent)
+            if exponent < 0 and zero.any():
+                raise ZeroDivisionError("Нет обратного элемента для 0.")
+        else:
+            if self.order >= 1 << 63:
+                raise ValueError("Массив показателей поддерживается только для полей до 2^63 элементов.")
+            exponent = numpy.asarray(exponent, dtype=numpy.int64)
+            if (zero & (exponent < 0)).any():
+                raise ZeroDivisionError("Нет обратного элемента для 0.")
+
+        if self.strategy == 'tables':
+            e = exponent % self.order
+            result = self._exp[self._log[a] * e % self.order]
+            return numpy.where(zero, numpy.where(exponent == 0, 1, 0), result)
+
+        e = exponent % self.order
+        one = numpy.zeros(self.n, dtype=numpy.int64)
+        one[0] = 1
+        result = numpy.broadcast_to(one, numpy.broadcast_shapes(a.shape, numpy.shape(e) + (self.n,))).copy()
+        base = a
+        if scalar:
+            while e:
+                if e & 1:
+                    result = self._convolve(result, base)
+                base = self._convolve(base, base)
+                e >>= 1
+        else:
+            while e.any():
+                result = numpy.where((e & 1).astype(bool)[..., None], self._convolve(result, base), result)
+                base = self._convolve(base, base)
+                e = e >> 1
+        zero_value = numpy.where(exponent == 0, 1, 0)
+        return numpy.where(zero[..., None], numpy.where(numpy.arange(self.n) == 0, zero_value[..., None], 0), result)
+
+    # --- Поэлементные реализации без NumPy ---
+
+    def _element(self, value):
+        if isinstance(value, int):
+            return int_to_element(value, self.p, self.n)
+        coeffs = [c % self.p for c in value][:self.n]
+        return tuple(coeffs) + (0,) * (self.n - len(coeffs))
+
+    def _py_operand(self, values):
+        """Без NumPy: (список кортежей, был_ли_матрицей, скаляр_ли)."""
+        if isinstance(values, (int, tuple)):
+            return [self._element(values)], False, True
+        values = list(values)
+        is_matrix = bool(values) and not isinstance(values[0], int)
+        return [self._element(value) for value in values], is_matrix, False
+
+    def _py_apply(self, func, *operands):
+        prepared = [self._py_operand(values) for values in operands]
+        lengths = {len(elems) for elems, _, scalar in prepared if not scalar}
+        if len(lengths) > 1:
+            raise ValueError("Массивы операндов должны иметь одинаковую длину.")
+        length = lengths.pop() if lengths else 1
+        columns = [itertools.repeat(elems[0], length) if scalar else elems
+                   for elems, _, scalar in prepared]
+        result = [func(*args) for args in zip(*columns)]
+        if any(is_matrix for _, is_matrix, _ in prepared):
+            return result
+        result = [element_to_int(elem, self.p) for elem in result]
+        return result[0] if all(scalar for _, _, scalar in prepared) else result
+
+    def _py_add(self, a, b):
+        return self._element(poly_add(a, b, self.p))
+
+    def _py_subtract(self, a, b):
+        return self._element(poly_add(a, [-c for c in b], self.p))
+
+    def _py_multiply(self, a, b):
+        return self._element(poly_multiply(a, b, self.modulus, self.p, self.field))
+
+    def _py_inverse(self, a):
+        if self.field is not None:
+            return self.field.inverse(a)
+        return self._element(poly_inverse(a, self.modulus, self.p))
+
+    def _py_power(self, a, exponent):
+        if self.field is not None:
+            return self.field.power(a, exponent)
+        if not any(a):
+            if exponent < 0:
+                raise ZeroDivisionError("Нет обратного элемента для 0.")
+            return self._element([1] if exponent == 0 else [0])
+        exponent %= self.order
+        result = self._element([1])
+        while exponent:
+            if exponent & 1:
+                result = self._py_multiply(result, a)
+            a = self._py_multiply(a, a)
+            exponent >>= 1
+        return result
+
+    # --- Операции ---
+
+    def add(self, a, b):
+        """Поэлементное сложение."""
+        if numpy is None:
+            return self._py_apply(self._py_add, a, b)
+        (a, ma), (b, mb) = self._operand(a), self._operand(b)
+        if self.strategy == 'tables':
+            return self._result(self._add_packed(a, b, 1), ma or mb)
+        return self._result((a + b) % self.p, ma or mb)
+
+    def subtract(self, a, b):
+        """Поэлементное вычитание."""
+        if numpy is None:
+            return self._py_apply(self._py_subtract, a, b)
+        (a, ma), (b, mb) = self._operand(a), self._operand(b)
+        if self.strategy == 'tables':
+            return self._result(self._add_packed(a, b, -1), ma or mb)
+        return self._result((a - b) % self.p, ma or mb)
+
+    def multiply(self, a, b):
+        """Поэлементное умножение."""
+        if numpy is None:
+            return self._py_apply(self._py_multiply, a, b)
+        (a, ma), (b, mb) = self._operand(a), self._operand(b)
+        if self.strategy == 'tables':
+            result = self._exp[self._log[a] + self._log[b]]
+            return self._result(numpy.where((a == 0) | (b == 0), 0, result), ma or mb)
+        return self._result(self._convolve(a, b), ma or mb)
+
+    def inverse(self, a):
+        """Поэлементное обращение. Для нулевого элемента — ZeroDivisionError."""
+        if numpy is None:
+            return self._py_apply(self._py_inverse, a)
+        a, ma = self._operand(a)
+        if self._is_zero(a).any():
+            raise ZeroDivisionError("Нет обратного элемента для 0.")
+        if self.strategy == 'tables':
+            return self._result(self._exp[self.order - self._log[a]], ma)
+        return self._result(self._power_internal(a, self.order - 1), ma)
+
+    def divide(self, a, b):
+        """Поэлементное деление a на b."""
+        return self.multiply(a, self.inverse(b))
+
+    def power(self, a, exponent):
+        """
+        Поэлементное возведение в степень; exponent — целое число
+        или массив показателей той же длины (допускаются отрицательные).
+        """
+        if numpy is None:
+            if isinstance(exponent, int):
+                return self._py_apply(lambda elem: self._py_power(elem, exponent), a)
+            elems, is_matrix, _ = self._py_operand(a)
+            exponent = list(exponent)
+            if len(exponent) != len(elems):
+                raise ValueError("Массивы операндов должны иметь одинаковую длину.")
+            result = [self._py_power(elem, e) for elem, e in zip(elems, exponent)]
+            return result if is_matrix else [element_to_int(elem, self.p) for elem in result]
+        a, ma = self._operand(a)
+        return self._result(self._power_internal(a, exponent), ma)
+
+    def affine(self, x, alpha, beta):
+        """Аффинное отображение y = α * x + β для массива x."""
+        return self.add(self.multiply(x, alpha), beta)
+
+    def affine_inverse(self, y, alpha, beta):
+        """Обратное аффинное отображение x = α^(-1) * (y - β) для массива y."""
+        return self.multiply(self.subtract(y, beta), self.inverse(alpha))
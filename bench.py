@@ -0,0 +1,209 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+
+from Affine import AffineCipher, ByteAffineCipher
+from catalog import get_irreducible_polynomial
+from GF import (
+    poly_multiply, poly_divmod, is_irreducible, find_random_irreducible_polynomial,
+    element_orders, iter_generators, discrete_log, power_element,
+    FieldElementsView, GaloisField
+)
+
+BENCH_FORMAT_VERSION = 1
+
+# Сетка параметров (p, n) для арифметики и для операций, перебирающих всё поле
+ARITHMETIC_FIELDS = [(2, 5), (3, 3), (2, 8), (3, 5), (2, 16), (3, 10), (2, 32), (2, 64)]
+FIELD_SIZES = [(2, 8), (3, 5), (2, 16)]
+GROUP_FIELDS = [(2, 5), (3, 3), (2, 8), (3, 5)]
+IRREDUCIBLE_DEGREES = [(2, 8), (2, 16), (3, 6), (2, 32), (3, 12), (2, 64)]
+TEXT_SIZES = [1_000, 100_000]
+
+QUICK_ARITHMETIC_FIELDS = [(2, 5), (3, 3), (2, 16)]
+QUICK_FIELD_SIZES = [(2, 8), (3, 5)]
+QUICK_GROUP_FIELDS = [(2, 5), (3, 3), (2, 8)]
+QUICK_IRREDUCIBLE_DEGREES = [(2, 8), (3, 6)]
+QUICK_TEXT_SIZES = [1_000]
+
+
+def measure(func, repeat=5):
+    """
+    Время одного вызова func в секундах: минимум по repeat сериям,
+    число вызовов в серии подбирается автоматически (timeit.autorange).
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def random_element(p, n, rng):
+    """Случайный ненулевой элемент поля в виде кортежа."""
+    while True:
+        elem = tuple(rng.randrange(p) for _ in range(n))
+        if any(elem):
+            return elem
+
+
+def bench_arithmetic(results, fields, rng):
+    """poly_multiply, poly_divmod и power_element на случайных элементах."""
+    for p, n in fields:
+        modulus = tuple(get_irreducible_polynomial(p, n))
+        a, b = random_element(p, n, rng), random_element(p, n, rng)
+        product = [rng.randrange(p) for _ in range(2 * n - 1)]
+        exponent = p ** n - 2
+        results[f"poly_multiply[p={p},n={n}]"] = measure(
+            lambda: poly_multiply(a, b, modulus, p))
+        results[f"poly_divmod[p={p},n={n}]"] = measure(
+            lambda: poly_divmod(product, list(modulus), p))
+        results[f"power_element[p={p},n={n}]"] = measure(
+            lambda: power_element(a, exponent, modulus, p))
+
+
+def bench_irreducible(results, degrees, rng):
+    """is_irreducible на фиксированном модуле и случайный поиск неприводимого."""
+    for p, n in degrees:
+        modulus = get_irreducible_polynomial(p, n)
+        results[f"is_irreducible[p={p},n={n}]"] = measure(
+            lambda: is_irreducible(modulus, p), repeat=3)
+        search_seed = rng.getrandbits(64)
+
+        def search():
+            # Каждый повтор проверяет одну и ту же последовательность кандидатов
+            find_random_irreducible_polynomial(p, n, sparse=False, rng=random.Random(search_seed))
+        results[f"find_random_irreducible_polynomial[p={p},n={n}]"] = measure(search, repeat=3)
+
+
+def bench_field(results, fields):
+    """Построение GaloisField (таблицы степеней и логарифмов)."""
+    for p, n in fields:
+        modulus = tuple(get_irreducible_polynomial(p, n))
+        results[f"GaloisField[p={p},n={n}]"] = measure(
+            lambda: GaloisField(p, modulus), repeat=3)
+
+
+def bench_group(results, fields, rng):
+    """element_orders, iter_generators и discrete_log на мультипликативной группе."""
+    for p, n in fields:
+        modulus = tuple(get_irreducible_polynomial(p, n))
+        field = GaloisField(p, modulus)
+        group = FieldElementsView(p, n, nonzero=True)
+        results[f"element_orders[p={p},n={n}]"] = measure(
+            lambda: element_orders(group.iter_packed(), modulus, p), repeat=3)
+        results[f"element_orders[p={p},n={n},field]"] = measure(
+            lambda: element_orders(group.iter_packed(), modulus, p, field), repeat=3)
+        results[f"iter_generators[p={p},n={n}]"] = measure(
+            lambda: sum(1 for _ in iter_generators(modulus, p, field)), repeat=3)
+        generator = field.generator
+        targets = [random_element(p, n, rng) for _ in range(16)]
+        results[f"discrete_log[p={p},n={n}]"] = measure(
+            lambda: [discrete_log(elem, generator, modulus, p) for elem in targets], repeat=3)
+
+
+def bench_cipher(results, sizes, rng):
+    """AffineCipher и ByteAffineCipher: создание ключа, encrypt и decrypt."""
+    alphabet = 'абвгдежзийклмнопрстуфхцчшщъыьэюя'
+    field = GaloisField(2, get_irreducible_polynomial(2, 5))
+    alpha, beta = (0, 1, 1, 0, 0), (1, 0, 0, 1, 0)
+    results["AffineCipher[p=2,n=5]"] = measure(
+        lambda: AffineCipher(field, alphabet, alpha, beta))
+    cipher = AffineCipher(field, alphabet, alpha, beta)
+    results["ByteAffineCipher"] = measure(lambda: ByteAffineCipher(0x53, 0x1f))
+    byte_cipher = ByteAffineCipher(0x53, 0x1f)
+    for size in sizes:
+        text = ''.join(rng.choice(alphabet) for _ in range(size))
+        ciphertext = cipher.encrypt(text)
+        results[f"AffineCipher.encrypt[size={size}]"] = measure(lambda: cipher.encrypt(text))
+        results[f"AffineCipher.decrypt[size={size}]"] = measure(lambda: cipher.decrypt(ciphertext))
+        data = rng.randbytes(size)
+        encrypted = byte_cipher.encrypt(data)
+        results[f"ByteAffineCipher.encrypt[size={size}]"] = measure(lambda: byte_cipher.encrypt(data))
+        results[f"ByteAffineCipher.decrypt[size={size}]"] = measure(
+            lambda: byte_cipher.decrypt(encrypted))
+
+
+def run_benchmarks(quick=False, seed=0):
+    """Запускает все замеры и возвращает словарь результатов."""
+    rng = random.Random(seed)
+    results = {}
+    bench_arithmetic(results, QUICK_ARITHMETIC_FIELDS if quick else ARITHMETIC_FIELDS, rng)
+    bench_irreducible(results, QUICK_IRREDUCIBLE_DEGREES if quick else IRREDUCIBLE_DEGREES, rng)
+    bench_field(results, QUICK_FIELD_SIZES if quick else FIELD_SIZES)
+    bench_group(results, QUICK_GROUP_FIELDS if quick else GROUP_FIELDS, rng)
+    bench_cipher(results, QUICK_TEXT_SIZES if quick else TEXT_SIZES, rng)
+    return {
+        'version': BENCH_FORMAT_VERSION,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'quick': quick,
+        'results': results,
+    }
+
+
+def compare(baseline, current, tolerance):
+    """
+    Сравнивает результаты с базовыми. Замер считается регрессией, если он
+    медленнее базового более чем в (1 + tolerance) раз.
+    Возвращает список строк отчёта и число регрессий.
+    """
+    lines = []
+    regressions = 0
+    base_results = baseline['results']
+    for name, seconds in sorted(current['results'].items()):
+        if name not in base_results:
+            lines.append(f"  новый      {name}: {seconds:.3e} с")
+            continue
+        ratio = seconds / base_results[name]
+        if ratio > 1 + tolerance:
+            status = "РЕГРЕССИЯ"
+            regressions += 1
+        elif ratio < 1 / (1 + tolerance):
+            status = "ускорение"
+        else:
+            status = "без изм."
+        lines.append(f"  {status:<10} {name}: {seconds:.3e} с (x{ratio:.2f})")
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замеры производительности GF.py и Affine.py.")
+    parser.add_argument('-o', '--output', help="файл для результатов в формате JSON")
+    parser.add_argument('--baseline', help="файл базовых результатов для сравнения")
+    parser.add_argument('--compare', help="сравнить с базовыми готовый файл результатов, не запуская замеры")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="допустимое замедление (0.25 = 25%%)")
+    parser.add_argument('--quick', action='store_true', help="сокращённая сетка параметров")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            current = json.load(f)
+    else:
+        current = run_benchmarks(args.quick, args.seed)
+        for name, seconds in sorted(current['results'].items()):
+            print(f"{name}: {seconds:.3e} с")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('version') != BENCH_FORMAT_VERSION:
+            print("Несовместимая версия файла базовых результатов.", file=sys.stderr)
+            return 2
+        lines, regressions = compare(baseline, current, args.tolerance)
+        print(f"\nСравнение с {args.baseline}:")
+        print("\n".join(lines))
+        if regressions:
+            print(f"\nРегрессий: {regressions}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
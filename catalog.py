@@ -0,0 +1,148 @@
+import os
+import threading
+import warnings
+
+from GF import (
+    element_to_int, int_to_element, find_irreducible_polynomial,
+    find_primitive_polynomial, find_sparse_irreducible_polynomial, is_primitive_polynomial
+)
+
+CATALOG_VERSION = 1
+DEFAULT_CATALOG_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'polynomials.catalog'
+)
+
+
+def default_cache_path():
+    """
+    Путь пользовательского кэша каталога: переменная окружения GF_CATALOG_CACHE,
+    иначе $XDG_CACHE_HOME/galois-affine/polynomials.catalog
+    (по умолчанию ~/.cache/galois-affine/polynomials.catalog).
+    """
+    path = os.environ.get('GF_CATALOG_CACHE')
+    if path:
+        return path
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'galois-affine', 'polynomials.catalog')
+
+
+class PolynomialCatalog:
+    """
+    Каталог неприводимых многочленов, хранящийся в текстовых файлах.
+
+    Формат файла: строка-заголовок "gfcatalog <версия>", затем по строке
+    на многочлен: "p n primitive value", где value — шестнадцатеричная
+    упаковка коэффициентов многочлена (см. GF.element_to_int), а primitive
+    равен 1, если многочлен примитивен. Для каждой пары (p, n) хранится
+    неприводимый многочлен и, если он не примитивен, примитивный:
+    в поставляемом каталоге — наименьшие (см. GF.find_irreducible_polynomial),
+    в кэше — наименьшего веса (см. GF.find_sparse_irreducible_polynomial
+    и GF.find_primitive_polynomial).
+
+    Файл path (поставляемый каталог) только читается. Найденные перебором
+    многочлены дописываются в файл кэша cache_path того же формата
+    (None — хранить их только в памяти). Файлы читаются только при первом
+    обращении к каталогу.
+    """
+
+    def __init__(self, path=DEFAULT_CATALOG_PATH, cache_path=None):
+        self.path = path
+        self.cache_path = cache_path
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def _read_file(self, path, entries):
+        """Добавляет в entries многочлены из файла каталога path (если он есть)."""
+        if not os.path.exists(path):
+            return
+        with open(path, encoding='ascii') as catalog_file:
+            header = catalog_file.readline().split()
+            if header != ['gfcatalog', str(CATALOG_VERSION)]:
+                raise ValueError(
+                    f"Файл {path} не является каталогом версии {CATALOG_VERSION}."
+                )
+            for line in catalog_file:
+                if not line.strip():
+                    continue
+                p, n, primitive, value = line.split()
+                p, n = int(p), int(n)
+                coeffs = list(int_to_element(int(value, 16), p, n + 1))
+                entries.setdefault((p, n), []).append((coeffs, primitive == '1'))
+
+    def _load(self):
+        """Читает поставляемый каталог и файл кэша (один раз)."""
+        if self._entries is not None:
+            return self._entries
+        entries = {}
+        self._read_file(self.path, entries)
+        if self.cache_path is not None:
+            self._read_file(self.cache_path, entries)
+        self._entries = entries
+        return entries
+
+    def lookup(self, p, n, primitive=False):
+        """
+        Возвращает многочлен степени n над F_p из каталога
+        (примитивный, если primitive=True) или None, если его там нет.
+        """
+        with self._lock:
+            entries = self._load()
+        for coeffs, is_primitive in entries.get((p, n), []):
+            if is_primitive or not primitive:
+                return list(coeffs)
+        return None
+
+    def add(self, p, n, coeffs, primitive):
+        """
+        Добавляет многочлен в каталог и дописывает его в файл кэша.
+        Если файл кэша не задан, многочлен остаётся только в памяти;
+        если записать его не удалось — выдаётся предупреждение RuntimeWarning.
+        """
+        with self._lock:
+            entries = self._load()
+            entries.setdefault((p, n), []).append((list(coeffs), primitive))
+            if self.cache_path is None:
+                return
+            line = f"{p} {n} {int(primitive)} {element_to_int(coeffs, p):x}\n"
+            try:
+                directory = os.path.dirname(self.cache_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                new_file = not os.path.exists(self.cache_path)
+                with open(self.cache_path, 'a', encoding='ascii') as catalog_file:
+                    if new_file:
+                        catalog_file.write(f"gfcatalog {CATALOG_VERSION}\n")
+                    catalog_file.write(line)
+            except OSError as e:
+                warnings.warn(
+                    f"Не удалось сохранить многочлен в кэш каталога {self.cache_path}: {e}",
+                    RuntimeWarning, stacklevel=2
+                )
+
+    def get(self, p, n, primitive=False):
+        """
+        Возвращает многочлен из каталога, а если его нет — находит
+        детерминированным перебором и сохраняет в каталог. Многочлены
+        ищутся прежде всего среди трёх- и пятичленов: их перебор короче,
+        а приведение по разреженному модулю быстрее.
+        """
+        coeffs = self.lookup(p, n, primitive)
+        if coeffs is not None:
+            return coeffs
+        if primitive:
+            coeffs = find_primitive_polynomial(p, n)
+        else:
+            coeffs = find_sparse_irreducible_polynomial(p, n) or find_irreducible_polynomial(p, n)
+        self.add(p, n, coeffs, primitive or is_primitive_polynomial(coeffs, p))
+        return list(coeffs)
+
+
+default_catalog = PolynomialCatalog(cache_path=default_cache_path())
+
+
+def get_irreducible_polynomial(p, n, primitive=False):
+    """
+    Неприводимый (или примитивный) многочлен степени n над F_p
+    из каталога по умолчанию.
+    """
+    return default_catalog.get(p, n, primitive)
@@ -1,15 +1,27 @@
+import argparse
+import contextlib
+import itertools
+import sys
+
 import Affine
+import instrumentation
+from catalog import get_irreducible_polynomial
+from parallel import ParallelCipher, PARALLEL_CHUNK_SIZE
+from snapshot import load_snapshot, save_snapshot
 
 from GF import (
     poly_add, poly_multiply, polynomial_to_string,
-    find_random_irreducible_polynomial, is_irreducible,
-    generate_field_elements, get_degree, find_generators,
-    element_order, is_prime
+    is_irreducible,
+    FieldElementsView, element_orders, is_prime,
+    GaloisField, element_to_int, count_generators, iter_generators,
+    DiscreteLogTable
 )
 
 RUSSIAN_ALPHABET = 'абвгдежзийклмнопрстуфхцчшщъыьэюя'  # 32 символа
 ENGLISH_ALPHABET = 'abcdefghijklmnopqrstuvwxyzA'  # 27 символов
 
+GENERATORS_PAGE_SIZE = 50  # Сколько образующих показывать в опции 3
+
 
 # --- Функция для отображения главного меню ---
 def display_menu():
@@ -40,25 +52,48 @@ def input_polynomial_element(elements, p, n):
 # Функция для нахождения p и n для заданного размера алфавита
 def find_p_n(size):
     """Найдите наименьшее простое число p и целое число n, такое, что p^n >= size."""
-    primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41,
-              43, 47, 53, 59, 61, 67]
-    for p in primes:
-        n = 1
-        while p ** n < size:
-            n += 1
-        if p ** n >= size:
-            return p, n
-    raise ValueError("Не удалось найти подходящие p и n для заданного размера алфавита.")
+    if size < 1:
+        raise ValueError("Не удалось найти подходящие p и n для заданного размера алфавита.")
+    # Наименьшее простое — 2, и степенью двойки покрывается алфавит любого размера
+    return 2, max(1, (size - 1).bit_length())
+
+
+def iter_filler_characters(exclude):
+    """
+    Символы для дополнения алфавита: сначала печатные ASCII (32..126),
+    затем остальные печатные символы Unicode по возрастанию кода
+    (без суррогатов), кроме символов из exclude.
+    """
+    for code in itertools.chain(range(32, 127), range(160, 0xD800), range(0xE000, 0x110000)):
+        char = chr(code)
+        if char not in exclude and char.isprintable():
+            yield char
+
+
+def fit_alphabet(alphabet, p, n):
+    """
+    Приводит алфавит к размеру p^n: дополняет печатными символами
+    (сначала ASCII, затем остальными символами Unicode), которых нет
+    в алфавите, или усекает.
+    """
+    size = p ** n
+    if size > len(alphabet):
+        needed = size - len(alphabet)
+        filler = ''.join(itertools.islice(iter_filler_characters(set(alphabet)), needed))
+        if len(filler) < needed:
+            raise ValueError("Недостаточно символов для расширения\nалфавита.")
+        return alphabet + filler
+    return alphabet[:size]
 
 
 # Функция установки ключа
-def set_affine_key(alphabet, elements, p, n, modulus, multiplicative_group):
+def set_affine_key(alphabet, elements, field):
     """
-    Устанавливает ключ (α, β) в глобальных переменных модуля
-    Affine.
+    Запрашивает ключ (α, β) и возвращает построенный по нему
+    объект Affine.AffineCipher.
     """
     # 1. Сформировать список ненулевых (F_{p^n}^*)
-    nonzero_elements = [elem for elem in elements if any(c != 0 for c in elem)]
+    nonzero_elements = elements.nonzero_view()
     print("\nВыберите α (ненулевой элемент из F_{p^n}^*) из списка:")
     for idx, e in enumerate(nonzero_elements, 1):
         print(f"{idx}. {polynomial_to_string(e)}")
@@ -75,19 +110,7 @@ def set_affine_key(alphabet, elements, p, n, modulus, multiplicative_group):
         except ValueError:
             print("Ошибка ввода. Нужно ввести целое число.")
 
-    # 2. Ищем обратный (α⁻¹)
-    try:
-        alpha_inv = Affine.compute_inverse_affine(
-            tuple(chosen_alpha),
-            multiplicative_group,  # список ненулевых
-            modulus, p, n
-        )
-        print(f"Найден α⁻¹: {polynomial_to_string(alpha_inv)}")
-    except ValueError as e:
-        print(f"Ошибка: {e}")
-        return
-
-    # 3. Выбираем β из всех элементов
+    # 2. Выбираем β из всех элементов
     print("\nВыберите β (любой элемент из F_{p^n}):")
     for idx, e in enumerate(elements, 1):
         print(f"{idx}. {polynomial_to_string(e)}")
@@ -104,14 +127,13 @@ def set_affine_key(alphabet, elements, p, n, modulus, multiplicative_group):
         except ValueError:
             print("Ошибка ввода. Нужно ввести целое число.")
 
-    # 4. Сохраняем всё в модуле Affine
-    Affine.alpha_affine = tuple(chosen_alpha)
-    Affine.alpha_inv_affine = tuple(alpha_inv)
-    Affine.beta_affine = tuple(chosen_beta)
+    # 3. Строим шифр (α⁻¹ и таблицы подстановки вычисляются в нём)
+    cipher = Affine.AffineCipher(field, alphabet, chosen_alpha, chosen_beta, elements)
     print("\nКлюч успешно установлен:")
-    print(f" α = {polynomial_to_string(Affine.alpha_affine)}")
-    print(f" β = {polynomial_to_string(Affine.beta_affine)}")
-    print(f" α⁻¹ =\n{polynomial_to_string(Affine.alpha_inv_affine)}")
+    print(f" α = {polynomial_to_string(cipher.alpha)}")
+    print(f" β = {polynomial_to_string(cipher.beta)}")
+    print(f" α⁻¹ =\n{polynomial_to_string(cipher.alpha_inv)}")
+    return cipher
 
 
 # Основная функция работы с аффинным шифром
@@ -141,18 +163,22 @@ def affine_cipher_menu():
         alphabet = RUSSIAN_ALPHABET
         p = 2
         n = 5
+        modulus = tuple(get_irreducible_polynomial(p, n))
         print("\nВыбрано: Русский алфавит")
         print(f"Алфавит: {alphabet}")
         print(f"Используется поле F_{p}^{n}")
+        print(f"Неприводимый многочлен: {polynomial_to_string(modulus)}")
 
     elif alphabet_choice == '2':
         # Английский
         alphabet = ENGLISH_ALPHABET
         p = 3
         n = 3
+        modulus = tuple(get_irreducible_polynomial(p, n))
         print("\nВыбрано: Английский алфавит")
         print(f"Алфавит: {alphabet}")
         print(f"Используется поле F_{p}^{n}")
+        print(f"Неприводимый многочлен: {polynomial_to_string(modulus)}")
 
     else:
         # Произвольный
@@ -179,20 +205,15 @@ def affine_cipher_menu():
             return  # Возврат в подменю
 
         # Корректировка алфавита
+        try:
+            alphabet = fit_alphabet(custom_alphabet, p, n)
+        except ValueError as ve:
+            print(ve)
+            return
         if p ** n > size:
-            # Расширение алфавита
-            needed = p ** n - size
-            filler = [chr(i) for i in range(32, 127) if chr(i) not in custom_alphabet]
-            if len(filler) < needed:
-                print("Недостаточно символов для расширения\nалфавита.")
-                return
-            alphabet = custom_alphabet + ''.join(filler[:needed])
             print(f"Алфавит расширен до {p ** n} символов.")
         elif p ** n < size:
-            # Усечение алфавита
-            alphabet = custom_alphabet[:p ** n]
             print(f"Алфавит усечён до {p ** n} символов.")
-        # Если p**n == size, ничего не делаем
 
         # Ввод или генерация неприводимого многочлена
         choice_poly = input("\nХотите ввести свой неприводимый многочлен для аффинного шифра? (y/n): ").lower()
@@ -215,39 +236,25 @@ def affine_cipher_menu():
                 except ValueError:
                     print("Неверный ввод. Введите целые числа.")
         else:
-            print("\nГенерируется неприводимый многочлен для аффинного шифра...")
+            print("\nВыбирается неприводимый многочлен из каталога для аффинного шифра...")
             try:
-                modulus_coeffs = find_random_irreducible_polynomial(p, n)
+                modulus_coeffs = get_irreducible_polynomial(p, n)
                 modulus = tuple(modulus_coeffs)
-                print(f"Сгенерированный неприводимый многочлен для аффинного шифра: {polynomial_to_string(modulus)}")
+                print(f"Неприводимый многочлен для аффинного шифра: {polynomial_to_string(modulus)}")
             except ValueError as e:
                 print(str(e))
                 return  # Возврат в подменю
 
-    # Генерация элементов поля для аффинного шифра
-    elements = generate_field_elements(p, n)
+    # Элементы поля для аффинного шифра (ленивое упорядоченное представление)
+    elements = FieldElementsView(p, n)
+    field = GaloisField(p, modulus)
 
-    # Сортировка элементов: сначала по степени, затем по коэффициенту
-    # при старшей степени, затем лексикографически
-    def sort_key_affine(x):
-        deg = get_degree(x)
-        if deg == -1:
-            return (-1, 0, x)
-        else:
-            return (deg, x[deg], x)
-
-    elements_sorted = sorted(elements, key=sort_key_affine)
-    elements = elements_sorted
-
-    # Создание отображений между символами и элементами поля после сортировки
-    Affine.create_mappings_affine(alphabet, elements)
     print(f"\nЭлементы поля F_{p}^{n} для аффинного шифра:")
     for idx, elem in enumerate(elements, 1):
         elem_tuple = tuple(elem)
         print(f"{idx}. {polynomial_to_string(elem_tuple)}")
 
-    # Формируем мультипликативную группу для вычисления обратных элементов
-    multiplicative_group = [elem for elem in elements if any(c != 0 for c in elem)]
+    cipher = None
 
     # Подменю аффинного шифра
     while True:
@@ -259,27 +266,22 @@ def affine_cipher_menu():
         choice = input("Выберите опцию (1-4): ").strip()
 
         if choice == '1':
-            # Передаём multiplicative_group как шестой аргумент
-            modulus_coeffs = find_random_irreducible_polynomial(p, n)
-            modulus = tuple(modulus_coeffs)
-            set_affine_key(alphabet, elements, p, n, modulus, multiplicative_group)
+            cipher = set_affine_key(alphabet, elements, field)
 
         elif choice == '2':
-            # Проверяем, установлены ли ключи (alpha_affine и beta_affine)
-            if Affine.alpha_affine is None or Affine.beta_affine is None:
+            if cipher is None:
                 print("Ключи не установлены. Сначала установите ключ (опция 1).")
                 continue
             plaintext = input("Введите открытый текст:\n").strip()
-            ciphertext = Affine.encrypt_text(plaintext, p, n, modulus)
+            ciphertext = cipher.encrypt(plaintext, tracer=Affine.print_tracer)
             print(f"Зашифрованный текст: {ciphertext}")
 
         elif choice == '3':
-            # Проверяем, установлены ли ключи и обратный элемент (alpha_inv_affine)
-            if Affine.alpha_inv_affine is None or Affine.beta_affine is None:
-                print("Ключи не установлены или α⁻¹ не найден. Сначала установите ключ (опция 1).")
+            if cipher is None:
+                print("Ключи не установлены. Сначала установите ключ (опция 1).")
                 continue
             ciphertext = input("Введите шифртекст: ").strip()
-            plaintext = Affine.decrypt_text(ciphertext, p, n, modulus)
+            plaintext = cipher.decrypt(ciphertext, tracer=Affine.print_tracer)
             print(f"Расшифрованный текст: {plaintext}")
 
         elif choice == '4':
@@ -342,29 +344,17 @@ def build_main_galois_field():
             except ValueError:
                 print("Неверный ввод. Введите целые числа.")
     else:
-        print("\nГенерируется неприводимый многочлен...")
+        print("\nВыбирается неприводимый многочлен из каталога...")
         try:
-            modulus_coeffs = find_random_irreducible_polynomial(p, n)
+            modulus_coeffs = get_irreducible_polynomial(p, n)
             modulus = tuple(modulus_coeffs)
-            print(f"Сгенерированный неприводимый многочлен:\n{polynomial_to_string(modulus)}")
+            print(f"Неприводимый многочлен:\n{polynomial_to_string(modulus)}")
         except ValueError as e:
             print(str(e))
             return None, None, None, None  # Возврат в главное меню
 
-    # Генерация элементов поля
-    elements = generate_field_elements(p, n)
-
-    # Сортировка элементов: сначала по степени, затем по коэффициенту
-    # при старшей степени, затем лексикографически
-    def sort_key(x):
-        deg = get_degree(x)
-        if deg == -1:
-            return (-1, 0, x)
-        else:
-            return (deg, x[deg], x)
-
-    elements_sorted = sorted(elements, key=sort_key)
-    elements = elements_sorted
+    # Элементы поля (ленивое упорядоченное представление)
+    elements = FieldElementsView(p, n)
 
     print(f"\nЭлементы поля F_{p}^{n}:")
     for idx, elem in enumerate(elements, 1):
@@ -374,8 +364,133 @@ def build_main_galois_field():
     return p, n, modulus, elements
 
 
+# --- Режим командной строки: потоковое шифрование файлов и каналов ---
+def parse_coefficients(text, p, length):
+    """
+    Разбирает строку коэффициентов (от старшего к младшему, как в меню)
+    в кортеж длины length от младшего к старшему.
+    """
+    coeffs = [int(c) % p for c in text.split()][::-1]
+    if len(coeffs) > length:
+        raise ValueError(f"Ожидалось не более {length} коэффициентов, получено {len(coeffs)}.")
+    return tuple(coeffs + [0] * (length - len(coeffs)))
+
+
+def setup_affine_cipher(alphabet_name, modulus_text, alpha_text, beta_text):
+    """
+    Строит поле и шифр с ключом (α, β) без диалога.
+    alphabet_name — 'ru', 'en' или строка символов произвольного алфавита.
+    Возвращает объект Affine.AffineCipher.
+    """
+    if alphabet_name == 'ru':
+        alphabet, p, n = RUSSIAN_ALPHABET, 2, 5
+    elif alphabet_name == 'en':
+        alphabet, p, n = ENGLISH_ALPHABET, 3, 3
+    else:
+        if len(set(alphabet_name)) != len(alphabet_name):
+            raise ValueError("Алфавит должен содержать уникальные символы.")
+        p, n = find_p_n(len(alphabet_name))
+        alphabet = fit_alphabet(alphabet_name, p, n)
+
+    if modulus_text:
+        modulus = parse_coefficients(modulus_text, p, n + 1)
+        if not is_irreducible(list(modulus), p):
+            raise ValueError("Введённый многочлен неприводимым не является.")
+    else:
+        modulus = tuple(get_irreducible_polynomial(p, n))
+
+    alpha = parse_coefficients(alpha_text, p, n)
+    beta = parse_coefficients(beta_text, p, n)
+    if not any(alpha):
+        raise ValueError("α должен быть ненулевым элементом поля.")
+
+    field = GaloisField(p, modulus)
+    return Affine.AffineCipher(field, alphabet, alpha, beta, FieldElementsView(p, n))
+
+
+def report_profile(args):
+    """При --profile выводит отчёт инструментирования в stderr."""
+    if args.profile:
+        print(instrumentation.format_snapshot(instrumentation.snapshot()), file=sys.stderr)
+
+
+def run_cli(argv):
+    """Потоковое шифрование/расшифрование из командной строки."""
+    parser = argparse.ArgumentParser(
+        description="Аффинный шифр над полем Галуа: потоковая обработка файлов и каналов."
+    )
+    parser.add_argument('mode', choices=['encrypt', 'decrypt', 'save-key'],
+                        help="save-key — сохранить поле и ключ в файл снимка (--key-file)")
+    parser.add_argument('--alphabet', default='ru',
+                        help="ru, en, bytes (произвольные двоичные данные над GF(2^8)) "
+                             "или строка символов произвольного алфавита")
+    parser.add_argument('--modulus',
+                        help="коэффициенты неприводимого многочлена от старшего к младшему "
+                             "(по умолчанию — из каталога)")
+    parser.add_argument('--alpha', help="коэффициенты α от старшего к младшему")
+    parser.add_argument('--beta', help="коэффициенты β от старшего к младшему")
+    parser.add_argument('--key-file',
+                        help="файл снимка ключа: при шифровании заменяет --alphabet, "
+                             "--modulus, --alpha и --beta")
+    parser.add_argument('-i', '--input', default='-', help="входной файл ('-' — stdin)")
+    parser.add_argument('-o', '--output', default='-', help="выходной файл ('-' — stdout)")
+    parser.add_argument('--chunk-size', type=int,
+                        help="размер блока чтения в байтах (по умолчанию "
+                             f"{Affine.STREAM_CHUNK_SIZE}, при --workers > 1 — {PARALLEL_CHUNK_SIZE})")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="число рабочих процессов для параллельной обработки")
+    parser.add_argument('--profile', action='store_true',
+                        help="вывести в stderr счётчики операций и время этапов")
+    args = parser.parse_args(argv)
+    if args.profile:
+        instrumentation.enable()
+
+    try:
+        with contextlib.ExitStack() as stack:
+            if args.key_file and args.mode != 'save-key':
+                cipher = load_snapshot(args.key_file)
+            elif args.alpha is None or args.beta is None:
+                raise ValueError("Требуется --key-file или --alpha и --beta.")
+            elif args.alphabet == 'bytes':
+                modulus = parse_coefficients(args.modulus, 2, 9) if args.modulus else None
+                cipher = Affine.ByteAffineCipher(
+                    element_to_int(parse_coefficients(args.alpha, 2, 8), 2),
+                    element_to_int(parse_coefficients(args.beta, 2, 8), 2),
+                    modulus
+                )
+            else:
+                cipher = setup_affine_cipher(args.alphabet, args.modulus, args.alpha, args.beta)
+            if args.mode == 'save-key':
+                if not args.key_file:
+                    raise ValueError("Для save-key требуется --key-file.")
+                save_snapshot(cipher, args.key_file)
+                report_profile(args)
+                return 0
+
+            chunk_size = args.chunk_size
+            if args.workers > 1:
+                cipher = stack.enter_context(ParallelCipher(cipher, args.workers))
+                chunk_size = chunk_size or PARALLEL_CHUNK_SIZE
+            src = sys.stdin.buffer if args.input == '-' else stack.enter_context(open(args.input, 'rb'))
+            dst = sys.stdout.buffer if args.output == '-' else stack.enter_context(open(args.output, 'wb'))
+            stream = cipher.encrypt_stream if args.mode == 'encrypt' else cipher.decrypt_stream
+            stream(src, dst, chunk_size or Affine.STREAM_CHUNK_SIZE)
+    except UnicodeDecodeError as e:
+        print(f"Ошибка: вход не является текстом в кодировке {e.encoding} "
+              f"(позиция {e.start}: {e.reason}).", file=sys.stderr)
+        return 1
+    except (ValueError, OSError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+    report_profile(args)
+    return 0
+
+
 # Основной блок программы
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
+
     print("Инструмент для построения и исследования полей Галуа F_{p^n}\n")
 
     # Переменные для основного поля Галуа
@@ -383,6 +498,7 @@ if __name__ == "__main__":
     p_main = 0
     n_main = 0
     modulus_main = []
+    field_main = None
     elements_main = []
     multiplicative_group_main = []
     order_main = 0
@@ -396,6 +512,7 @@ if __name__ == "__main__":
             # Построение основного поля Галуа
             p_main, n_main, modulus_main, elements_main = build_main_galois_field()
             if p_main is not None:
+                field_main = GaloisField(p_main, modulus_main)
                 main_field_built = True
 
         elif choice == '2':
@@ -427,7 +544,7 @@ if __name__ == "__main__":
                 print(f"\nРезультат сложения:\n{polynomial_to_string(result)}")
             else:
                 # Для умножения используется функция poly_multiply, которая выполняет редукцию
-                result = poly_multiply(tuple(poly1), tuple(poly2), modulus_main, p_main)
+                result = poly_multiply(tuple(poly1), tuple(poly2), modulus_main, p_main, field_main)
                 print(f"\nРезультат умножения:\n{polynomial_to_string(result)}")
 
         elif choice == '3':
@@ -438,16 +555,19 @@ if __name__ == "__main__":
             print("\n--- Исследование мультипликативной группы основного поля F_{p^n}^* ---")
 
             # Формирование мультипликативной группы (исключаем ноль)
-            multiplicative_group_main = [
-                tuple(elem) for elem in elements_main if any(c != 0 for c in elem)
-            ]
+            multiplicative_group_main = elements_main.nonzero_view()
             order_main = p_main ** n_main - 1
             print(f"\nМультипликативная группа F_{p_main}^{n_main}^* имеет порядок {order_main}.")
 
-            # Нахождение образующих
-            generators_main = find_generators(multiplicative_group_main, modulus_main, p_main, order_main)
+            # Нахождение образующих: первая страница из ленивого перечисления g^k
+            generators_total = count_generators(p_main, n_main)
+            generators_main = list(itertools.islice(
+                iter_generators(modulus_main, p_main, field_main), GENERATORS_PAGE_SIZE
+            ))
             if generators_main:
-                print("\nОбразующие элементы мультипликативной группы:")
+                print(f"\nОбразующих элементов мультипликативной группы: {generators_total}.")
+                if generators_total > len(generators_main):
+                    print(f"Показаны первые {len(generators_main)}:")
                 for idx, gen in enumerate(generators_main, 1):
                     print(f"{idx}. {polynomial_to_string(gen)}")
             else:
@@ -456,10 +576,13 @@ if __name__ == "__main__":
 
             # Определение порядков элементов
             print("\nПорядки элементов мультипликативной группы:")
-            identity = tuple([1] + [0] * (len(modulus_main) - 1))
-            for elem in multiplicative_group_main:
-                ord_elem = element_order(elem, multiplicative_group_main, modulus_main, p_main)
-                print(f" {polynomial_to_string(elem)} : {ord_elem}")
+            orders_main = element_orders(
+                multiplicative_group_main.iter_packed(), modulus_main, p_main, field_main
+            )
+            print("\n".join(
+                f" {polynomial_to_string(elem)} : {ord_elem}"
+                for elem, ord_elem in zip(multiplicative_group_main, orders_main)
+            ))
 
             # Выбор образующего для разложения
             while True:
@@ -485,14 +608,13 @@ if __name__ == "__main__":
                     f"\nРазложение элементов по степеням выбранного образующего "
                     f"{polynomial_to_string(selected_gen)}:"
                 )
-                decomposition = {}
-                current = tuple([1] + [0] * (n_main - 1))  # Элемент 1
-                for exponent in range(order_main):
-                    decomposition[current] = exponent
-                    current = poly_multiply(current, selected_gen, modulus_main, p_main)
+                decomposition = DiscreteLogTable(selected_gen, modulus_main, p_main, field_main)
 
                 for elem in multiplicative_group_main:
-                    exponent = decomposition.get(elem, None)
+                    try:
+                        exponent = decomposition.log(elem)
+                    except ValueError:
+                        exponent = None
                     if exponent is not None:
                         print(
                             f" {polynomial_to_string(elem)} = "
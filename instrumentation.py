@@ -0,0 +1,163 @@
+"""
+Необязательные счётчики операций и замеры времени этапов для GF.py и Affine.py.
+
+По умолчанию выключены: горячие функции проверяют один флаг модуля
+(instrumentation.enabled), stage() возвращает общий пустой контекст,
+а функции, целиком составляющие этап, помечаются декоратором timed(),
+который при выключенном флаге сразу вызывает функцию. Поэтому накладные
+расходы в выключенном состоянии пренебрежимо малы.
+
+Счётчики: poly_multiply, poly_divmod, modinv, power_element, is_irreducible,
+irreducible_attempts (попытки в find_random_irreducible_polynomial).
+Этапы: field_build, mapping, key_inversion, table_compile, encrypt, decrypt.
+
+Пример:
+    with instrumentation.profile() as profiler:
+        field = GaloisField(2, modulus)
+    print(profiler.result['counters'])
+"""
+import collections
+import functools
+import time
+
+enabled = False
+counters = collections.Counter()
+stage_seconds = collections.defaultdict(float)
+stage_calls = collections.Counter()
+
+
+class _NullStage:
+    """Пустой контекст этапа (инструментирование выключено)."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """Замер времени одного выполнения этапа."""
+
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        stage_seconds[self.name] += time.perf_counter() - self.start
+        stage_calls[self.name] += 1
+        return False
+
+
+def enable():
+    """Включает сбор счётчиков и замеров."""
+    global enabled
+    enabled = True
+
+
+def disable():
+    """Выключает сбор счётчиков и замеров (накопленные значения сохраняются)."""
+    global enabled
+    enabled = False
+
+
+def reset():
+    """Обнуляет счётчики и замеры."""
+    counters.clear()
+    stage_seconds.clear()
+    stage_calls.clear()
+
+
+def count(name, amount=1):
+    """Увеличивает счётчик name, если инструментирование включено."""
+    if enabled:
+        counters[name] += amount
+
+
+def stage(name):
+    """
+    Контекст замера этапа name: время выполнения суммируется,
+    число выполнений подсчитывается. При выключенном
+    инструментировании возвращается пустой контекст.
+    """
+    if not enabled:
+        return _NULL_STAGE
+    return _Stage(name)
+
+
+def timed(name):
+    """
+    Декоратор: каждый вызов функции — выполнение этапа name (см. stage).
+    При выключенном инструментировании функция вызывается без замера.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            with _Stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def snapshot():
+    """Текущие значения в виде словаря {'counters': {...}, 'stages': {имя: {'calls', 'seconds'}}}."""
+    return {
+        'counters': dict(counters),
+        'stages': {
+            name: {'calls': stage_calls[name], 'seconds': stage_seconds[name]}
+            for name in stage_seconds
+        },
+    }
+
+
+def format_snapshot(data):
+    """Текстовый отчёт по словарю snapshot()."""
+    lines = ["Счётчики операций:"]
+    for name, value in sorted(data['counters'].items()):
+        lines.append(f"  {name}: {value}")
+    lines.append("Этапы:")
+    for name, stage_data in sorted(data['stages'].items()):
+        lines.append(f"  {name}: {stage_data['seconds']:.6f} с, вызовов: {stage_data['calls']}")
+    return "\n".join(lines)
+
+
+class Profiler:
+    """
+    Контекстный менеджер: на время блока включает инструментирование
+    (по умолчанию предварительно обнулив значения) и по выходе сохраняет
+    snapshot() в атрибуте result, восстанавливая прежнее состояние флага.
+    """
+
+    def __init__(self, reset_before=True):
+        self.reset_before = reset_before
+        self.result = None
+        self._previous = False
+
+    def __enter__(self):
+        self._previous = enabled
+        if self.reset_before:
+            reset()
+        enable()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.result = snapshot()
+        if not self._previous:
+            disable()
+        return False
+
+
+def profile(reset_before=True):
+    """Возвращает Profiler (см. выше)."""
+    return Profiler(reset_before)
@@ -0,0 +1,130 @@
+"""
+Параллельное шифрование больших входов: вход делится на фрагменты,
+которые обрабатываются пулом процессов, а результаты собираются
+в исходном порядке. Пул потоков не используется: str.translate и
+bytes.translate не отпускают GIL, и потоки не дали бы ускорения.
+
+Шифр передаётся каждому рабочему процессу один раз — через инициализатор
+пула (AffineCipher и ByteAffineCipher сериализуются готовыми таблицами,
+см. их __reduce__), — а задания содержат только фрагменты данных.
+Число одновременно обрабатываемых фрагментов ограничено, поэтому
+потоковый режим не держит в памяти весь вход.
+"""
+import collections
+import concurrent.futures
+import os
+
+from Affine import ByteAffineCipher, iter_decoded_chunks
+
+# Размер фрагмента одного задания (символов для текста, байт для двоичных данных)
+PARALLEL_CHUNK_SIZE = 1 << 22
+
+# Шифр рабочего процесса (устанавливается инициализатором пула)
+_worker_cipher = None
+
+
+def _init_worker(cipher):
+    global _worker_cipher
+    _worker_cipher = cipher
+
+
+def _transform_chunk(cipher, method, chunk, encoding):
+    """Применяет cipher.encrypt или cipher.decrypt к фрагменту; при encoding кодирует результат."""
+    result = getattr(cipher, method)(chunk)
+    return result if encoding is None else result.encode(encoding)
+
+
+def _worker_transform(method, chunk, encoding):
+    return _transform_chunk(_worker_cipher, method, chunk, encoding)
+
+
+class ParallelCipher:
+    """
+    Обёртка над AffineCipher или ByteAffineCipher для многоядерной обработки.
+    workers — число рабочих процессов (по умолчанию — число ядер).
+    Пул создаётся при первом обращении; объект следует закрыть (close)
+    или использовать в блоке with.
+    """
+
+    def __init__(self, cipher, workers=None, chunk_size=PARALLEL_CHUNK_SIZE):
+        if chunk_size < 1:
+            raise ValueError("Размер фрагмента должен быть положительным.")
+        self.cipher = cipher
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor = None
+
+    def __repr__(self):
+        return f"ParallelCipher({self.cipher!r}, workers={self.workers})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    def close(self):
+        """Останавливает пул."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _submit(self, method, chunk, encoding):
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                self.workers, initializer=_init_worker, initargs=(self.cipher,)
+            )
+        return self._executor.submit(_worker_transform, method, chunk, encoding)
+
+    def _map_ordered(self, method, chunks, encoding=None):
+        """
+        Обрабатывает фрагменты параллельно и выдаёт результаты в исходном порядке.
+        В работе одновременно не более 2 * workers фрагментов.
+        """
+        pending = collections.deque()
+        try:
+            for chunk in chunks:
+                pending.append(self._submit(method, chunk, encoding))
+                if len(pending) >= 2 * self.workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _transform(self, method, data):
+        size = self.chunk_size
+        if len(data) <= size:
+            return getattr(self.cipher, method)(data)
+        chunks = (data[i:i + size] for i in range(0, len(data), size))
+        parts = self._map_ordered(method, chunks)
+        return b''.join(parts) if isinstance(self.cipher, ByteAffineCipher) else ''.join(parts)
+
+    def encrypt(self, data):
+        """Шифрует строку (или байты для ByteAffineCipher), деля её на фрагменты."""
+        return self._transform('encrypt', data)
+
+    def decrypt(self, data):
+        """Расшифровывает строку (или байты для ByteAffineCipher), деля её на фрагменты."""
+        return self._transform('decrypt', data)
+
+    def _transform_stream(self, method, src, dst, chunk_size, encoding):
+        chunk_size = chunk_size or self.chunk_size
+        if isinstance(self.cipher, ByteAffineCipher):
+            chunks = iter(lambda: src.read(chunk_size), b'')
+            results = self._map_ordered(method, chunks)
+        else:
+            chunks = iter_decoded_chunks(src, chunk_size, encoding)
+            results = self._map_ordered(method, chunks, encoding)
+        for result in results:
+            dst.write(result)
+        dst.flush()
+
+    def encrypt_stream(self, src, dst, chunk_size=None, encoding='utf-8'):
+        """Параллельное потоковое шифрование двоичного потока src в dst."""
+        self._transform_stream('encrypt', src, dst, chunk_size, encoding)
+
+    def decrypt_stream(self, src, dst, chunk_size=None, encoding='utf-8'):
+        """Параллельное потоковое расшифрование двоичного потока src в dst."""
+        self._transform_stream('decrypt', src, dst, chunk_size, encoding)
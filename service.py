@@ -0,0 +1,402 @@
+"""
+Локальный асинхронный сервис шифрования (asyncio, TCP или Unix-сокет).
+
+Ключи хранятся файлами снимков (см. snapshot.py) в каталоге ключей:
+идентификатор ключа key_id соответствует файлу <каталог>/<key_id>.gfk.
+Загруженные шифры держатся в LRU-кэше ограниченного размера.
+
+Протокол: кадры «4 байта длины (big-endian) + JSON в UTF-8».
+Запрос: {"id": ..., "op": "encrypt" | "decrypt" | "ping", "key": key_id, "data": ...},
+ответ: {"id": ..., "ok": true, "data": ...} или {"id": ..., "ok": false, "error": ...}.
+Для байтовых ключей (ByteAffineCipher) data передаётся в base64.
+По одному соединению можно отправлять запросы, не дожидаясь ответов:
+каждый запрос обрабатывается отдельной задачей, ответы приходят по мере
+готовности и сопоставляются с запросами по id. Суммарный размер кадров,
+обрабатываемых одновременно по одному соединению, ограничен
+MAX_BYTES_IN_FLIGHT: тело следующего кадра читается, только когда для него
+освобождается место.
+
+Шифрование выполняется в цикле событий: str.translate и bytes.translate
+не отпускают GIL, и пул потоков не разгрузил бы цикл. Большие запросы
+обрабатываются фрагментами по TRANSLATE_CHUNK_SIZE, и между фрагментами
+управление возвращается циклу событий, поэтому другие запросы не ждут
+окончания длинного.
+"""
+import argparse
+import asyncio
+import base64
+import collections
+import itertools
+import json
+import os
+import re
+import struct
+import sys
+
+from Affine import ByteAffineCipher
+from snapshot import load_snapshot
+
+FRAME_HEADER = struct.Struct('>I')
+MAX_FRAME_SIZE = 64 << 20
+
+# Размер фрагмента (символов или байт), после которого шифрование
+# возвращает управление циклу событий
+TRANSLATE_CHUNK_SIZE = 1 << 16
+
+# Наибольший суммарный размер кадров, обрабатываемых одновременно по соединению
+MAX_BYTES_IN_FLIGHT = 2 * MAX_FRAME_SIZE
+
+DEFAULT_CACHE_SIZE = 64
+KEY_FILE_SUFFIX = '.gfk'
+KEY_ID_PATTERN = re.compile(r'[A-Za-z0-9_-][A-Za-z0-9_.-]*')
+
+
+async def read_frame_header(reader):
+    """Читает заголовок кадра и возвращает длину тела или None в конце потока."""
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (length,) = FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise ValueError("Размер кадра превышает допустимый.")
+    return length
+
+
+async def read_frame_body(reader, length):
+    """Читает тело кадра длины length и возвращает разобранный JSON."""
+    try:
+        payload = await reader.readexactly(length)
+    except asyncio.IncompleteReadError as e:
+        raise ValueError(f"Кадр оборван: получено {len(e.partial)} байт из {length}.") from None
+    return json.loads(payload)
+
+
+async def read_frame(reader):
+    """
+    Читает один кадр и возвращает разобранный JSON или None в конце потока.
+    Оборванный кадр и неверный JSON — ValueError.
+    """
+    length = await read_frame_header(reader)
+    if length is None:
+        return None
+    return await read_frame_body(reader, length)
+
+
+def write_frame(writer, message):
+    """Записывает сообщение одним кадром."""
+    payload = json.dumps(message, ensure_ascii=False).encode('utf-8')
+    writer.write(FRAME_HEADER.pack(len(payload)) + payload)
+
+
+class CipherCache:
+    """
+    LRU-кэш шифров по идентификатору ключа. Файлы снимков загружаются
+    в пуле исполнителя; одновременные запросы одного ключа ждут одну загрузку.
+    """
+
+    def __init__(self, keys_dir, max_size=DEFAULT_CACHE_SIZE):
+        self.keys_dir = keys_dir
+        self.max_size = max_size
+        self._ciphers = collections.OrderedDict()
+        self._loading = {}
+
+    def __len__(self):
+        return len(self._ciphers)
+
+    def path(self, key_id):
+        """Путь к файлу ключа; идентификатор не может выходить за каталог ключей."""
+        if not isinstance(key_id, str) or not KEY_ID_PATTERN.fullmatch(key_id):
+            raise ValueError(f"Недопустимый идентификатор ключа: {key_id!r}.")
+        return os.path.join(self.keys_dir, key_id + KEY_FILE_SUFFIX)
+
+    async def get(self, key_id):
+        """Возвращает шифр ключа key_id, загружая его при необходимости."""
+        cipher = self._ciphers.get(key_id)
+        if cipher is not None:
+            self._ciphers.move_to_end(key_id)
+            return cipher
+        loading = self._loading.get(key_id)
+        if loading is None:
+            path = self.path(key_id)
+            if not os.path.exists(path):
+                raise ValueError(f"Ключ {key_id} не найден.")
+            loop = asyncio.get_running_loop()
+            loading = loop.run_in_executor(None, load_snapshot, path)
+            self._loading[key_id] = loading
+            try:
+                cipher = await loading
+            finally:
+                del self._loading[key_id]
+            self._ciphers[key_id] = cipher
+            while len(self._ciphers) > self.max_size:
+                self._ciphers.popitem(last=False)
+            return cipher
+        return await loading
+
+    def evict(self, key_id):
+        """Удаляет ключ из кэша (например, после замены файла ключа)."""
+        self._ciphers.pop(key_id, None)
+
+
+class ByteBudget:
+    """
+    Ограничение суммарного размера данных в обработке: acquire(size) ждёт,
+    пока size байт не поместятся в limit, release(size) их возвращает.
+    Запрос больше limit занимает весь limit.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self, size):
+        """Занимает size байт (не больше limit) и возвращает занятый размер."""
+        size = min(size, self.limit)
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.used + size <= self.limit)
+            self.used += size
+        return size
+
+    async def release(self, size):
+        async with self._condition:
+            self.used -= size
+            self._condition.notify_all()
+
+
+async def translate_chunked(transform, data, chunk_size=TRANSLATE_CHUNK_SIZE):
+    """
+    Применяет transform (cipher.encrypt или cipher.decrypt) к data
+    фрагментами по chunk_size, возвращая управление циклу событий
+    между фрагментами. Результат совпадает с transform(data).
+    """
+    if len(data) <= chunk_size:
+        return transform(data)
+    parts = []
+    for start in range(0, len(data), chunk_size):
+        parts.append(transform(data[start:start + chunk_size]))
+        await asyncio.sleep(0)
+    return type(parts[0])().join(parts)
+
+
+class CipherService:
+    """
+    Сервер шифрования. chunk_size — размер фрагмента, после которого
+    шифрование возвращает управление циклу событий, max_bytes_in_flight —
+    наибольший суммарный размер кадров, обрабатываемых одновременно
+    по одному соединению.
+    """
+
+    def __init__(self, keys_dir, cache_size=DEFAULT_CACHE_SIZE, chunk_size=TRANSLATE_CHUNK_SIZE,
+                 max_bytes_in_flight=MAX_BYTES_IN_FLIGHT):
+        self.cache = CipherCache(keys_dir, cache_size)
+        self.chunk_size = chunk_size
+        self.max_bytes_in_flight = max_bytes_in_flight
+
+    async def process(self, request):
+        """Выполняет один запрос и возвращает ответ."""
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("Запрос должен быть объектом JSON.")
+            op = request.get('op')
+            if op == 'ping':
+                return {'id': request_id, 'ok': True, 'data': 'pong'}
+            if op not in ('encrypt', 'decrypt'):
+                raise ValueError(f"Неизвестная операция: {op!r}.")
+            cipher = await self.cache.get(request.get('key'))
+            data = request.get('data')
+            if not isinstance(data, str):
+                raise ValueError("Поле data должно быть строкой.")
+            binary = isinstance(cipher, ByteAffineCipher)
+            if binary:
+                data = base64.b64decode(data, validate=True)
+            transform = cipher.encrypt if op == 'encrypt' else cipher.decrypt
+            result = await translate_chunked(transform, data, self.chunk_size)
+            if binary:
+                result = base64.b64encode(result).decode('ascii')
+            return {'id': request_id, 'ok': True, 'data': result}
+        except Exception as e:  # Ошибка одного запроса не должна обрывать соединение
+            return {'id': request_id, 'ok': False, 'error': str(e)}
+
+    async def handle_connection(self, reader, writer):
+        """
+        Обслуживает соединение: запросы обрабатываются конвейерно, суммарный
+        размер кадров в обработке не больше max_bytes_in_flight; ответы пишутся
+        под одной блокировкой, чтобы запись и drain разных задач не перемежались.
+        """
+        tasks = set()
+        budget = ByteBudget(self.max_bytes_in_flight)
+        write_lock = asyncio.Lock()
+
+        async def send(response):
+            async with write_lock:
+                write_frame(writer, response)
+                await writer.drain()
+
+        async def respond(request, reserved):
+            try:
+                await send(await self.process(request))
+            finally:
+                await budget.release(reserved)
+
+        try:
+            while True:
+                try:
+                    length = await read_frame_header(reader)
+                    if length is None:
+                        break
+                    reserved = await budget.acquire(length)
+                    try:
+                        request = await read_frame_body(reader, length)
+                    except BaseException:
+                        await budget.release(reserved)
+                        raise
+                except ValueError as e:
+                    await send({'id': None, 'ok': False, 'error': str(e)})
+                    break
+                task = asyncio.ensure_future(respond(request, reserved))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=0, unix_path=None):
+        """Запускает сервер на TCP-порту или Unix-сокете и возвращает asyncio.Server."""
+        if unix_path is not None:
+            return await asyncio.start_unix_server(self.handle_connection, unix_path)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+
+class CipherClient:
+    """
+    Асинхронный клиент сервиса. Запросы можно отправлять, не дожидаясь
+    ответов на предыдущие: ответы сопоставляются с запросами по id.
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._receiver = asyncio.ensure_future(self._receive())
+
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=None, unix_path=None):
+        """Подключается к сервису по TCP или через Unix-сокет."""
+        if unix_path is not None:
+            reader, writer = await asyncio.open_unix_connection(unix_path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _receive(self):
+        try:
+            while True:
+                response = await read_frame(self._reader)
+                if response is None:
+                    break
+                future = self._pending.pop(response.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except (ConnectionError, ValueError) as e:
+            error = e
+        else:
+            error = ConnectionError("Соединение с сервисом закрыто.")
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+    async def request(self, op, key=None, data=None):
+        """Отправляет запрос и ждёт ответ; при ошибке сервиса — ValueError."""
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        write_frame(self._writer, {'id': request_id, 'op': op, 'key': key, 'data': data})
+        await self._writer.drain()
+        response = await future
+        if not response.get('ok'):
+            raise ValueError(response.get('error'))
+        return response.get('data')
+
+    async def encrypt(self, key, data):
+        """Шифрует строку (для байтовых ключей — bytes) ключом key."""
+        if isinstance(data, (bytes, bytearray)):
+            return base64.b64decode(await self.request('encrypt', key, base64.b64encode(data).decode('ascii')))
+        return await self.request('encrypt', key, data)
+
+    async def decrypt(self, key, data):
+        """Расшифровывает строку (для байтовых ключей — bytes) ключом key."""
+        if isinstance(data, (bytes, bytearray)):
+            return base64.b64decode(await self.request('decrypt', key, base64.b64encode(data).decode('ascii')))
+        return await self.request('decrypt', key, data)
+
+    async def ping(self):
+        return await self.request('ping')
+
+    async def close(self):
+        self._writer.close()
+        await self._receiver
+
+
+async def serve(args):
+    service = CipherService(args.keys, args.cache_size)
+    server = await service.start(args.host, args.port, args.unix)
+    where = args.unix or ', '.join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Сервис шифрования запущен: {where}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+async def load_test(args):
+    """Нагрузочный тест: args.requests запросов по одному соединению, не более args.concurrency одновременно."""
+    client = await CipherClient.connect(args.host, args.port, args.unix)
+    text = ('абвгдежзийклмнопрстуфхцчшщъыьэюя' * (args.size // 32 + 1))[:args.size]
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one():
+        async with semaphore:
+            await client.encrypt(args.key, text)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.gather(*(one() for _ in range(args.requests)))
+    elapsed = loop.time() - start
+    await client.close()
+    print(f"{args.requests} запросов по {args.size} символов за {elapsed:.3f} с "
+          f"({args.requests / elapsed:.0f} запросов/с)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Локальный сервис аффинного шифра.")
+    parser.add_argument('mode', nargs='?', choices=['serve', 'load-test'], default='serve')
+    parser.add_argument('--keys', help="каталог файлов ключей (<key_id>.gfk)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="путь Unix-сокета вместо TCP")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                        help="наибольшее число шифров в кэше")
+    parser.add_argument('--key', help="идентификатор ключа для нагрузочного теста")
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--size', type=int, default=1000, help="длина текста одного запроса")
+    parser.add_argument('--concurrency', type=int, default=64)
+    args = parser.parse_args(argv)
+    if args.mode == 'serve' and not args.keys:
+        parser.error("для запуска сервиса требуется --keys")
+    if args.mode == 'load-test' and not args.key:
+        parser.error("для нагрузочного теста требуется --key")
+    try:
+        asyncio.run(serve(args) if args.mode == 'serve' else load_test(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
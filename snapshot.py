@@ -0,0 +1,293 @@
+"""
+Файлы снимков ключа: поле, алфавит, ключ (α, β, α⁻¹) и скомпилированные
+таблицы подстановки в компактном двоичном виде. Загрузка снимка не требует
+ни поиска неприводимого многочлена и образующего, ни умножений в поле,
+ни построения таблиц: файл отображается в память (mmap), и таблицы поля,
+индексы алфавита и таблицы подстановки шифра — это memoryview над
+отображением, без копирования. Отображение живёт, пока жив шифр, поэтому
+много процессов, загрузивших один файл ключа, делят его страницы.
+
+Формат (все числа — little-endian): заголовок HEADER (сигнатура, версия,
+вид шифра, n, p, число символов алфавита, наименьший код алфавита, CRC32
+остальных полей заголовка и тела), затем массивы 32-битных чисел:
+- для текстового шифра: modulus (n + 1), α, β, α⁻¹, образующий (по n),
+  удвоенная таблица степеней образующего (2 * (p^n - 1)), таблица
+  логарифмов (p^n), коды символов алфавита (UTF-32-LE), упакованные
+  элементы поля символов, номера образов при шифровании и при
+  расшифровании (по одному на символ, -1 — образа нет), длина L
+  плотных таблиц подстановки, таблицы шифрования и расшифрования (по L),
+  номера символов по коду (L - наименьший код) и по элементу поля (p^n).
+  Если коды алфавита слишком велики для плотных таблиц, L = 0, последние
+  четыре массива отсутствуют, и таблицы строятся при загрузке;
+- для байтового шифра: modulus (9), α, β (по 8), затем две таблицы
+  подстановки по 256 байт.
+"""
+import array
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+from Affine import AffineCipher, AlphabetIndex, ByteAffineCipher, ElementIndex
+from GF import GaloisField, element_to_int, int_to_element, is_prime
+
+SNAPSHOT_MAGIC = b'GFAK'
+SNAPSHOT_VERSION = 2
+
+KIND_TEXT = 0
+KIND_BYTES = 1
+
+# Заголовок: сигнатура, версия, вид шифра, n, p, число символов алфавита,
+# наименьший код алфавита (начало номеров символов по коду; 0, если L = 0),
+# CRC32 предшествующих полей заголовка и тела
+HEADER = struct.Struct('<4sBBHIIII')
+
+
+def _u32_bytes(values, typecode='I'):
+    """Упаковывает последовательность чисел в байты 32-битных little-endian."""
+    data = array.array(typecode, values)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data.tobytes()
+
+
+def _view_u32(view, offset, count, typecode='I'):
+    """
+    Возвращает (memoryview из count 32-битных чисел с позиции offset, новая позиция).
+    На little-endian машинах данные не копируются.
+    """
+    end = offset + 4 * count
+    if end > len(view):
+        raise ValueError("Файл снимка повреждён: неожиданный конец данных.")
+    if sys.byteorder != 'little':
+        data = array.array(typecode, view[offset:end].tobytes())
+        data.byteswap()
+        return memoryview(data), end
+    return view[offset:end].cast(typecode), end
+
+
+def _values_below(values, bound):
+    """
+    Проверяет, что все числа последовательности меньше bound.
+    Для memoryview из 32-битных чисел без знака на little-endian машине
+    старшие байты проверяются срезами с шагом 4 на скорости C; если bound
+    немного меньше степени двойки (как p^n - 1 при p = 2), недопустимые
+    значения ищутся в байтах напрямую, иначе нужен полный перебор.
+    """
+    if not len(values):
+        return True
+    if not (isinstance(values, memoryview) and values.format == 'I'
+            and values.c_contiguous and sys.byteorder == 'little'):
+        return max(values) < bound
+    if bound > 1 << 32:
+        return True
+    bits = (bound - 1).bit_length()
+    whole, rest = divmod(bits, 8)
+    raw = values.tobytes()
+    for column in range(whole + (rest > 0), 4):
+        if raw[column::4].count(0) != len(values):
+            return False
+    if rest:
+        high_bits = bytes(0 if byte >> rest == 0 else 1 for byte in range(256))
+        if raw[whole::4].translate(high_bits).count(0) != len(values):
+            return False
+    if (1 << bits) - bound > 4:
+        return max(values) < bound
+    for value in range(bound, 1 << bits):
+        pattern = value.to_bytes(4, 'little')
+        position = raw.find(pattern)
+        while position != -1:
+            if position % 4 == 0:
+                return False
+            position = raw.find(pattern, position + 1)
+    return True
+
+
+def save_snapshot(cipher, path):
+    """
+    Сохраняет AffineCipher или ByteAffineCipher в файл снимка.
+    Файл записывается во временный и затем атомарно подменяется,
+    поэтому читатели никогда не видят его недописанным.
+    """
+    if isinstance(cipher, ByteAffineCipher):
+        kind, n, p, count, low = KIND_BYTES, 8, 2, 256, 0
+        body = [
+            _u32_bytes(cipher.modulus),
+            _u32_bytes(int_to_element(cipher.alpha, 2, 8)),
+            _u32_bytes(int_to_element(cipher.beta, 2, 8)),
+            cipher.encrypt_table,
+            cipher.decrypt_table,
+        ]
+    elif isinstance(cipher, AffineCipher):
+        field = cipher.field
+        kind, n, p, count, low = KIND_TEXT, field.n, field.p, len(cipher.alphabet), 0
+        if field.size > 1 << 32:
+            raise ValueError("Поле слишком велико для файла снимка.")
+        body = [
+            _u32_bytes(field.modulus),
+            _u32_bytes(cipher.alpha),
+            _u32_bytes(cipher.beta),
+            _u32_bytes(cipher.alpha_inv),
+            _u32_bytes(field.generator),
+            _u32_bytes(field.exp_table),
+            _u32_bytes(field.log_table),
+            cipher.alphabet.encode('utf-32-le'),
+            _u32_bytes(cipher.char_to_field.packed),
+            _u32_bytes(cipher.encrypt_index, 'i'),
+            _u32_bytes(cipher.decrypt_index, 'i'),
+        ]
+        if isinstance(cipher.encrypt_table, memoryview):
+            low = cipher.char_to_field.offset
+            body += [
+                _u32_bytes([len(cipher.encrypt_table)]),
+                _u32_bytes(cipher.encrypt_table),
+                _u32_bytes(cipher.decrypt_table),
+                _u32_bytes(cipher.char_to_field.positions, 'i'),
+                _u32_bytes(cipher.field_to_char.positions, 'i'),
+            ]
+        else:
+            body.append(_u32_bytes([0]))
+    else:
+        raise ValueError("Ожидался объект AffineCipher или ByteAffineCipher.")
+
+    header = HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, kind, n, p, count, low, 0)
+    crc = zlib.crc32(header[:-4])
+    for chunk in body:
+        crc = zlib.crc32(chunk, crc)
+    header = header[:-4] + struct.pack('<I', crc)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    try:
+        with open(tmp_path, 'wb') as snapshot_file:
+            snapshot_file.write(header)
+            for chunk in body:
+                snapshot_file.write(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def load_snapshot(path):
+    """
+    Загружает шифр из файла снимка. Файл отображается в память только
+    для чтения; таблицы шифра ссылаются на отображение, и оно закрывается,
+    когда шифр (и его поле) больше не используются.
+    Возвращает AffineCipher или ByteAffineCipher.
+    """
+    with open(path, 'rb') as snapshot_file:
+        if os.fstat(snapshot_file.fileno()).st_size == 0:
+            raise ValueError(f"Файл {path} не является снимком ключа.")
+        mapped = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return _parse_snapshot(mapped, path)
+    except BaseException:
+        try:
+            mapped.close()
+        except BufferError:
+            pass  # На отображение ещё ссылаются memoryview; оно закроется вместе с ними
+        raise
+
+
+def _check_header(path, kind, n, p, count):
+    """Проверяет поля заголовка до их использования."""
+    if kind not in (KIND_TEXT, KIND_BYTES):
+        raise ValueError(f"Неизвестный вид шифра в снимке: {kind}.")
+    if p < 2 or not is_prime(p):
+        raise ValueError(f"Файл снимка {path} повреждён: p = {p} не является простым.")
+    if n < 1:
+        raise ValueError(f"Файл снимка {path} повреждён: n = {n}.")
+    if kind == KIND_BYTES and (p, n, count) != (2, 8, 256):
+        raise ValueError(f"Файл снимка {path} повреждён: неверные параметры байтового шифра.")
+    if kind == KIND_TEXT and (p ** n > 1 << 32 or count > p ** n):
+        raise ValueError(f"Файл снимка {path} повреждён: неверный размер поля или алфавита.")
+
+
+def _check_range(values, low, high, what):
+    """
+    Проверяет, что все значения лежат в [low, high). Применяется только
+    к коротким массивам (коэффициенты): большие таблицы защищены CRC32,
+    а таблицы поля и элементы алфавита проверяет _values_below.
+    """
+    if len(values) and (min(values) < low or max(values) >= high):
+        raise ValueError(f"Файл снимка повреждён: {what} вне допустимого диапазона.")
+
+
+def _parse_snapshot(data, path):
+    if len(data) < 5 or data[:4] != SNAPSHOT_MAGIC:
+        raise ValueError(f"Файл {path} не является снимком ключа.")
+    version = data[4]
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Версия снимка {version} не поддерживается (ожидалась {SNAPSHOT_VERSION}).")
+    if len(data) < HEADER.size:
+        raise ValueError(f"Файл {path} не является снимком ключа.")
+    _, _, kind, n, p, count, low, crc = HEADER.unpack_from(data, 0)
+    _check_header(path, kind, n, p, count)
+    view = memoryview(data)
+    if zlib.crc32(view[HEADER.size:], zlib.crc32(view[:HEADER.size - 4])) != crc:
+        raise ValueError(f"Файл снимка {path} повреждён: не совпадает контрольная сумма.")
+
+    offset = HEADER.size
+    modulus, offset = _view_u32(view, offset, n + 1)
+    alpha, offset = _view_u32(view, offset, n)
+    beta, offset = _view_u32(view, offset, n)
+    _check_range(modulus, 0, p, "коэффициенты модуля")
+    _check_range(alpha, 0, p, "коэффициенты α")
+    _check_range(beta, 0, p, "коэффициенты β")
+
+    if kind == KIND_BYTES:
+        if offset + 512 != len(view):
+            raise ValueError("Файл снимка повреждён: неверный размер данных.")
+        return ByteAffineCipher._restore(
+            element_to_int(alpha, 2), element_to_int(beta, 2), tuple(modulus),
+            view[offset:offset + 256], view[offset + 256:offset + 512]
+        )
+
+    size = p ** n
+    alpha_inv, offset = _view_u32(view, offset, n)
+    generator, offset = _view_u32(view, offset, n)
+    _check_range(alpha_inv, 0, p, "коэффициенты α⁻¹")
+    _check_range(generator, 0, p, "коэффициенты образующего")
+    exp_table, offset = _view_u32(view, offset, 2 * (size - 1))
+    log_table, offset = _view_u32(view, offset, size)
+    if not (_values_below(exp_table, size) and _values_below(log_table, size - 1)):
+        raise ValueError("Файл снимка повреждён: таблицы степеней и логарифмов содержат значения вне поля.")
+    field = GaloisField.from_tables(p, modulus, generator, exp_table, log_table)
+
+    codes, offset = _view_u32(view, offset, count)
+    try:
+        alphabet = codes.tobytes().decode('utf-32-le')
+    except UnicodeDecodeError:
+        raise ValueError("Файл снимка повреждён: недопустимые коды символов алфавита.") from None
+    packed, offset = _view_u32(view, offset, count)
+    encrypt_index, offset = _view_u32(view, offset, count, 'i')
+    decrypt_index, offset = _view_u32(view, offset, count, 'i')
+    if not _values_below(packed, size):
+        raise ValueError("Файл снимка повреждён: элементы поля алфавита вне допустимого диапазона.")
+    (table_size,), offset = _view_u32(view, offset, 1)
+
+    if table_size == 0:
+        if offset != len(view):
+            raise ValueError("Файл снимка повреждён: неверный размер данных.")
+        return AffineCipher._restore(field, alphabet, alpha, beta, alpha_inv,
+                                     packed, encrypt_index, decrypt_index)
+
+    if low > table_size:
+        raise ValueError("Файл снимка повреждён: неверный размер таблиц подстановки.")
+    encrypt_table, offset = _view_u32(view, offset, table_size)
+    decrypt_table, offset = _view_u32(view, offset, table_size)
+    char_positions, offset = _view_u32(view, offset, table_size - low, 'i')
+    element_positions, offset = _view_u32(view, offset, size, 'i')
+    if offset != len(view):
+        raise ValueError("Файл снимка повреждён: неверный размер данных.")
+
+    char_to_field = AlphabetIndex._restore(field, alphabet, low, char_positions, packed)
+    field_to_char = ElementIndex._restore(field, alphabet, packed, element_positions)
+    return AffineCipher._from_tables(
+        field, alphabet, alpha, beta, alpha_inv, char_to_field, field_to_char,
+        encrypt_index, decrypt_index, encrypt_table, decrypt_table
+    )
+
@@ -0,0 +1,171 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from Affine import DENSE_TABLE_LIMIT, AffineCipher, print_tracer
+from GF import GaloisField
+
+RU_ALPHABET = 'абвгдежзийклмнопрстуфхцчшщъыьэюя'
+
+
+@pytest.fixture
+def field():
+    return GaloisField(2, (1, 0, 1, 0, 0, 1))
+
+
+def naive_encrypt(field, cipher, text):
+    """Посимвольное шифрование по определению y = α * x + β."""
+    result = []
+    for char in text:
+        x = cipher.char_to_field.get(char)
+        if x is None:
+            result.append('?')
+            continue
+        y = field.add(field.multiply(cipher.alpha, x), cipher.beta)
+        result.append(cipher.field_to_char.get(y, '?'))
+    return ''.join(result)
+
+
+def test_round_trip_and_definition(field):
+    cipher = AffineCipher(field, RU_ALPHABET, (0, 1, 1, 0, 0), (1, 0, 0, 1, 0))
+    text = 'съешь же ещё этих мягких французских булок'
+    ciphertext = cipher.encrypt(text)
+    assert ciphertext == naive_encrypt(field, cipher, text)
+    assert cipher.decrypt(ciphertext) == ''.join(c if c in RU_ALPHABET else '?' for c in text)
+    assert sorted(cipher.encrypt(RU_ALPHABET)) == sorted(RU_ALPHABET)
+
+
+def test_tracer_matches_translate(field):
+    cipher = AffineCipher(field, RU_ALPHABET, field.from_int(3), field.from_int(5))
+    text = 'привет, мир'
+    events = []
+    assert cipher.encrypt(text, tracer=events.append) == cipher.encrypt(text)
+    assert [event['type'] for event in events].count('encrypt_skip') == 2
+    assert cipher.decrypt(cipher.encrypt(text), tracer=events.append) == cipher.decrypt(cipher.encrypt(text))
+
+
+def test_zero_alpha_rejected(field):
+    with pytest.raises(ValueError):
+        AffineCipher(field, RU_ALPHABET, field.zero, field.one)
+
+
+def test_immutable_and_read_only(field):
+    cipher = AffineCipher(field, RU_ALPHABET, field.from_int(3), field.from_int(5))
+    with pytest.raises(AttributeError):
+        cipher.alpha = field.one
+    with pytest.raises(AttributeError):
+        del cipher.beta
+    with pytest.raises(TypeError):
+        cipher.encrypt_table[ord('а')] = ord('б')
+    with pytest.raises(TypeError):
+        cipher.char_to_field.packed[0] = 1
+
+
+def test_large_alphabet():
+    field = GaloisField(2, (1, 1, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1))
+    alphabet = ''.join(chr(0x4E00 + i) for i in range(field.size))
+    cipher = AffineCipher(field, alphabet, field.from_int(12345), field.from_int(678))
+    text = alphabet[::97] + 'a'
+    assert cipher.decrypt(cipher.encrypt(text)) == alphabet[::97] + '?'
+
+
+def test_concurrent_ciphers_share_field(field):
+    ciphers = [AffineCipher(field, RU_ALPHABET, field.from_int(a), field.from_int(a + 1))
+               for a in range(1, 32)]
+    text = RU_ALPHABET * 100
+
+    def work(cipher):
+        return cipher.decrypt(cipher.encrypt(text)) == text and \
+            cipher.encrypt(text) == naive_encrypt(field, cipher, text)
+
+    with ThreadPoolExecutor(8) as pool:
+        assert all(pool.map(work, ciphers))
+
+
+def test_substitution_tables_match_definition(field):
+    cipher = AffineCipher(field, RU_ALPHABET, field.from_int(7), field.from_int(9))
+    assert isinstance(cipher.encrypt_table, memoryview)
+    for char in RU_ALPHABET:
+        encrypted = chr(cipher.encrypt_table[ord(char)])
+        assert encrypted == naive_encrypt(field, cipher, char)
+        assert chr(cipher.decrypt_table[ord(encrypted)]) == char
+    # Символы вне алфавита — и внутри диапазона таблицы, и выше него
+    assert cipher.encrypt('a\U0001F600я') == '??' + cipher.encrypt('я')
+
+
+def test_short_alphabet_leaves_unmapped_images_as_placeholder(field):
+    alphabet = RU_ALPHABET[:20]
+    cipher = AffineCipher(field, alphabet, field.from_int(3), field.from_int(5))
+    assert cipher.encrypt(alphabet) == naive_encrypt(field, cipher, alphabet)
+    for char, encrypted in zip(alphabet, cipher.encrypt(alphabet)):
+        if encrypted != '?':
+            assert cipher.decrypt(encrypted) == char
+
+
+def test_alphabet_beyond_dense_limit_uses_mapping_table(field):
+    alphabet = ''.join(chr(0x20000 + 97 * i) for i in range(32))
+    assert ord(alphabet[-1]) >= DENSE_TABLE_LIMIT
+    cipher = AffineCipher(field, alphabet, field.from_int(3), field.from_int(5))
+    assert not isinstance(cipher.encrypt_table, memoryview)
+    assert cipher.encrypt(alphabet + 'z') == naive_encrypt(field, cipher, alphabet) + '?'
+    assert cipher.decrypt(cipher.encrypt(alphabet)) == alphabet
+
+
+def test_tracer_events(field):
+    cipher = AffineCipher(field, RU_ALPHABET, field.from_int(3), field.from_int(5))
+    events = []
+    ciphertext = cipher.encrypt('а!', tracer=events.append)
+    assert [event['type'] for event in events] == ['encrypt', 'encrypt_skip']
+    event = events[0]
+    assert event['x'] == cipher.char_to_field['а']
+    assert event['alpha_x'] == field.multiply(cipher.alpha, event['x'])
+    assert event['y'] == field.add(event['alpha_x'], cipher.beta)
+    assert event['result'] == ciphertext[0]
+    events.clear()
+    cipher.decrypt(ciphertext, tracer=events.append)
+    assert [event['type'] for event in events] == ['decrypt', 'decrypt_skip']
+    assert events[0]['result'] == 'а'
+
+
+def test_print_tracer_output(field, capsys):
+    cipher = AffineCipher(field, RU_ALPHABET, field.from_int(3), field.from_int(5))
+    ciphertext = cipher.encrypt('б!', tracer=print_tracer)
+    cipher.decrypt(ciphertext, tracer=print_tracer)
+    out = capsys.readouterr().out
+    assert "Шифруем 'б'" in out and "Дешифруем" in out
+    assert f"Соответствующий символ: '{ciphertext[0]}'" in out
+    assert "Символ '!' отсутствует в алфавите" in out
+
+
+def test_untraced_encrypt_prints_nothing(field, capsys):
+    cipher = AffineCipher(field, RU_ALPHABET, field.from_int(3), field.from_int(5))
+    cipher.decrypt(cipher.encrypt(RU_ALPHABET * 10))
+    assert capsys.readouterr().out == ''
+
+
+def test_alphabet_index_mapping_protocol(field):
+    alphabet = ''.join(chr(0x1F600 + 3 * i) for i in range(32))
+    cipher = AffineCipher(field, alphabet, field.from_int(3), field.from_int(5))
+    char_to_field, field_to_char = cipher.char_to_field, cipher.field_to_char
+    assert len(char_to_field) == len(field_to_char) == 32
+    assert list(char_to_field) == list(alphabet)
+    assert sorted(field_to_char) == sorted(char_to_field.values())
+    for char in alphabet:
+        assert field_to_char[char_to_field[char]] == char
+    for key in ('a', chr(0x1F601), 'ab', 5):
+        assert key not in char_to_field
+        with pytest.raises(KeyError):
+            char_to_field[key]
+    for key in ((0, 0, 0, 0, 2), (0, 0, 0), (1, 2, 3, 4, 5, 6)):
+        assert field_to_char.get(key) is None
+
+
+def test_large_alphabet_tables_are_compact():
+    field = GaloisField(2, (1, 1, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1))
+    alphabet = ''.join(chr(0x4E00 + i) for i in range(field.size))
+    cipher = AffineCipher(field, alphabet, field.from_int(3), field.from_int(5))
+    assert isinstance(cipher.encrypt_table, memoryview)
+    assert cipher.char_to_field.positions.nbytes == 4 * field.size
+    assert cipher.encrypt_table.nbytes == 4 * (0x4E00 + field.size)
+    text = alphabet[::1001]
+    assert cipher.decrypt(cipher.encrypt(text)) == text
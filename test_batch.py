@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+import batch
+from batch import BatchField
+from GF import element_to_int, int_to_element, poly_add, poly_inverse, poly_multiply, power_element
+
+FIELDS = [(2, (1, 0, 1, 0, 0, 1)), (3, (1, 2, 0, 1)), (5, (2, 1, 1))]
+
+
+def packed_product(a, b, p, modulus):
+    n = len(modulus) - 1
+    return element_to_int(poly_multiply(int_to_element(a, p, n), int_to_element(b, p, n), modulus, p), p)
+
+
+@pytest.fixture(params=['tables', 'convolution', 'python'])
+def strategy(request, monkeypatch):
+    if request.param == 'python':
+        monkeypatch.setattr(batch, 'numpy', None)
+    else:
+        pytest.importorskip('numpy')
+        if request.param == 'convolution':
+            monkeypatch.setattr(batch, 'TABLE_SIZE_LIMIT', 0)
+    return request.param
+
+
+@pytest.mark.parametrize('p, modulus', FIELDS)
+def test_strategies_match_poly_multiply(strategy, p, modulus):
+    field = BatchField(p, modulus)
+    if strategy != 'python':
+        assert field.strategy == strategy
+    n, size = field.n, field.size
+    rng = random.Random(p)
+    a = [rng.randrange(size) for _ in range(200)]
+    b = [rng.randrange(size) for _ in range(200)]
+    assert list(field.multiply(a, b)) == [packed_product(x, y, p, modulus) for x, y in zip(a, b)]
+    assert list(field.add(a, b)) == [
+        element_to_int(poly_add(int_to_element(x, p, n), int_to_element(y, p, n), p)[:n], p)
+        for x, y in zip(a, b)]
+    assert list(field.subtract(field.add(a, b), b)) == a
+
+    nonzero = [x or 1 for x in a]
+    inverses = list(field.inverse(nonzero))
+    assert inverses == [element_to_int(poly_inverse(int_to_element(x, p, n), modulus, p), p)
+                        for x in nonzero]
+    assert list(field.multiply(nonzero, inverses)) == [1] * len(nonzero)
+    assert list(field.power(nonzero, 5)) == [
+        element_to_int(power_element(int_to_element(x, p, n), 5, modulus, p), p) for x in nonzero]
+    assert list(field.power(nonzero, -1)) == inverses
+
+
+@pytest.mark.parametrize('p, modulus', FIELDS)
+def test_affine_round_trip(strategy, p, modulus):
+    field = BatchField(p, modulus)
+    x = list(range(field.size))
+    alpha, beta = field.size - 1, 2
+    n = field.n
+    y = field.affine(x, alpha, beta)
+    assert list(y) == [
+        element_to_int(poly_add(int_to_element(packed_product(v, alpha, p, modulus), p, n),
+                                int_to_element(beta, p, n), p)[:n], p)
+        for v in x]
+    assert sorted(y) == x
+    assert list(field.affine_inverse(y, alpha, beta)) == x
+
+
+def test_matrix_operands(strategy):
+    p, modulus = 3, (1, 2, 0, 1)
+    field = BatchField(p, modulus)
+    rows = [int_to_element(value, p, 3) for value in range(1, field.size)]
+    product = field.multiply(rows, (0, 1, 0))
+    expected = [poly_multiply(row, (0, 1, 0), modulus, p) for row in rows]
+    assert [tuple(int(c) for c in row) for row in product] == [tuple(row) for row in expected]
+
+
+def test_inverse_of_zero(strategy):
+    field = BatchField(2, (1, 1, 0, 1))
+    with pytest.raises(ZeroDivisionError):
+        field.inverse([1, 0, 3])
+    with pytest.raises(ZeroDivisionError):
+        field.power([0], -1)
+
+
+def test_large_field_convolution_matches_poly_multiply():
+    numpy = pytest.importorskip('numpy')
+    p, modulus = 2, (1, 1, 0, 1, 1) + (0,) * 59 + (1,)
+    field = BatchField(p, modulus)
+    assert field.strategy == 'convolution'
+    rng = random.Random(0)
+    a = numpy.array([[rng.randrange(p) for _ in range(64)] for _ in range(20)])
+    b = numpy.array([[rng.randrange(p) for _ in range(64)] for _ in range(20)])
+    product = field.multiply(a, b)
+    for row_a, row_b, row in zip(a.tolist(), b.tolist(), product.tolist()):
+        assert tuple(row) == poly_multiply(row_a, row_b, modulus, p)
@@ -0,0 +1,54 @@
+import json
+
+import bench
+from bench import BENCH_FORMAT_VERSION, compare, main, measure
+
+
+def results(**timings):
+    return {'version': BENCH_FORMAT_VERSION, 'results': timings}
+
+
+def test_compare_classifies_timings():
+    baseline = results(slow=1.0, fast=1.0, same=1.0)
+    current = results(slow=1.5, fast=0.5, same=1.1, added=2.0)
+    lines, regressions = compare(baseline, current, tolerance=0.25)
+    assert regressions == 1
+    report = "\n".join(lines)
+    assert "РЕГРЕССИЯ  slow" in report
+    assert "ускорение  fast" in report
+    assert "без изм.   same" in report
+    assert "новый      added" in report
+
+
+def test_main_compares_saved_results(tmp_path, capsys):
+    baseline = tmp_path / 'baseline.json'
+    current = tmp_path / 'current.json'
+    baseline.write_text(json.dumps(results(a=1.0)), encoding='utf-8')
+    current.write_text(json.dumps(results(a=1.1)), encoding='utf-8')
+    assert main(['--compare', str(current), '--baseline', str(baseline)]) == 0
+    current.write_text(json.dumps(results(a=2.0)), encoding='utf-8')
+    assert main(['--compare', str(current), '--baseline', str(baseline)]) == 1
+    baseline.write_text(json.dumps({'version': -1, 'results': {}}), encoding='utf-8')
+    assert main(['--compare', str(current), '--baseline', str(baseline)]) == 2
+    assert "Регрессий: 1" in capsys.readouterr().out
+
+
+def test_measure_returns_time_per_call():
+    assert 0 < measure(lambda: sum(range(100)), repeat=2) < 1
+
+
+def test_quick_suite_runs_against_current_api(monkeypatch):
+    calls = []
+
+    def measure_once(func, repeat=5):
+        calls.append(func())
+        return 1e-6
+    monkeypatch.setattr(bench, 'measure', measure_once)
+    monkeypatch.setattr(bench, 'QUICK_IRREDUCIBLE_DEGREES', [(2, 8)])
+    data = bench.run_benchmarks(quick=True)
+    names = set(data['results'])
+    for name in ('GaloisField[p=2,n=8]', 'element_orders[p=2,n=5,field]', 'iter_generators[p=3,n=3]',
+                 'discrete_log[p=2,n=5]', 'AffineCipher.encrypt[size=1000]',
+                 'ByteAffineCipher.decrypt[size=1000]'):
+        assert name in names
+    assert len(calls) == len(names)
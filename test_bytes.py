@@ -0,0 +1,67 @@
+import io
+
+import pytest
+
+from Affine import ByteAffineCipher, compile_byte_tables, translate_bytes
+from GF import element_to_int, gf2_multiply
+
+AES_MODULUS = (1, 1, 0, 1, 1, 0, 0, 0, 1)
+
+
+def test_tables_match_field_arithmetic():
+    encrypt_table, decrypt_table = compile_byte_tables(0x53, 0x1f, AES_MODULUS)
+    mask = element_to_int(AES_MODULUS, 2)
+    assert list(encrypt_table) == [gf2_multiply(0x53, x, mask) ^ 0x1f for x in range(256)]
+    assert sorted(encrypt_table) == list(range(256))
+    assert all(decrypt_table[encrypt_table[x]] == x for x in range(256))
+
+
+@pytest.mark.parametrize('alpha, beta, modulus', [
+    (0, 1, None),
+    (256, 1, None),
+    (1, 256, None),
+    (1, 1, (1, 0, 0, 0, 0, 0, 0, 0, 1)),     # x^8 + 1 приводим
+    (1, 1, (1, 1, 0, 1)),
+])
+def test_invalid_key_rejected(alpha, beta, modulus):
+    with pytest.raises(ValueError):
+        compile_byte_tables(alpha, beta, modulus)
+
+
+def test_buffer_types():
+    cipher = ByteAffineCipher(7, 11)
+    data = bytes(range(256)) * 4
+    encrypted = cipher.encrypt(data)
+    assert cipher.encrypt(bytearray(data)) == encrypted
+    assert cipher.encrypt(memoryview(data)) == encrypted
+    assert cipher.decrypt(memoryview(bytearray(encrypted))) == data
+    assert translate_bytes(memoryview(data).cast('B', (32, 32)), cipher.encrypt_table) == encrypted
+
+
+def test_numpy_arrays():
+    numpy = pytest.importorskip('numpy')
+    cipher = ByteAffineCipher(7, 11)
+    data = numpy.arange(256, dtype=numpy.uint8)
+    encrypted = cipher.encrypt(data)
+    assert isinstance(encrypted, numpy.ndarray)
+    assert encrypted.tobytes() == cipher.encrypt(data.tobytes())
+    assert (cipher.decrypt(encrypted) == data).all()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 100, 1 << 16])
+def test_byte_stream(chunk_size):
+    cipher = ByteAffineCipher(0x53, 0x1f, AES_MODULUS)
+    data = bytes(range(256)) * 7
+    encrypted = io.BytesIO()
+    cipher.encrypt_stream(io.BytesIO(data), encrypted, chunk_size)
+    assert encrypted.getvalue() == cipher.encrypt(data)
+    decrypted = io.BytesIO()
+    cipher.decrypt_stream(io.BytesIO(encrypted.getvalue()), decrypted, chunk_size)
+    assert decrypted.getvalue() == data
+
+
+def test_byte_cipher_is_immutable():
+    cipher = ByteAffineCipher(7, 11)
+    with pytest.raises(AttributeError):
+        cipher.alpha = 3
+    assert repr(cipher) == "ByteAffineCipher(α=0x07, β=0x0b)"
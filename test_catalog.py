@@ -0,0 +1,65 @@
+import pytest
+
+from catalog import DEFAULT_CATALOG_PATH, PolynomialCatalog, get_irreducible_polynomial
+from GF import GaloisField, is_irreducible, is_primitive_polynomial
+
+
+def test_miss_finds_sparse_polynomial_and_caches_it(tmp_path):
+    cache = tmp_path / 'cache.catalog'
+    catalog = PolynomialCatalog(path=tmp_path / 'missing.catalog', cache_path=cache)
+    irreducible = catalog.get(2, 33)
+    primitive = catalog.get(2, 33, primitive=True)
+    assert is_irreducible(irreducible, 2) and sum(irreducible) <= 5
+    assert is_primitive_polynomial(primitive, 2) and sum(primitive) <= 5
+    reloaded = PolynomialCatalog(path=tmp_path / 'missing.catalog', cache_path=cache)
+    assert reloaded.lookup(2, 33) == irreducible
+    assert reloaded.lookup(2, 33, primitive=True) == primitive
+
+
+@pytest.mark.parametrize('p, n', [(2, 8), (2, 16), (3, 5), (5, 4)])
+def test_shipped_primitive_moduli_build_fields_by_shifts(p, n):
+    modulus = get_irreducible_polynomial(p, n, primitive=True)
+    assert is_primitive_polynomial(list(modulus), p)
+    assert GaloisField(p, modulus).x_is_primitive
+
+
+def test_shipped_catalog_entries_are_valid():
+    catalog = PolynomialCatalog()
+    entries = catalog._load()
+    assert (2, 8) in entries and (3, 5) in entries
+    for (p, n), polynomials in entries.items():
+        assert any(primitive for _, primitive in polynomials)
+        for coeffs, primitive in polynomials:
+            assert len(coeffs) == n + 1 and is_irreducible(coeffs, p)
+            assert is_primitive_polynomial(coeffs, p) == primitive
+
+
+def test_shipped_catalog_hit_is_read_only(tmp_path):
+    with open(DEFAULT_CATALOG_PATH, 'rb') as shipped:
+        before = shipped.read()
+    cache = tmp_path / 'cache.catalog'
+    catalog = PolynomialCatalog(cache_path=cache)
+    modulus = catalog.get(2, 8)
+    assert modulus == catalog.lookup(2, 8) == [1, 1, 0, 1, 1, 0, 0, 0, 1]
+    modulus.append(5)
+    assert catalog.lookup(2, 8) == [1, 1, 0, 1, 1, 0, 0, 0, 1]
+    assert not cache.exists()
+    with open(DEFAULT_CATALOG_PATH, 'rb') as shipped:
+        assert shipped.read() == before
+
+
+def test_catalog_file_with_wrong_header_rejected(tmp_path):
+    path = tmp_path / 'bad.catalog'
+    path.write_text("gfcatalog 99\n2 3 1 b\n", encoding='ascii')
+    with pytest.raises(ValueError):
+        PolynomialCatalog(path=path).lookup(2, 3)
+
+
+def test_unwritable_cache_warns(tmp_path):
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    catalog = PolynomialCatalog(path=tmp_path / 'missing.catalog', cache_path=blocker / 'cache.catalog')
+    with pytest.warns(RuntimeWarning):
+        modulus = catalog.get(2, 5)
+    assert is_irreducible(modulus, 2)
+    assert catalog.lookup(2, 5) == modulus
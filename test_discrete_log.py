@@ -0,0 +1,75 @@
+import pytest
+
+from GF import (
+    DiscreteLogTable, GaloisField, baby_step_giant_step, discrete_log,
+    find_primitive_element, int_to_element, power_element
+)
+
+# (p, модуль): x примитивен не для всех модулей (x^8 + x^4 + x^3 + x + 1 — нет)
+FIELDS = [
+    (2, (1, 1, 0, 1, 1, 0, 0, 0, 1)),
+    (2, (1, 1, 0, 0, 1)),
+    (3, (1, 2, 0, 1)),
+    (5, (2, 0, 1)),
+    (7, (3, 1, 1)),
+]
+
+
+@pytest.mark.parametrize('p, modulus', FIELDS)
+def test_discrete_log_matches_table(p, modulus):
+    n = len(modulus) - 1
+    generator = find_primitive_element(modulus, p)
+    table = DiscreteLogTable(generator, modulus, p)
+    assert table.order == p ** n - 1
+    for value in range(1, p ** n):
+        elem = int_to_element(value, p, n)
+        assert discrete_log(elem, generator, modulus, p) == table.log(elem)
+
+
+@pytest.mark.parametrize('p, modulus', FIELDS)
+def test_discrete_log_with_field_tables(p, modulus):
+    field = GaloisField(p, modulus)
+    table = DiscreteLogTable(field.generator, modulus, p)
+    for value in range(1, field.size):
+        elem = field.from_int(value)
+        assert discrete_log(elem, field.generator, modulus, p, field) == table.log(elem)
+
+
+def test_discrete_log_non_generator_base():
+    p, modulus = 2, (1, 1, 0, 1, 1, 0, 0, 0, 1)
+    base = (0, 1, 0, 0, 0, 0, 0, 0)  # x имеет порядок 51
+    table = DiscreteLogTable(base, modulus, p)
+    assert table.order == 51
+    for k in range(60):
+        elem = power_element(base, k, modulus, p)
+        assert discrete_log(elem, base, modulus, p) == k % 51 == table.log(elem)
+    outside = find_primitive_element(modulus, p)
+    with pytest.raises(ValueError):
+        discrete_log(outside, base, modulus, p)
+    with pytest.raises(ValueError):
+        table.log(outside)
+
+
+def test_discrete_log_of_zero():
+    with pytest.raises(ValueError):
+        discrete_log((0, 0, 0), (0, 1, 0), (1, 2, 0, 1), 3)
+
+
+def test_table_falls_back_to_discrete_log():
+    p, modulus = 2, (1, 1, 0, 0, 1)
+    generator = find_primitive_element(modulus, p)
+    full = DiscreteLogTable(generator, modulus, p)
+    cached = DiscreteLogTable(generator, modulus, p, max_size=4, cache_size=2)
+    assert cached.table is None
+    for value in range(1, 16):
+        elem = int_to_element(value, p, 4)
+        assert cached.log(elem) == full.log(elem)
+    assert len(cached._cache) == 2
+
+
+def test_baby_step_giant_step():
+    p, modulus = 3, (1, 2, 0, 1)
+    generator = find_primitive_element(modulus, p)
+    for k in (0, 1, 7, 25):
+        target = power_element(generator, k, modulus, p)
+        assert baby_step_giant_step(generator, target, 26, modulus, p) == k
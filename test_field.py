@@ -0,0 +1,147 @@
+import pytest
+
+from GF import (
+    FieldElementsView, GaloisField, element_orders, element_to_int, generate_field_elements,
+    gf2_multiply, int_to_element, packed_add, packed_multiply, packed_subtract, poly_add,
+    poly_multiply, polynomial_to_string, power_element
+)
+
+SMALL_FIELDS = [(2, 1), (2, 5), (3, 3), (5, 2), (7, 1)]
+
+
+def menu_order(p, n):
+    """Порядок элементов в меню: по степени, затем по старшему коэффициенту и лексикографически."""
+    def key(elem):
+        degree = max((i for i, c in enumerate(elem) if c), default=-1)
+        return degree, elem[degree] if degree >= 0 else 0, elem
+    return sorted(generate_field_elements(p, n), key=key)
+
+
+@pytest.mark.parametrize('p, n', SMALL_FIELDS)
+def test_view_matches_sorted_elements(p, n):
+    view = FieldElementsView(p, n)
+    expected = menu_order(p, n)
+    assert len(view) == p ** n
+    assert list(view) == [view[i] for i in range(len(view))] == expected
+    assert [view.rank(elem) for elem in expected] == list(range(p ** n))
+    assert list(view.iter_packed()) == [element_to_int(elem, p) for elem in expected]
+    nonzero = view.nonzero_view()
+    assert list(nonzero) == expected[1:]
+    assert list(nonzero.iter_packed()) == [element_to_int(elem, p) for elem in expected[1:]]
+
+
+def test_view_sequence_protocol():
+    view = FieldElementsView(3, 3)
+    assert view[-1] == view[26] == (2, 2, 2)
+    assert view[3:7] == [view[i] for i in range(3, 7)]
+    assert view.index((0, 0, 1)) == 9
+    assert (0, 0, 0) in view and (0, 0, 3) not in view and (0, 0) not in view
+    assert (0, 0, 0) not in view.nonzero_view()
+    with pytest.raises(IndexError):
+        view[27]
+
+
+def test_view_of_large_field_is_lazy():
+    view = FieldElementsView(2, 64)
+    assert view.size == 2 ** 64
+    assert view[2 ** 63] == tuple([0] * 63 + [1])
+    assert next(iter(view.nonzero_view())) == tuple([1] + [0] * 63)
+
+
+@pytest.mark.parametrize('p, modulus', [(2, (1, 1, 0, 1, 1, 0, 0, 0, 1)), (3, (1, 2, 0, 1)), (5, (2, 0, 1))])
+def test_element_orders_accept_packed_elements(p, modulus):
+    field = GaloisField(p, modulus)
+    view = FieldElementsView(p, len(modulus) - 1)
+    by_table = element_orders(view.iter_packed(), modulus, p, field)
+    assert by_table == element_orders(list(view), modulus, p, field)
+    assert by_table == element_orders(view.iter_packed(), modulus, p)
+    assert by_table[0] == 0 and max(by_table) == field.size - 1
+
+
+def test_polynomial_to_string():
+    assert polynomial_to_string([1, 0, 2]) == "2x^2 + 1"
+    assert polynomial_to_string([-1, -1, 1]) == "x^2 - x - 1"
+    assert polynomial_to_string((0, 1, 0)) == "x"
+    assert polynomial_to_string([0, 0]) == "0"
+
+
+@pytest.mark.parametrize('p, modulus, primitive', [
+    (2, (1, 1, 1, 1, 1), False),        # x^4 + x^3 + x^2 + x + 1: порядок x равен 5
+    (2, (1, 1, 0, 0, 1), True),
+    (3, (1, 0, 1), False),              # x^2 + 1: порядок x равен 4
+    (3, (2, 1, 1), True),
+])
+def test_field_tables_with_and_without_primitive_modulus(p, modulus, primitive):
+    field = GaloisField(p, modulus)
+    assert field.x_is_primitive == primitive
+    order = field.size - 1
+    assert sorted(field.exp_table[:order]) == list(range(1, field.size))
+    for value in range(1, field.size):
+        assert field.exp_table[field.log_table[value]] == value
+    elem = field.from_int(field.size - 1)
+    assert field.multiply(elem, field.inverse(elem)) == field.one
+
+
+@pytest.mark.parametrize('p, modulus', [(2, (1, 0, 1, 0, 0, 1)), (3, (1, 2, 0, 1)), (5, (2, 1, 1))])
+def test_field_operations_match_polynomial_arithmetic(p, modulus):
+    field = GaloisField(p, modulus)
+    elements = generate_field_elements(p, field.n)
+    for a in elements:
+        for b in elements:
+            assert field.multiply(a, b) == poly_multiply(a, b, modulus, p)
+            assert field.add(a, b) == field.element(poly_add(a, b, p))
+            assert field.add(field.subtract(a, b), b) == a
+            if any(b):
+                assert field.multiply(field.divide(a, b), b) == a
+    for a in elements[1:]:
+        assert field.multiply(a, field.inverse(a)) == field.one
+        assert field.power(a, 7) == power_element(a, 7, modulus, p)
+        assert field.power(a, -2) == field.inverse(field.multiply(a, a))
+        assert field.exp_table[field.log(a)] == field.to_int(a)
+
+
+def test_field_zero_handling():
+    field = GaloisField(3, (1, 2, 0, 1))
+    assert field.multiply(field.zero, field.one) == field.zero
+    assert field.power(field.zero, 0) == field.one
+    assert field.power(field.zero, 3) == field.zero
+    for operation in (lambda: field.inverse(field.zero), lambda: field.divide(field.one, field.zero),
+                      lambda: field.power(field.zero, -1)):
+        with pytest.raises(ZeroDivisionError):
+            operation()
+    with pytest.raises(ValueError):
+        field.log(field.zero)
+
+
+def test_reducible_modulus_rejected():
+    with pytest.raises(ValueError):
+        GaloisField(2, (1, 0, 1))      # x^2 + 1 = (x + 1)^2
+
+
+@pytest.mark.parametrize('p, n', SMALL_FIELDS)
+def test_packing_round_trip(p, n):
+    values = [element_to_int(elem, p) for elem in generate_field_elements(p, n)]
+    assert sorted(values) == list(range(p ** n))
+    assert all(element_to_int(int_to_element(value, p, n), p) == value for value in values)
+    assert element_to_int((1, 0, 1, 1), 2) == 0b1101
+
+
+@pytest.mark.parametrize('modulus', [(1, 1, 0, 1), (1, 0, 1, 0, 0, 1), (1, 0, 1, 1, 1, 0, 0, 0, 1)])
+def test_gf2_multiply_matches_poly_multiply(modulus):
+    n = len(modulus) - 1
+    mask = element_to_int(modulus, 2)
+    for a in range(1 << n):
+        for b in range(0, 1 << n, 3):
+            expected = poly_multiply(int_to_element(a, 2, n), int_to_element(b, 2, n), modulus, 2)
+            assert gf2_multiply(a, b, mask) == element_to_int(expected, 2)
+
+
+def test_packed_arithmetic_for_odd_characteristic():
+    p, modulus = 3, (1, 2, 0, 1)
+    elements = generate_field_elements(p, 3)
+    for a in elements:
+        for b in elements:
+            x, y = element_to_int(a, p), element_to_int(b, p)
+            assert packed_add(x, y, p) == element_to_int(poly_add(a, b, p), p)
+            assert packed_add(packed_subtract(x, y, p), y, p) == x
+            assert packed_multiply(x, y, modulus, p) == element_to_int(poly_multiply(a, b, modulus, p), p)
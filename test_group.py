@@ -0,0 +1,55 @@
+import itertools
+
+import pytest
+
+from GF import (
+    GaloisField, count_generators, element_order, element_orders, euler_phi, find_generators,
+    generate_field_elements, iter_generators, poly_multiply, power_element
+)
+
+FIELDS = [(2, (1, 1, 0, 1)), (2, (1, 1, 1, 1, 1)), (3, (1, 2, 0, 1)), (5, (2, 1, 1)), (2, (1, 0, 1, 0, 0, 1))]
+
+
+def naive_order(elem, modulus, p):
+    """Порядок элемента последовательным умножением."""
+    one = tuple([1] + [0] * (len(modulus) - 2))
+    current, order = elem, 1
+    while current != one:
+        current = poly_multiply(current, elem, modulus, p)
+        order += 1
+    return order
+
+
+@pytest.mark.parametrize('p, modulus', FIELDS)
+def test_iter_generators_matches_brute_force(p, modulus):
+    n = len(modulus) - 1
+    group = generate_field_elements(p, n)[1:]
+    expected = {elem for elem in group if naive_order(elem, modulus, p) == p ** n - 1}
+    generators = list(iter_generators(modulus, p))
+    assert len(generators) == len(set(generators)) == count_generators(p, n) == euler_phi(p ** n - 1)
+    assert set(generators) == expected
+    assert set(find_generators(group, modulus, p, p ** n - 1)) == expected
+    assert list(iter_generators(modulus, p, GaloisField(p, modulus))) == generators
+
+
+def test_iter_generators_is_lazy_for_large_fields():
+    modulus = (1, 1, 0, 1, 1) + (0,) * 59 + (1,)
+    first = list(itertools.islice(iter_generators(modulus, 2), 3))
+    order = 2 ** 64 - 1
+    one = (1,) + (0,) * 63
+    for generator in first:
+        assert power_element(generator, order, modulus, 2) == one
+        assert power_element(generator, order // 3, modulus, 2) != one
+    assert count_generators(2, 64) == euler_phi(order)
+
+
+@pytest.mark.parametrize('p, modulus', FIELDS)
+def test_element_orders_match_naive_order(p, modulus):
+    n = len(modulus) - 1
+    elements = generate_field_elements(p, n)
+    expected = [0] + [naive_order(elem, modulus, p) for elem in elements[1:]]
+    field = GaloisField(p, modulus)
+    assert element_orders(elements, modulus, p) == expected
+    assert element_orders(elements, modulus, p, field) == expected
+    assert [element_order(elem, elements[1:], modulus, p) for elem in elements[1:]] == expected[1:]
+    assert all((p ** n - 1) % order == 0 for order in expected[1:])
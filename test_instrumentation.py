@@ -0,0 +1,59 @@
+import pytest
+
+import instrumentation
+from Affine import AffineCipher, ByteAffineCipher
+from GF import GaloisField, poly_multiply
+
+RU_ALPHABET = 'абвгдежзийклмнопрстуфхцчшщъыьэюя'
+
+
+@pytest.fixture(autouse=True)
+def restore_state():
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_disabled_by_default_collects_nothing():
+    instrumentation.reset()
+    field = GaloisField(2, (1, 0, 1, 0, 0, 1))
+    AffineCipher(field, RU_ALPHABET, field.from_int(3), field.from_int(5)).encrypt('абв')
+    poly_multiply((1, 1), (0, 1), (1, 1, 0, 1), 2)
+    assert instrumentation.snapshot() == {'counters': {}, 'stages': {}}
+
+
+def test_profile_records_stages_and_counters():
+    field = GaloisField(2, (1, 0, 1, 0, 0, 1))
+    with instrumentation.profile() as profiler:
+        cipher = AffineCipher(field, RU_ALPHABET, field.from_int(3), field.from_int(5))
+        cipher.decrypt(cipher.encrypt('привет'))
+        cipher.encrypt('привет', tracer=lambda event: None)
+        byte_cipher = ByteAffineCipher(7, 11)
+        byte_cipher.decrypt(byte_cipher.encrypt(b'data'))
+        GaloisField(3, (1, 2, 0, 1))
+        poly_multiply((1, 1), (0, 1), (1, 1, 0, 1), 2)
+    stages = profiler.result['stages']
+    assert stages['encrypt']['calls'] == 3
+    assert stages['decrypt']['calls'] == 2
+    assert stages['field_build']['calls'] == 1
+    assert {'mapping', 'table_compile', 'key_inversion'} <= set(stages)
+    assert profiler.result['counters']['poly_multiply'] == 1
+    assert not instrumentation.enabled
+
+
+def test_timed_keeps_metadata_and_records_failures():
+    @instrumentation.timed('work')
+    def work(value):
+        """Документация."""
+        if value < 0:
+            raise ValueError(value)
+        return value * 2
+
+    assert work.__name__ == 'work' and work.__doc__ == "Документация."
+    assert work(2) == 4
+    assert 'work' not in instrumentation.stage_calls
+    with instrumentation.profile() as profiler:
+        assert work(3) == 6
+        with pytest.raises(ValueError):
+            work(-1)
+    assert profiler.result['stages']['work']['calls'] == 2
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from GF import (
+    GaloisField, batch_inverse, fermat_inverse, generate_field_elements, poly_inverse, poly_multiply
+)
+
+FIELDS = [(2, (1, 1, 0, 1)), (2, (1, 0, 1, 0, 0, 1)), (3, (1, 2, 0, 1)), (7, (3, 1, 1))]
+
+
+@pytest.mark.parametrize('p, modulus', FIELDS)
+def test_inverses_agree(p, modulus):
+    n = len(modulus) - 1
+    one = tuple([1] + [0] * (n - 1))
+    nonzero = generate_field_elements(p, n)[1:]
+    for elem in nonzero:
+        inverse = poly_inverse(elem, modulus, p)
+        assert poly_multiply(elem, inverse, modulus, p) == one
+        assert fermat_inverse(elem, modulus, p) == inverse
+    field = GaloisField(p, modulus)
+    expected = [poly_inverse(elem, modulus, p) for elem in nonzero]
+    assert batch_inverse(nonzero, modulus, p) == expected
+    assert batch_inverse(nonzero, modulus, p, field) == expected
+
+
+def test_poly_inverse_large_degree():
+    p, modulus = 2, (1, 1, 0, 1, 1) + (0,) * 59 + (1,)
+    rng = random.Random(0)
+    elem = tuple(rng.randrange(2) for _ in range(64))
+    inverse = poly_inverse(elem, modulus, p)
+    assert poly_multiply(elem, inverse, modulus, p) == (1,) + (0,) * 63
+
+
+def test_zero_has_no_inverse():
+    modulus = (1, 1, 0, 1)
+    for inverse in (poly_inverse, fermat_inverse):
+        with pytest.raises(ZeroDivisionError):
+            inverse((0, 0, 0), modulus, 2)
+    with pytest.raises(ZeroDivisionError):
+        batch_inverse([(1, 0, 0), (0, 0, 0)], modulus, 2)
+    assert batch_inverse([], modulus, 2) == []
+
+
+def test_reducible_modulus_detected():
+    # x^2 + 1 = (x + 1)^2 над F_2: x + 1 не обратим
+    with pytest.raises(ValueError):
+        poly_inverse((1, 1), (1, 0, 1), 2)
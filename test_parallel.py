@@ -0,0 +1,51 @@
+import io
+import pickle
+
+import pytest
+
+from Affine import AffineCipher, ByteAffineCipher
+from GF import GaloisField
+from parallel import ParallelCipher
+
+RU_ALPHABET = 'абвгдежзийклмнопрстуфхцчшщъыьэюя'
+
+
+@pytest.fixture(scope='module')
+def cipher():
+    field = GaloisField(2, (1, 0, 1, 0, 0, 1))
+    return AffineCipher(field, RU_ALPHABET, field.from_int(3), field.from_int(5))
+
+
+def test_ciphers_pickle_with_tables(cipher):
+    restored = pickle.loads(pickle.dumps(cipher))
+    assert restored.encrypt(RU_ALPHABET) == cipher.encrypt(RU_ALPHABET)
+    byte_cipher = ByteAffineCipher(7, 11)
+    assert pickle.loads(pickle.dumps(byte_cipher)).encrypt(b'abc') == byte_cipher.encrypt(b'abc')
+
+
+def test_parallel_text_keeps_order(cipher):
+    text = ''.join(RU_ALPHABET[i % 32] for i in range(5000)) + ' конец'
+    with ParallelCipher(cipher, workers=2, chunk_size=97) as parallel:
+        ciphertext = parallel.encrypt(text)
+        assert ciphertext == cipher.encrypt(text)
+        assert parallel.decrypt(ciphertext) == cipher.decrypt(ciphertext)
+        assert parallel.encrypt('абв') == cipher.encrypt('абв')
+
+
+def test_parallel_streams_keep_order(cipher):
+    text = ('съешь же ещё этих мягких французских булок ' * 200).encode('utf-8')
+    byte_cipher = ByteAffineCipher(7, 11)
+    with ParallelCipher(cipher, workers=2) as parallel:
+        dst = io.BytesIO()
+        parallel.encrypt_stream(io.BytesIO(text), dst, chunk_size=101)
+        assert dst.getvalue().decode('utf-8') == cipher.encrypt(text.decode('utf-8'))
+    with ParallelCipher(byte_cipher, workers=2, chunk_size=50) as parallel:
+        dst = io.BytesIO()
+        parallel.decrypt_stream(io.BytesIO(text), dst)
+        assert dst.getvalue() == byte_cipher.decrypt(text)
+        assert parallel.encrypt(text) == byte_cipher.encrypt(text)
+
+
+def test_invalid_chunk_size(cipher):
+    with pytest.raises(ValueError):
+        ParallelCipher(cipher, chunk_size=0)
@@ -0,0 +1,168 @@
+import itertools
+import random
+
+import pytest
+
+import instrumentation
+from GF import (
+    PolyReducer, find_random_irreducible_polynomial, find_sparse_irreducible_polynomial,
+    is_irreducible, poly_divmod, poly_mul, poly_trim, reduction_strategy,
+    sparse_modulus_terms, sparse_reduce
+)
+
+
+def weight(poly):
+    return sum(1 for c in poly if c)
+
+
+def remainder(poly, modulus, p):
+    _, rem = poly_divmod(list(poly), list(modulus), p)
+    n = len(modulus) - 1
+    rem = [c % p for c in rem][:n]
+    return rem + [0] * (n - len(rem))
+
+
+@pytest.mark.parametrize('p, n', [(2, 8), (2, 32), (2, 100), (3, 12), (5, 7)])
+def test_random_search_prefers_sparse_moduli(p, n):
+    modulus = find_random_irreducible_polynomial(p, n, rng=random.Random(1))
+    assert len(modulus) == n + 1 and is_irreducible(modulus, p)
+    assert weight(modulus) <= 5
+    assert reduction_strategy(modulus, p) == 'sparse'
+
+
+def test_random_search_without_sparse_preference():
+    modulus = find_random_irreducible_polynomial(2, 12, sparse=False, rng=random.Random(3))
+    assert len(modulus) == 13 and is_irreducible(modulus, 2)
+
+
+def test_no_sparse_modulus_for_degree_multiple_of_eight():
+    # Над F_2 нет неприводимых трёхчленов степени 8, но есть пятичлены
+    modulus = find_sparse_irreducible_polynomial(2, 8)
+    assert weight(modulus) == 5 and is_irreducible(modulus, 2)
+
+
+@pytest.mark.parametrize('modulus, p', [
+    ((1, 1, 0, 0, 1), 2),
+    ((1, 1, 0, 1, 1, 0, 0, 0, 1), 2),
+    ((2, 1, 0, 1), 3),
+    ((3, 0, 0, 0, 0, 2, 0, 1), 5),
+])
+def test_sparse_reduce_matches_division(modulus, p):
+    n = len(modulus) - 1
+    terms = sparse_modulus_terms(modulus, p)
+    reducer = PolyReducer(modulus, p)
+    assert reducer.inv_rev is None and reducer.sparse_terms == terms
+    rng = random.Random(0)
+    for _ in range(100):
+        poly = [rng.randrange(p) for _ in range(rng.randrange(1, 3 * n))]
+        expected = remainder(poly, modulus, p)
+        assert sparse_reduce(poly, terms, n, p) == expected
+        assert list(reducer.reduce(poly)) == expected
+
+
+def test_dense_modulus_uses_barrett_reduction():
+    modulus, p = (1, 1, 1, 0, 1, 1, 1, 1, 1), 2
+    assert sparse_modulus_terms(modulus, p) is None
+    assert reduction_strategy(modulus, p) == 'generic'
+    reducer = PolyReducer(modulus, p)
+    assert reducer.inv_rev is not None
+    rng = random.Random(0)
+    for _ in range(100):
+        poly = [rng.randrange(p) for _ in range(15)]
+        assert list(reducer.reduce(poly)) == remainder(poly, modulus, p)
+
+
+def schoolbook(a, b, p):
+    product = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        for j, y in enumerate(b):
+            product[i + j] = (product[i + j] + x * y) % p
+    return poly_trim(product, p)
+
+
+@pytest.mark.parametrize('p', [2, 3, 7, 251])
+def test_poly_mul_matches_schoolbook(p):
+    rng = random.Random(p)
+    for length in (1, 5, 15, 16, 17, 40, 100):
+        a = [rng.randrange(p) for _ in range(length)]
+        b = [rng.randrange(p) for _ in range(rng.randrange(1, 2 * length + 1))]
+        assert poly_mul(a, b, p) == schoolbook(a, b, p)
+        assert poly_mul(a, b, p, threshold=1) == poly_mul(a, b, p, threshold=1 << 30)
+
+
+@pytest.mark.parametrize('p', [2, 3, 5, 13])
+def test_poly_divmod_identity(p):
+    rng = random.Random(p)
+    for _ in range(200):
+        b = [rng.randrange(p) for _ in range(rng.randrange(1, 8))] + [rng.randrange(1, p)]
+        a = [rng.randrange(p) for _ in range(rng.randrange(1, 20))]
+        quotient, rem = poly_divmod(a, b, p)
+        assert len(poly_trim(rem, p)) < len(b)
+        recombined = [0] * max(len(a), len(b) + len(quotient), len(rem))
+        for i, c in enumerate(schoolbook(quotient, b, p) if quotient else []):
+            recombined[i] += c
+        for i, c in enumerate(rem):
+            recombined[i] += c
+        assert poly_trim([c % p for c in recombined], p) == poly_trim(a, p)
+
+
+def test_poly_divmod_inverts_leading_coefficient_once():
+    instrumentation.enable()
+    try:
+        instrumentation.reset()
+        poly_divmod([1] * 50, [1, 2, 3], 5)
+        assert instrumentation.counters['modinv'] == 1
+    finally:
+        instrumentation.disable()
+
+
+def test_poly_divmod_by_zero():
+    with pytest.raises(ZeroDivisionError):
+        poly_divmod([1, 2], [0, 0], 3)
+
+
+def monic_polynomials(p, degree):
+    for tail in itertools.product(range(p), repeat=degree):
+        yield list(tail) + [1]
+
+
+def brute_force_irreducible(poly, p):
+    """Нет унитарного делителя степени от 1 до deg / 2."""
+    degree = len(poly) - 1
+    for d in range(1, degree // 2 + 1):
+        for divisor in monic_polynomials(p, d):
+            if poly_trim(poly_divmod(poly, divisor, p)[1], p) == [0]:
+                return False
+    return True
+
+
+def mobius(number):
+    result, d = 1, 2
+    while d * d <= number:
+        if number % d == 0:
+            number //= d
+            if number % d == 0:
+                return 0
+            result = -result
+        d += 1
+    return -result if number > 1 else result
+
+
+@pytest.mark.parametrize('p, max_degree', [(2, 7), (3, 4), (5, 3)])
+def test_is_irreducible_matches_brute_force(p, max_degree):
+    for degree in range(1, max_degree + 1):
+        for poly in monic_polynomials(p, degree):
+            assert is_irreducible(poly, p) == brute_force_irreducible(poly, p), poly
+
+
+@pytest.mark.parametrize('p, degree', [(2, 10), (3, 6), (5, 4), (7, 3)])
+def test_is_irreducible_count_matches_gauss_formula(p, degree):
+    expected = sum(mobius(d) * p ** (degree // d) for d in range(1, degree + 1) if degree % d == 0) // degree
+    assert sum(is_irreducible(poly, p) for poly in monic_polynomials(p, degree)) == expected
+
+
+def test_is_irreducible_rejects_degenerate_input():
+    assert not is_irreducible([1], 2)
+    assert not is_irreducible([1, 1, 0], 2)      # старший коэффициент равен нулю
+    assert not is_irreducible([1, 0, 2], 2)      # 2 = 0 над F_2
+    assert is_irreducible([2, 0, 2], 3)          # 2x^2 + 2 = 2(x^2 + 1) над F_3
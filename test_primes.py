@@ -0,0 +1,80 @@
+import math
+
+import pytest
+
+from GF import factorize, factorize_divisor, factorize_group_order, is_prime, pollard_rho, prime_factors
+
+
+def trial_is_prime(number):
+    return number >= 2 and all(number % d for d in range(2, math.isqrt(number) + 1))
+
+
+def trial_factorize(number):
+    factors = {}
+    d = 2
+    while d * d <= number:
+        while number % d == 0:
+            factors[d] = factors.get(d, 0) + 1
+            number //= d
+        d += 1
+    if number > 1:
+        factors[number] = factors.get(number, 0) + 1
+    return factors
+
+
+def test_is_prime_matches_trial_division():
+    for number in range(-5, 20000):
+        assert is_prime(number) == trial_is_prime(number), number
+
+
+@pytest.mark.parametrize('number', [
+    561, 1105, 1729, 2465, 2821, 6601, 8911,   # числа Кармайкла
+    3215031751, 3825123056546413051,           # сильные псевдопростые по нескольким основаниям
+    (2 ** 31 - 1) * (2 ** 61 - 1),
+])
+def test_is_prime_rejects_pseudoprimes(number):
+    assert not is_prime(number)
+
+
+@pytest.mark.parametrize('number', [2 ** 31 - 1, 2 ** 61 - 1, 2 ** 89 - 1, 999_999_999_989])
+def test_is_prime_large_primes(number):
+    assert is_prime(number)
+
+
+def test_factorize_matches_trial_division():
+    for number in range(1, 5000):
+        assert factorize(number) == trial_factorize(number), number
+
+
+@pytest.mark.parametrize('number', [
+    1_000_003 * 1_000_033,                 # два простых больше SMALL_PRIMES
+    2 ** 10 * 3 ** 5 * 1_000_003 ** 2,
+    (2 ** 31 - 1) * (2 ** 61 - 1),
+    2 ** 64 - 1,
+    3 ** 40 - 1,
+])
+def test_factorize_large(number):
+    factors = factorize(number)
+    assert list(factors) == sorted(factors)
+    assert all(is_prime(prime) for prime in factors)
+    assert math.prod(prime ** exponent for prime, exponent in factors.items()) == number
+
+
+def test_pollard_rho_finds_proper_divisor():
+    for number in (8051, 10403, 1_000_003 * 1_000_033, 2 ** 64 + 1):
+        divisor = pollard_rho(number)
+        assert 1 < divisor < number and number % divisor == 0
+
+
+@pytest.mark.parametrize('p, n', [(2, 8), (2, 16), (2, 32), (2, 64), (3, 10), (5, 6), (7, 12)])
+def test_factorize_group_order(p, n):
+    assert factorize_group_order(p, n) == factorize(p ** n - 1)
+
+
+def test_factorize_divisor():
+    factorization = factorize(2 ** 16 - 1)
+    assert factorize_divisor(255, factorization) == {3: 1, 5: 1, 17: 1}
+    assert factorize_divisor(1, factorization) == {}
+    with pytest.raises(ValueError):
+        factorize_divisor(7, factorization)
+    assert prime_factors(2 ** 16 - 1) == {3, 5, 17, 257}
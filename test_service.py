@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from Affine import AffineCipher, ByteAffineCipher
+from GF import GaloisField
+from service import FRAME_HEADER, ByteBudget, CipherClient, CipherService, read_frame, translate_chunked
+from snapshot import save_snapshot
+
+RU_ALPHABET = 'абвгдежзийклмнопрстуфхцчшщъыьэюя'
+
+
+@pytest.fixture
+def keys_dir(tmp_path):
+    field = GaloisField(2, (1, 0, 1, 0, 0, 1))
+    save_snapshot(AffineCipher(field, RU_ALPHABET, field.from_int(3), field.from_int(5)),
+                  tmp_path / 'ru.gfk')
+    save_snapshot(ByteAffineCipher(7, 11), tmp_path / 'bytes.gfk')
+    return tmp_path
+
+
+def run_with_server(keys_dir, scenario, **options):
+    async def main():
+        service = CipherService(str(keys_dir), **options)
+        server = await service.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await scenario(port)
+        finally:
+            server.close()
+            await server.wait_closed()
+    return asyncio.run(main())
+
+
+def test_ping_and_encrypt(keys_dir):
+    async def scenario(port):
+        client = await CipherClient.connect('127.0.0.1', port)
+        try:
+            assert await client.ping() == 'pong'
+            ciphertext = await client.encrypt('ru', 'привет')
+            assert ciphertext != 'привет'
+            assert await client.decrypt('ru', ciphertext) == 'привет'
+            data = bytes(range(256))
+            assert await client.decrypt('bytes', await client.encrypt('bytes', data)) == data
+            with pytest.raises(ValueError):
+                await client.encrypt('missing', 'привет')
+            with pytest.raises(ValueError):
+                await client.encrypt('../ru', 'привет')
+        finally:
+            await client.close()
+    run_with_server(keys_dir, scenario)
+
+
+def test_pipelined_requests_above_byte_budget(keys_dir):
+    async def scenario(port):
+        client = await CipherClient.connect('127.0.0.1', port)
+        try:
+            texts = [RU_ALPHABET[i:] for i in range(32)]
+            ciphertexts = await asyncio.gather(*(client.encrypt('ru', text) for text in texts))
+            plaintexts = await asyncio.gather(*(client.decrypt('ru', text) for text in ciphertexts))
+            assert plaintexts == texts
+        finally:
+            await client.close()
+    run_with_server(keys_dir, scenario, chunk_size=7, max_bytes_in_flight=150)
+
+
+def test_truncated_frame(keys_dir):
+    async def scenario(port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        try:
+            writer.write(FRAME_HEADER.pack(100) + b'{"op": "ping"')
+            writer.write_eof()
+            response = await read_frame(reader)
+            assert response['ok'] is False
+            assert await read_frame(reader) is None
+        finally:
+            writer.close()
+    run_with_server(keys_dir, scenario)
+
+
+def test_read_frame_rejects_truncated_body():
+    async def scenario():
+        reader = asyncio.StreamReader()
+        reader.feed_data(FRAME_HEADER.pack(10) + b'{}')
+        reader.feed_eof()
+        with pytest.raises(ValueError):
+            await read_frame(reader)
+    asyncio.run(scenario())
+
+
+def test_translate_chunked_matches_whole():
+    field = GaloisField(2, (1, 0, 1, 0, 0, 1))
+    cipher = AffineCipher(field, RU_ALPHABET, field.from_int(3), field.from_int(5))
+    text = RU_ALPHABET * 10
+    byte_cipher = ByteAffineCipher(7, 11)
+    data = bytes(range(256)) * 3
+
+    async def scenario():
+        assert await translate_chunked(cipher.encrypt, text, 13) == cipher.encrypt(text)
+        assert await translate_chunked(byte_cipher.decrypt, data, 100) == byte_cipher.decrypt(data)
+    asyncio.run(scenario())
+
+
+def test_byte_budget_limits_bytes_in_flight():
+    async def scenario():
+        budget = ByteBudget(100)
+        assert await budget.acquire(60) == 60
+        waiter = asyncio.ensure_future(budget.acquire(60))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        await budget.release(60)
+        assert await waiter == 60
+        await budget.release(60)
+        assert await budget.acquire(500) == 100
+    asyncio.run(scenario())
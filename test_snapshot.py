@@ -0,0 +1,142 @@
+import array
+import os
+import pickle
+import struct
+import zlib
+
+import pytest
+
+from Affine import AffineCipher, ByteAffineCipher
+from GF import GaloisField
+from snapshot import HEADER, _values_below, load_snapshot, save_snapshot
+
+RU_ALPHABET = 'абвгдежзийклмнопрстуфхцчшщъыьэюя'
+
+
+def text_cipher(p, modulus, alphabet):
+    field = GaloisField(p, modulus)
+    return AffineCipher(field, alphabet, field.from_int(3), field.from_int(5))
+
+
+CIPHERS = [
+    pytest.param(lambda: text_cipher(2, (1, 0, 1, 0, 0, 1), RU_ALPHABET), RU_ALPHABET, id='ru'),
+    pytest.param(lambda: text_cipher(3, (1, 2, 0, 1), RU_ALPHABET[:27]), RU_ALPHABET[:27], id='p=3'),
+    pytest.param(lambda: text_cipher(2, (1, 0, 1, 0, 0, 1), ''.join(chr(0x1F600 + i) for i in range(32))),
+                 ''.join(chr(0x1F600 + i) for i in range(32)), id='astral'),
+]
+
+
+@pytest.mark.parametrize('make, alphabet', CIPHERS)
+def test_text_round_trip(tmp_path, make, alphabet):
+    cipher = make()
+    path = tmp_path / 'key.gfk'
+    save_snapshot(cipher, path)
+    loaded = load_snapshot(path)
+    text = alphabet * 3 + ' !'
+    assert loaded.encrypt(text) == cipher.encrypt(text)
+    assert loaded.decrypt(cipher.encrypt(text)) == cipher.decrypt(cipher.encrypt(text))
+    assert dict(loaded.char_to_field) == dict(cipher.char_to_field)
+    assert dict(loaded.field_to_char) == dict(cipher.field_to_char)
+    assert list(loaded.field.exp_table) == list(cipher.field.exp_table)
+    assert list(loaded.field.log_table) == list(cipher.field.log_table)
+    restored = pickle.loads(pickle.dumps(loaded))
+    assert restored.encrypt(text) == cipher.encrypt(text)
+
+
+def test_bytes_round_trip(tmp_path):
+    cipher = ByteAffineCipher(7, 11)
+    path = tmp_path / 'key.gfk'
+    save_snapshot(cipher, path)
+    loaded = load_snapshot(path)
+    data = bytes(range(256))
+    assert loaded.encrypt(data) == cipher.encrypt(data)
+    assert loaded.decrypt(cipher.encrypt(data)) == data
+
+
+@pytest.fixture
+def saved(tmp_path):
+    path = tmp_path / 'key.gfk'
+    save_snapshot(text_cipher(2, (1, 0, 1, 0, 0, 1), RU_ALPHABET), path)
+    return path
+
+
+def rewrite_header(path, resign=False, **fields):
+    """Меняет поля заголовка; resign=True — пересчитывает CRC32 под новые данные."""
+    data = bytearray(path.read_bytes())
+    names = ('magic', 'version', 'kind', 'n', 'p', 'count', 'low', 'crc')
+    header = dict(zip(names, HEADER.unpack_from(data, 0)))
+    header.update(fields)
+    HEADER.pack_into(data, 0, *(header[name] for name in names))
+    if resign:
+        crc = zlib.crc32(data[HEADER.size:], zlib.crc32(data[:HEADER.size - 4]))
+        struct.pack_into('<I', data, HEADER.size - 4, crc)
+    path.write_bytes(bytes(data))
+
+
+@pytest.mark.parametrize('fields', [
+    {'magic': b'XXXX'},
+    {'version': 9},
+    {'kind': 7},
+    {'p': 4},
+    {'p': 1},
+    {'n': 0},
+    {'count': 1000},
+    {'low': 5},
+    {'crc': 0},
+])
+def test_corrupt_header_rejected(saved, fields):
+    rewrite_header(saved, **fields)
+    with pytest.raises(ValueError):
+        load_snapshot(saved)
+
+
+@pytest.mark.parametrize('fields', [{'p': 4}, {'n': 0}, {'count': 1000}, {'low': 1 << 20}])
+def test_invalid_header_rejected_with_matching_crc(saved, fields):
+    rewrite_header(saved, resign=True, **fields)
+    with pytest.raises(ValueError):
+        load_snapshot(saved)
+
+
+def test_corrupt_body_rejected(saved):
+    data = bytearray(saved.read_bytes())
+    data[HEADER.size + 40] ^= 1
+    saved.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        load_snapshot(saved)
+
+
+@pytest.mark.parametrize('size', [0, 3, HEADER.size, HEADER.size + 10])
+def test_truncated_rejected(saved, size):
+    saved.write_bytes(saved.read_bytes()[:size])
+    with pytest.raises(ValueError):
+        load_snapshot(saved)
+
+
+def test_exp_table_out_of_field_rejected(saved):
+    # Значение таблицы степеней вне поля при верной CRC32
+    data = bytearray(saved.read_bytes())
+    offset = HEADER.size + 4 * (6 + 4 * 5)
+    struct.pack_into('<I', data, offset, 32)
+    saved.write_bytes(bytes(data))
+    rewrite_header(saved, resign=True)
+    with pytest.raises(ValueError):
+        load_snapshot(saved)
+
+
+def test_failed_save_removes_temporary_file(tmp_path, monkeypatch):
+    def fail(src, dst):
+        raise OSError("диск заполнен")
+    monkeypatch.setattr(os, 'replace', fail)
+    with pytest.raises(OSError):
+        save_snapshot(ByteAffineCipher(7, 11), tmp_path / 'key.gfk')
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize('bound', [1, 2, 31, 32, 33, 255, 256, 1000, 65535, 65536, 1 << 32])
+def test_values_below(bound):
+    for values in ([0, bound - 1], [0, bound], [bound - 1] * 5, [bound + 255]):
+        if max(values) >= 1 << 32:
+            continue
+        view = memoryview(array.array('I', values))
+        assert _values_below(view, bound) == (max(values) < bound)
+        assert _values_below(values, bound) == (max(values) < bound)
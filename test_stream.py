@@ -0,0 +1,61 @@
+import io
+
+import pytest
+
+from Affine import AffineCipher, iter_decoded_chunks
+from front import run_cli, setup_affine_cipher
+from GF import GaloisField
+
+RU_ALPHABET = 'абвгдежзийклмнопрстуфхцчшщъыьэюя'
+
+
+@pytest.fixture
+def cipher():
+    field = GaloisField(2, (1, 0, 1, 0, 0, 1))
+    return AffineCipher(field, RU_ALPHABET, field.from_int(3), field.from_int(5))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 1 << 16])
+def test_decoded_chunks_survive_split_characters(chunk_size):
+    text = 'привет, 世界 \U0001F600!' * 5
+    chunks = list(iter_decoded_chunks(io.BytesIO(text.encode('utf-8')), chunk_size, 'utf-8'))
+    assert ''.join(chunks) == text
+    assert all(chunks)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 64])
+def test_stream_matches_whole_text(cipher, chunk_size):
+    text = (RU_ALPHABET + ' ёжик в тумане\n') * 20
+    encrypted = io.BytesIO()
+    cipher.encrypt_stream(io.BytesIO(text.encode('utf-8')), encrypted, chunk_size)
+    assert encrypted.getvalue().decode('utf-8') == cipher.encrypt(text)
+    decrypted = io.BytesIO()
+    encrypted.seek(0)
+    cipher.decrypt_stream(encrypted, decrypted, chunk_size)
+    assert decrypted.getvalue().decode('utf-8') == cipher.decrypt(cipher.encrypt(text))
+
+
+def test_stream_rejects_invalid_utf8(cipher):
+    with pytest.raises(UnicodeDecodeError):
+        cipher.encrypt_stream(io.BytesIO(b'\xd0'), io.BytesIO(), 4)
+
+
+def test_cli_round_trip(tmp_path):
+    plain = tmp_path / 'plain.txt'
+    plain.write_text('съешь же ещё этих мягких французских булок', encoding='utf-8')
+    key = ['--alphabet', 'ru', '--alpha', '1 1 0', '--beta', '1 0 0 1', '--chunk-size', '3']
+    assert run_cli(['encrypt', *key, '-i', str(plain), '-o', str(tmp_path / 'enc')]) == 0
+    assert run_cli(['decrypt', *key, '-i', str(tmp_path / 'enc'), '-o', str(tmp_path / 'dec')]) == 0
+    expected = setup_affine_cipher('ru', None, '1 1 0', '1 0 0 1').encrypt(plain.read_text(encoding='utf-8'))
+    assert (tmp_path / 'enc').read_text(encoding='utf-8') == expected
+    assert (tmp_path / 'dec').read_text(encoding='utf-8') == \
+        ''.join(c if c in RU_ALPHABET else '?' for c in plain.read_text(encoding='utf-8'))
+
+
+def test_cli_reports_errors(tmp_path, capsys):
+    assert run_cli(['encrypt', '--alpha', '0', '--beta', '1', '-i', str(tmp_path / 'x')]) == 1
+    assert run_cli(['encrypt', '--alpha', '1', '--beta', '1', '-i', str(tmp_path / 'missing')]) == 1
+    bad = tmp_path / 'bad'
+    bad.write_bytes(b'\xff\xfe')
+    assert run_cli(['encrypt', '--alpha', '1', '--beta', '1', '-i', str(bad), '-o', str(tmp_path / 'o')]) == 1
+    assert capsys.readouterr().err.count("Ошибка") == 3